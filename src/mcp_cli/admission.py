@@ -0,0 +1,168 @@
+# mcp_cli/admission.py
+"""
+Per-server admission control for tool calls.
+
+Each server runs at most a fixed number of tool calls at once. Calls beyond
+that wait in a bounded queue, and once the queue is full further calls are
+rejected immediately with an error result instead of piling up behind a
+single-threaded stdio server. Limits are set per server in
+server_config.json, with defaults for all servers in the top-level
+"concurrency" entry:
+
+    "concurrency": {"maxConcurrent": 8, "maxQueue": 64},
+    "mcpServers": {
+      "sqlite": {
+        "command": "uvx",
+        "concurrency": {"maxConcurrent": 1, "maxQueue": 16}
+      }
+    }
+
+A maxQueue of 0 rejects every call that cannot start at once.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, Tuple
+
+# Default number of tool calls a server runs at once
+DEFAULT_MAX_CONCURRENT = 8
+
+# Default number of tool calls waiting for a server
+DEFAULT_MAX_QUEUE = 64
+
+class ServerBusyError(Exception):
+    """Raised when a server's wait queue is full."""
+
+def _read_limits(entry: Any, defaults: Tuple[int, int], where: str) -> Tuple[int, int]:
+    """Read maxConcurrent and maxQueue from a "concurrency" entry."""
+    max_concurrent, max_queue = defaults
+    if entry is None:
+        return defaults
+    if not isinstance(entry, dict):
+        logging.warning(f"Ignoring invalid concurrency setting for {where}: {entry}")
+        return defaults
+    try:
+        if "maxConcurrent" in entry:
+            max_concurrent = max(1, int(entry["maxConcurrent"]))
+        if "maxQueue" in entry:
+            max_queue = max(0, int(entry["maxQueue"]))
+    except (TypeError, ValueError):
+        logging.warning(f"Ignoring invalid concurrency setting for {where}: {entry}")
+        return defaults
+    return max_concurrent, max_queue
+
+class ConcurrencyLimit:
+    """Concurrency limit and bounded wait queue of one server."""
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT, max_queue: int = DEFAULT_MAX_QUEUE):
+        """
+        Initialize the limit.
+
+        Args:
+            max_concurrent: Calls run at once
+            max_queue: Calls allowed to wait for a free slot
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0  # Seconds admitted calls spent queued
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold one of the server's slots for the duration of a call.
+
+        Raises:
+            ServerBusyError: If no slot is free and the queue is full
+        """
+        if self._semaphore.locked() or self.queued:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise ServerBusyError(
+                    f"{self.active} calls running and {self.queued} queued"
+                )
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+            started = time.monotonic()
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.queued -= 1
+            self.total_wait += time.monotonic() - started
+        else:
+            await self._semaphore.acquire()
+
+        self.admitted += 1
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the queue metrics."""
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "peak_queued": self.peak_queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait": self.total_wait / self.admitted if self.admitted else 0.0,
+        }
+
+class AdmissionControl:
+    """Concurrency limits of every server."""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[int, int]]] = None,
+                 defaults: Tuple[int, int] = (DEFAULT_MAX_CONCURRENT, DEFAULT_MAX_QUEUE)):
+        """
+        Initialize admission control.
+
+        Args:
+            limits: Server display names mapped to (max_concurrent, max_queue)
+            defaults: Limits of servers without their own
+        """
+        self.limits = limits or {}
+        self.defaults = defaults
+        self._servers: Dict[str, ConcurrencyLimit] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], server_config_names: Dict[str, str]) -> "AdmissionControl":
+        """
+        Build admission control from a parsed server_config.json.
+
+        Args:
+            config: The configuration file contents
+            server_config_names: Server display names mapped to their entry names in the file
+        """
+        defaults = _read_limits(
+            config.get("concurrency"), (DEFAULT_MAX_CONCURRENT, DEFAULT_MAX_QUEUE), "all servers"
+        )
+        servers = config.get("mcpServers") or {}
+        limits = {}
+        for display_name, entry_name in server_config_names.items():
+            entry = (servers.get(entry_name) or {}).get("concurrency")
+            if entry is not None:
+                limits[display_name] = _read_limits(entry, defaults, entry_name)
+        return cls(limits, defaults)
+
+    def limit(self, server_name: str) -> ConcurrencyLimit:
+        """Get a server's limit, creating it on first use."""
+        limit = self._servers.get(server_name)
+        if limit is None:
+            limit = ConcurrencyLimit(*self.limits.get(server_name, self.defaults))
+            self._servers[server_name] = limit
+        return limit
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the queue metrics of every server that has had calls."""
+        return {server_name: limit.stats() for server_name, limit in self._servers.items()}
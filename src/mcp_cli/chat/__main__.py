@@ -15,6 +15,7 @@ from chuk_mcp.mcp_client.messages.initialize.send_messages import send_initializ
 # cli imports
 from mcp_cli.commands.register_commands import register_commands, chat_command
 from mcp_cli.cli_options import process_options
+from mcp_cli.stream_manager import kill_server_processes
 
 # host imports
 from chuk_mcp.mcp_client.host.server_manager import run_command
@@ -33,24 +34,9 @@ def restore_terminal():
     # Restore the terminal settings to normal.
     os.system("stty sane")
     
-    # First, try to explicitly clean up subprocess transports
+    # First, kill any server processes that are still running
     try:
-        # Find and close all subprocess transports before the event loop is closed
-        for obj in gc.get_objects():
-            if hasattr(obj, '__class__') and 'SubprocessTransport' in obj.__class__.__name__:
-                if hasattr(obj, '_proc') and obj._proc is not None:
-                    try:
-                        # Close the subprocess if it's still running
-                        if obj._proc.poll() is None:
-                            obj._proc.kill()
-                            obj._proc.wait(timeout=0.5)  # Short timeout
-                    except Exception as e:
-                        logging.debug(f"Error killing subprocess: {e}")
-                
-                # Mark internal pipe as closed to prevent EOF writing
-                if hasattr(obj, '_protocol') and obj._protocol is not None:
-                    if hasattr(obj._protocol, 'pipe'):
-                        obj._protocol.pipe = None
+        kill_server_processes()
     except Exception as e:
         logging.debug(f"Error during subprocess cleanup: {e}")
     
@@ -4,10 +4,13 @@ from rich.console import Console
 
 # llm imports
 from mcp_cli.llm.llm_client import get_llm_client
-from mcp_cli.llm.tools_handler import convert_to_openai_tools
+from mcp_cli.llm.tools_handler import get_tool_payload, tools_fingerprint
+from mcp_cli.llm.tool_selector import get_tool_selector
+from mcp_cli.llm.request_builder import RequestBuilder
 
 # cli imports
 from mcp_cli.chat.system_prompt import generate_system_prompt
+from mcp_cli.chat.history_compactor import HistoryCompactor
 
 # Import our stream manager
 from mcp_cli.stream_manager import StreamManager
@@ -33,6 +36,12 @@ class ChatContext:
         # Initialize the client right away to ensure it's never None
         self.client = get_llm_client(provider=self.provider, model=self.model)
         
+        # Keeps requests prefix-stable for provider prompt caching and tracks token usage
+        self.request_builder = RequestBuilder()
+        
+        # Summarizes the oldest turns in the background once the history grows too large
+        self.history_compactor = HistoryCompactor(self)
+        
     async def initialize(self):
         """Initialize the chat context by setting up the tools and system prompt."""
         console = Console()
@@ -52,17 +61,65 @@ class ChatContext:
             print("[yellow]No tools available. Chat functionality may be limited.[/yellow]")
             # Don't exit - we can still chat without tools
             
-        # Generate system prompt using the internal (namespaced) tools for LLM
-        system_prompt = generate_system_prompt(self.internal_tools)
-        
-        # Convert internal tools to OpenAI format
-        self.openai_tools = convert_to_openai_tools(self.internal_tools)
+        system_prompt = self._load_tool_set()
         
         # Initialize the conversation history with the system prompt
         self.conversation_history = [{"role": "system", "content": system_prompt}]
         
         return True
     
+    def _load_tool_set(self):
+        """
+        Build the tool payload and selector for the current tool set.
+        
+        Returns:
+            The system prompt for the tool set
+        """
+        # Tool schemas go either in the native tools parameter or, for providers
+        # without function calling, as a compact index in the prompt - never both
+        native_tools = getattr(self.client, "supports_native_tools", True)
+
+        # Prompt, tool payload and index are cached by tool set fingerprint
+        get_fingerprint = getattr(self.stream_manager, "get_tools_fingerprint", None)
+        fingerprint = get_fingerprint() if callable(get_fingerprint) else tools_fingerprint(self.internal_tools)
+        self.tools_fingerprint = fingerprint
+
+        # Generate system prompt using the internal (namespaced) tools for LLM
+        system_prompt = generate_system_prompt(self.internal_tools, native_tools=native_tools, fingerprint=fingerprint)
+        
+        # Internal tools in OpenAI format
+        self.tool_payload = get_tool_payload(self.internal_tools, fingerprint) if native_tools else None
+        self.openai_tools = self.tool_payload.tools if native_tools else []
+        
+        # Index the tools so each completion sends only the relevant ones
+        self.tool_selector = get_tool_selector(self.internal_tools, fingerprint) if native_tools else None
+        
+        return system_prompt
+    
+    def refresh_tools(self):
+        """
+        Pick up tool set changes since the last turn.
+        
+        Servers can change their tools while the chat runs (catalog
+        revalidation, list_changed notifications, restarts). When the stream
+        manager's fingerprint differs from the one the payload was built from,
+        the payload, selector and system prompt are rebuilt from the cache.
+        
+        Returns:
+            True if the tool set changed
+        """
+        get_fingerprint = getattr(self.stream_manager, "get_tools_fingerprint", None)
+        if not callable(get_fingerprint) or get_fingerprint() == getattr(self, "tools_fingerprint", None):
+            return False
+        
+        self.tools = self.stream_manager.get_all_tools()
+        self.internal_tools = self.stream_manager.get_internal_tools()
+        self.server_info = self.stream_manager.get_server_info()
+        system_prompt = self._load_tool_set()
+        if self.conversation_history and self.conversation_history[0].get("role") == "system":
+            self.conversation_history[0] = {"role": "system", "content": system_prompt}
+        return True
+    
     def get_server_for_tool(self, tool_name):
         """Get the server name that a tool belongs to."""
         return self.stream_manager.get_server_for_tool(tool_name)
@@ -86,6 +143,8 @@ class ChatContext:
             "tool_to_server_map": self.tool_to_server_map,
             "namespaced_tool_map": self.namespaced_tool_map,
             "original_to_namespaced": self.original_to_namespaced,
+            "request_builder": self.request_builder,
+            "history_compactor": self.history_compactor,
             "stream_manager": self.stream_manager  # Include stream_manager in the dict
         }
         
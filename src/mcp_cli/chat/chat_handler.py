@@ -27,6 +27,7 @@ async def handle_chat_mode(stream_manager, provider="openai", model="gpt-4o-mini
     logging.debug("Starting chat mode")
 
     ui_manager = None
+    chat_context = None
     exit_code = 0
     
     try:
@@ -104,6 +105,11 @@ async def handle_chat_mode(stream_manager, provider="openai", model="gpt-4o-mini
         if ui_manager:
             await _safe_cleanup(ui_manager)
         
+        # Stop any background history compaction
+        compactor = getattr(chat_context, "history_compactor", None) if chat_context else None
+        if compactor is not None:
+            await compactor.cancel()
+        
         # 2. Force garbage collection to run before exit
         gc.collect()
     
@@ -12,6 +12,7 @@ from rich.console import Console
 # imports
 from mcp_cli.chat.commands import register_command
 from mcp_cli.ui.ui_helpers import display_welcome_banner, clear_screen
+from mcp_cli.chat.history_compactor import summary_message
 
 
 async def cmd_cls(cmd_parts: List[str], context: Dict[str, Any]) -> bool:
@@ -76,6 +77,12 @@ async def cmd_compact(cmd_parts: List[str], context: Dict[str, Any]) -> bool:
     
     system_prompt = history[0]["content"]
     
+    # Send the summary request with the tools the conversation was using, so
+    # it shares the conversation's cached prompt prefix; the request itself
+    # goes at the tail
+    builder = context.get('request_builder')
+    tools = builder.tools if builder is not None else None
+    
     # Add a summary request to the conversation
     summary_request = {
         "role": "user", 
@@ -88,19 +95,22 @@ async def cmd_compact(cmd_parts: List[str], context: Dict[str, Any]) -> bool:
     console = Console()
     with console.status("[cyan]Generating conversation summary...[/cyan]", spinner="dots"):
         try:
-            completion = client.create_completion(messages=summary_history)
-            summary = completion.get("response", "No summary available")
+            if tools:
+                completion = await client.create_completion(messages=summary_history, tools=tools)
+            else:
+                completion = await client.create_completion(messages=summary_history)
+            summary = completion.get("response") or "No summary available"
+            if builder is not None:
+                builder.record_usage(completion.get("usage"))
         except Exception as e:
             print(f"[red]Error generating summary: {e}[/red]")
             summary = "Failed to generate summary."
     
-    # Reset history with system prompt and summary
+    # Reset history with system prompt and summary; the system prompt stays
+    # first, so the cached tools and system prompt prefix survive compaction
     history.clear()
     history.append({"role": "system", "content": system_prompt})
-    history.append({
-        "role": "assistant", 
-        "content": f"**Conversation Summary**\n\n{summary}\n\n*The conversation history has been compacted.*"
-    })
+    history.append(summary_message(summary))
     
     print("[green]Conversation history compacted with summary.[/green]")
     print(Panel(Markdown(f"**Summary:**\n\n{summary}"), style="cyan", title="Conversation Summary"))
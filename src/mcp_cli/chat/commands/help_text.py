@@ -34,6 +34,8 @@ MCP also provides commands to view and manage the conversation history:
 - `/conversation` or `/ch`: Display the conversation history for the current session
   - `/conversation --json`: Show the conversation history in raw JSON format
 
+- `/usage`: Show the session's token usage, including how many prompt tokens the provider served from its prompt cache
+
 These commands allow you to review all the messages exchanged during the session, making it easier to track the flow of your conversation.
 """
 
@@ -9,28 +9,55 @@ from rich.console import Console
 
 # imports
 from mcp_cli.chat.commands import register_command
+from mcp_cli.health import format_health
 
 async def cmd_servers(cmd_parts: List[str], context: Dict[str, Any]) -> bool:
     """
-    List connected MCP servers and their status.
+    List connected MCP servers, their status and their live health.
     
     Usage: /servers
     """
+    # Queue metrics and live health are only available from a live stream manager
+    stream_manager = context.get('stream_manager')
     server_info = context['server_info']
+    if hasattr(stream_manager, 'get_server_info'):
+        live_info = stream_manager.get_server_info()
+        if isinstance(live_info, list):
+            server_info = live_info
+    show_health = any(isinstance(server.get('health'), dict) for server in server_info)
+    
+    queue_stats = {}
+    if hasattr(stream_manager, 'get_queue_stats'):
+        stats = stream_manager.get_queue_stats()
+        if isinstance(stats, dict):
+            queue_stats = stats
     
     servers_table = Table(title="Connected MCP Servers")
     servers_table.add_column("ID", style="cyan")
     servers_table.add_column("Name", style="green")
     servers_table.add_column("Tools", style="cyan")
     servers_table.add_column("Status", style="green")
+    if show_health:
+        servers_table.add_column("Health (ping latency)", style="green")
+    if queue_stats:
+        servers_table.add_column("Calls (running/queued/rejected)", style="cyan")
     
     for server in server_info:
-        servers_table.add_row(
+        row = [
             str(server['id']),
             server['name'],
             str(server['tools']),
             server['status']
-        )
+        ]
+        if show_health:
+            health = server.get('health')
+            row.append(format_health(health) if isinstance(health, dict) else "-")
+        if queue_stats:
+            stats = queue_stats.get(server['name'])
+            row.append(
+                f"{stats['active']}/{stats['queued']}/{stats['rejected']}" if stats else "-"
+            )
+        servers_table.add_row(*row)
         
     console = Console()
     console.print(servers_table)
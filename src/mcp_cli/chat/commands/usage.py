@@ -0,0 +1,57 @@
+# mcp_cli/chat/commands/usage.py
+"""
+Token usage command, showing how much of the prompt the provider served from its cache.
+"""
+from rich.console import Console
+from rich.table import Table
+
+# Import the registration function
+from mcp_cli.chat.commands import register_command
+from mcp_cli.tool_cache import ToolResultCache
+
+async def usage_command(args, context):
+    """
+    Display the token usage of the current chat session.
+
+    Usage:
+      /usage  - Show the estimated history size, prompt tokens (cached and uncached),
+                completion tokens and tool result cache hits.
+    """
+    console = Console()
+
+    tool_cache = getattr(context.get("stream_manager"), "tool_cache", None)
+    if isinstance(tool_cache, ToolResultCache) and tool_cache.enabled:
+        stats = tool_cache.stats()
+        console.print(
+            f"Tool result cache: [cyan]{stats['hits']}[/cyan] hits, [cyan]{stats['misses']}[/cyan] misses "
+            f"({stats['hit_rate']:.0%} hit rate), {stats['entries']}/{stats['max_entries']} entries"
+        )
+
+    compactor = context.get("history_compactor")
+    if compactor is not None:
+        console.print(f"Estimated conversation history size: [cyan]{compactor.estimate()}[/cyan] tokens")
+
+    builder = context.get("request_builder")
+    if builder is None or not builder.usage.requests:
+        console.print("[italic yellow]No token usage has been reported in this session.[/italic yellow]")
+        return True
+
+    usage = builder.usage
+    table = Table(title="Token Usage")
+    table.add_column("Metric", style="green")
+    table.add_column("Session", justify="right")
+    table.add_column("Last request", justify="right")
+
+    last = usage.last or {}
+    table.add_row("Requests", str(usage.requests), "")
+    table.add_row("Prompt tokens", str(usage.prompt_tokens), str(last.get("prompt_tokens", "")))
+    table.add_row("  cached", str(usage.cached_prompt_tokens), str(last.get("cached_prompt_tokens", "")))
+    table.add_row("  uncached", str(usage.uncached_prompt_tokens), str(last.get("uncached_prompt_tokens", "")))
+    table.add_row("Completion tokens", str(usage.completion_tokens), str(last.get("completion_tokens", "")))
+    table.add_row("Prompt cache hit rate", f"{usage.cache_hit_rate:.0%}", "")
+
+    console.print(table)
+    return True
+
+# Register commands
+register_command("/usage", usage_command)
@@ -6,6 +6,14 @@ import logging
 
 # mcp cli imports
 from mcp_cli.chat.tool_processor import ToolProcessor
+from mcp_cli.llm.tool_selector import ToolSelector, latest_user_message, used_tool_names
+from mcp_cli.llm.request_builder import RequestBuilder
+from mcp_cli.chat.history_compactor import HistoryCompactor
+from mcp_cli.llm.tools_handler import convert_to_openai_tools
+from mcp_cli.tool_results import ResultStore, READ_RESULT_TOOL
+
+# The built-in paging tool in OpenAI format
+READ_RESULT_OPENAI_TOOL = convert_to_openai_tools([READ_RESULT_TOOL])[0]
 
 class ConversationProcessor:
     """Class to handle LLM conversation processing."""
@@ -28,16 +36,29 @@ class ConversationProcessor:
                     
                     # Use stream_manager through context if available (for better tools management)
                     if self.context.stream_manager:
+                        # Advertise the current tools if servers changed theirs
+                        refresh_tools = getattr(self.context, "refresh_tools", None)
+                        if callable(refresh_tools):
+                            refresh_tools()
                         # Access the tools data through the stream_manager
                         if not hasattr(self.context, 'openai_tools') or not self.context.openai_tools:
                             self.context.openai_tools = []
                     
-                    # Send the completion request (now potentially async)
+                    # Providers that can stream tool calls produce the reply in a single generation
+                    if hasattr(self.context.client, "stream_chat"):
+                        if await self._stream_turn(start_time):
+                            continue
+                        self._maybe_compact()
+                        break
+                    
+                    # Send the completion request
                     completion = await self.context.client.create_completion(
                         messages=self.context.conversation_history,
-                        tools=self.context.openai_tools,
+                        tools=self._tools_for_turn(),
                     )
 
+                    self._record_usage(completion.get("usage"))
+
                     response_content = completion.get("response", "No response")
                     tool_calls = completion.get("tool_calls", [])
                     
@@ -50,53 +71,18 @@ class ConversationProcessor:
                         # Loop back to call create_completion again with updated history
                         continue 
 
-                    # --- No tool calls, proceed to final response --- 
-                    
-                    # Placeholder for the final message content to be added to history later
-                    final_response_content = None 
-
-                    # Check if the provider is Ollama for streaming
-                    if self.context.provider == 'ollama':
-                        # We'll use a list to collect chunks and join them later for history
-                        streamed_chunks = []
+                    # Display assistant response using the existing method
+                    self.ui_manager.print_assistant_response(response_content, response_time)
 
-                        try:
-                            logging.debug("Starting async iteration over Ollama stream")
-                            # Call the async streaming completion method
-                            async for chunk in self.context.client.stream_completion(
-                                messages=self.context.conversation_history
-                            ):
-                                streamed_chunks.append(chunk)
-                                # Call the UI manager to display the chunk (now synchronous)
-                                await self.ui_manager.stream_assistant_chunk(chunk)
-                                # Add a small sleep to allow UI to potentially update
-                                await asyncio.sleep(0.01)
-                            
-                            logging.debug("Finished async iteration over Ollama stream")
-                            
-                            # Finalize the UI
-                            final_response_content = "".join(streamed_chunks)
-                            await self.ui_manager.finalize_assistant_response(final_response_content, response_time)
-                        except Exception as e:
-                            # Handle potential errors during streaming
-                            logging.error(f"Error during Ollama async streaming: {e}", exc_info=True)
-                            final_response_content = f"Error during streaming: {e}"
-                            # Update UI with error message
-                            self.ui_manager.print_assistant_response(final_response_content, response_time)
+                    # Add the final assistant message to history
+                    self.context.conversation_history.append(
+                        {"role": "assistant", "content": response_content}
+                    )
                     
-                    else:
-                        # --- Handle non-streaming providers (like OpenAI) --- 
-                        final_response_content = response_content # Use the content from create_completion
-                        # Display assistant response using the existing method
-                        self.ui_manager.print_assistant_response(final_response_content, response_time)
-
-                    # Add the final assistant message to history AFTER streaming/display
-                    if final_response_content is not None:
-                        self.context.conversation_history.append(
-                            {"role": "assistant", "content": final_response_content}
-                        )
+                    # Summarize old turns in the background if the history grew too large
+                    self._maybe_compact()
                     
-                    # Break the loop as we have the final response (streamed or not)
+                    # Break the loop as we have the final response
                     break 
                 except asyncio.CancelledError:
                     # Handle cancellation during API calls
@@ -112,4 +98,137 @@ class ConversationProcessor:
         except asyncio.CancelledError:
             # Propagate cancellation up
             logging.warning("Conversation processing cancelled.")
-            raise
\ No newline at end of file
+            raise
+
+    def _tools_for_turn(self):
+        """
+        Get the tools to send with the next completion.
+        
+        With a tool selector on the context, only the tools most relevant to
+        the latest user message are sent, plus any tools already used in the
+        conversation; otherwise every tool is sent. The built-in paging tool
+        is added once a large result has been stored. With a request builder,
+        the tools are put in prefix-stable order for prompt caching.
+        """
+        tools = self.context.openai_tools
+        selector = getattr(self.context, "tool_selector", None)
+        if isinstance(selector, ToolSelector):
+            history = self.context.conversation_history
+            selected = {
+                tool.get("name")
+                for tool in selector.select(latest_user_message(history), used_tool_names(history))
+            }
+            tools = [
+                tool for tool in tools
+                if tool.get("function", {}).get("name") in selected
+            ]
+        
+        # Offer the built-in paging tool once a large result has been stored
+        result_store = getattr(self.context.stream_manager, "result_store", None)
+        if isinstance(result_store, ResultStore) and result_store.has_results() and tools:
+            tools = tools + [READ_RESULT_OPENAI_TOOL]
+        
+        builder = getattr(self.context, "request_builder", None)
+        if isinstance(builder, RequestBuilder):
+            tools = builder.order_tools(tools)
+        return tools
+
+    def _record_tool_call_text(self, start, content):
+        """
+        Keep the text the model wrote alongside its tool calls in the history.
+        
+        The text becomes the content of the first assistant tool call entry
+        added since start, as in the OpenAI message format.
+        """
+        history = self.context.conversation_history
+        for entry in history[start:]:
+            if entry.get("role") == "assistant" and entry.get("tool_calls"):
+                entry["content"] = content
+                return
+        history.insert(start, {"role": "assistant", "content": content})
+
+    def _maybe_compact(self):
+        """Start a background compaction of the history if it is over budget."""
+        compactor = getattr(self.context, "history_compactor", None)
+        if isinstance(compactor, HistoryCompactor):
+            compactor.maybe_compact()
+
+    def _record_usage(self, usage):
+        """Record the token usage reported with a completion."""
+        builder = getattr(self.context, "request_builder", None)
+        if usage and isinstance(builder, RequestBuilder):
+            builder.record_usage(usage)
+
+    async def _stream_turn(self, start_time):
+        """
+        Stream one completion, displaying text as it arrives.
+        
+        Text chunks and tool calls come from the same generation, so a final
+        answer costs a single inference. In parallel mode each tool call
+        starts as soon as it is complete, while the rest of the response is
+        still streaming.
+        
+        Returns:
+            True if the model requested tool calls (which have been processed)
+            and another completion is needed, False once the final response
+            has been displayed and added to history.
+        """
+        streamed_chunks = []
+        displayed = False
+        tool_calls = []
+        tool_tasks = []
+        
+        try:
+            async for event in self.context.client.stream_chat(
+                messages=self.context.conversation_history,
+                tools=self._tools_for_turn(),
+            ):
+                if "tool_call" in event:
+                    if not tool_calls and displayed:
+                        # End the streamed preamble before tool progress is shown
+                        await self.ui_manager.finalize_assistant_response("".join(streamed_chunks), time.time() - start_time)
+                        displayed = False
+                    tool_calls.append(event["tool_call"])
+                    if self.tool_processor.parallel:
+                        tool_tasks.append(self.tool_processor.start_tool_call(event["tool_call"]))
+                elif "usage" in event:
+                    self._record_usage(event["usage"])
+                elif event.get("content"):
+                    streamed_chunks.append(event["content"])
+                    # Text after the tool calls is not shown; the next turn answers
+                    if not tool_calls:
+                        displayed = True
+                        await self.ui_manager.stream_assistant_chunk(event["content"])
+        except BaseException:
+            if tool_tasks:
+                await self.tool_processor.cancel_tool_calls(tool_tasks)
+            # Close off any partial output before the error is reported
+            if displayed:
+                await self.ui_manager.finalize_assistant_response("".join(streamed_chunks), time.time() - start_time)
+            raise
+        
+        response_time = time.time() - start_time
+        response_content = "".join(streamed_chunks)
+        
+        if displayed:
+            await self.ui_manager.finalize_assistant_response(response_content, response_time)
+        
+        if tool_calls:
+            history_length = len(self.context.conversation_history)
+            if tool_tasks:
+                await self.tool_processor.finish_tool_calls(tool_tasks)
+            else:
+                await self.tool_processor.process_tool_calls(tool_calls)
+            if response_content:
+                self._record_tool_call_text(history_length, response_content)
+            return True
+        
+        if not streamed_chunks:
+            response_content = "No response"
+            self.ui_manager.print_assistant_response(response_content, response_time)
+        
+        # Add the final assistant message to history after display
+        self.context.conversation_history.append(
+            {"role": "assistant", "content": response_content}
+        )
+        return False
\ No newline at end of file
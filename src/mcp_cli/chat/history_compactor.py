@@ -0,0 +1,187 @@
+# mcp_cli/chat/history_compactor.py
+"""
+Automatic incremental compaction of the chat history.
+
+Once the estimated size of the history crosses a threshold, the oldest
+turns are summarized in the background while the user reads the reply and
+types the next message. The most recent turns are kept verbatim. An earlier
+summary is part of the oldest segment, so each compaction folds the
+previous summary and the turns after it into a new summary.
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from mcp_cli.llm.token_estimator import TokenEstimator
+
+# Estimated history size, in tokens, that triggers compaction; 0 disables it
+DEFAULT_COMPACT_THRESHOLD = 60000
+
+# Number of most recent turns kept verbatim
+DEFAULT_COMPACT_KEEP_TURNS = 4
+
+SUMMARY_REQUEST = (
+    "Please provide a brief summary of our conversation so far. Keep it concise, "
+    "but keep any facts, results and decisions needed to continue."
+)
+
+def _env_int(name: str, default: int) -> int:
+    """Read a non-negative integer setting from the environment."""
+    try:
+        return max(0, int(os.environ.get(name, default)))
+    except ValueError:
+        logging.warning(f"Ignoring invalid {name}: {os.environ.get(name)}")
+        return default
+
+def summary_message(summary: str) -> Dict[str, Any]:
+    """Build the history entry that replaces the summarized turns."""
+    return {
+        "role": "assistant",
+        "content": f"**Conversation Summary**\n\n{summary}\n\n*The conversation history has been compacted.*"
+    }
+
+class HistoryCompactor:
+    """Summarize the oldest turns of a chat once the history grows too large."""
+
+    def __init__(self, context, threshold_tokens: Optional[int] = None, keep_turns: Optional[int] = None):
+        """
+        Initialize the compactor.
+
+        Args:
+            context: The chat context whose conversation_history is compacted
+            threshold_tokens: History size that triggers compaction (default:
+                MCP_CLI_COMPACT_THRESHOLD or 60000); 0 disables compaction
+            keep_turns: Recent turns kept verbatim (default: MCP_CLI_COMPACT_KEEP_TURNS or 4)
+        """
+        self.context = context
+        self.threshold_tokens = (
+            _env_int("MCP_CLI_COMPACT_THRESHOLD", DEFAULT_COMPACT_THRESHOLD)
+            if threshold_tokens is None else threshold_tokens
+        )
+        self.keep_turns = max(1, (
+            _env_int("MCP_CLI_COMPACT_KEEP_TURNS", DEFAULT_COMPACT_KEEP_TURNS)
+            if keep_turns is None else keep_turns
+        ))
+        self.estimator = TokenEstimator()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """True while a background compaction is in progress."""
+        return self._task is not None and not self._task.done()
+
+    def estimate(self) -> int:
+        """Get the estimated size of the history in tokens."""
+        return self.estimator.update(self.context.conversation_history)
+
+    def maybe_compact(self) -> Optional[asyncio.Task]:
+        """
+        Start a background compaction if the history is over the threshold.
+
+        Returns:
+            The compaction task, or None if no compaction was started
+        """
+        if not self.threshold_tokens or self.running:
+            return None
+        if self.estimate() < self.threshold_tokens:
+            return None
+        history = self.context.conversation_history
+        split = self._split_index(history)
+        if split is None:
+            return None
+
+        self._task = asyncio.create_task(self._compact_segment(history[1:split]))
+        return self._task
+
+    def _split_index(self, history: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        Find where the verbatim tail starts.
+
+        Turns start at user messages, so splitting there never separates a
+        tool call from its result.
+
+        Returns:
+            The index of the first kept message, or None if there is nothing to summarize
+        """
+        turn_starts = [
+            i for i, message in enumerate(history)
+            if i > 0 and message.get("role") == "user"
+        ]
+        if len(turn_starts) <= self.keep_turns:
+            return None
+        split = turn_starts[-self.keep_turns]
+        return split if split > 1 else None
+
+    async def compact(self) -> bool:
+        """
+        Summarize everything before the most recent turns.
+
+        Returns:
+            True if the history was compacted
+        """
+        history = self.context.conversation_history
+        split = self._split_index(history)
+        if split is None:
+            return False
+        return await self._compact_segment(history[1:split])
+
+    async def _compact_segment(self, segment: List[Dict[str, Any]]) -> bool:
+        """
+        Replace the messages after the system prompt with a summary.
+
+        The history keeps growing at the end while the summary is generated;
+        the segment is only replaced if it is still in place.
+
+        Args:
+            segment: The messages to summarize, starting right after the system prompt
+
+        Returns:
+            True if the history was compacted
+        """
+        history = self.context.conversation_history
+        request = [history[0]] + segment + [{"role": "user", "content": SUMMARY_REQUEST}]
+
+        # Send the conversation's tools so the request shares its cached prefix
+        builder = getattr(self.context, "request_builder", None)
+        tools = getattr(builder, "tools", None)
+
+        try:
+            if tools:
+                completion = await self.context.client.create_completion(messages=request, tools=tools)
+            else:
+                completion = await self.context.client.create_completion(messages=request)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.warning(f"Automatic history compaction failed: {e}")
+            return False
+
+        summary = completion.get("response")
+        if not summary:
+            logging.warning("Automatic history compaction got no summary")
+            return False
+        if builder is not None and hasattr(builder, "record_usage"):
+            builder.record_usage(completion.get("usage"))
+
+        # Skip if the history was cleared or compacted in the meantime
+        history = self.context.conversation_history
+        end = 1 + len(segment)
+        current = history[1:end]
+        if len(current) != len(segment) or any(a is not b for a, b in zip(current, segment)):
+            logging.debug("History changed during compaction; keeping it as is")
+            return False
+
+        history[1:end] = [summary_message(summary)]
+        logging.debug(f"Compacted {len(segment)} messages; history is now about {self.estimate()} tokens")
+        return True
+
+    async def cancel(self) -> None:
+        """Cancel a background compaction in progress."""
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
@@ -1,14 +1,47 @@
 # mcp_cli/chat/system_prompt.py
 
 # llm imports
-from mcp_cli.llm.system_prompt_generator import SystemPromptGenerator
+from mcp_cli.llm.system_prompt_generator import (
+    SystemPromptGenerator, TOOL_FORMAT_NATIVE, TOOL_FORMAT_INDEX
+)
+from mcp_cli.llm.tools_handler import tools_fingerprint
 
-def generate_system_prompt(tools):
-    """Generate a concise system prompt for the assistant."""
+# Generated prompts by (native_tools, tool set fingerprint)
+_prompt_cache = {}
+
+def generate_system_prompt(tools, native_tools=True, fingerprint=None):
+    """
+    Generate a concise system prompt for the assistant.
+
+    Prompts are cached, so repeated calls for the same tool set cost a
+    dictionary lookup.
+
+    Args:
+        tools: The tools available to the assistant
+        native_tools: True if the tool schemas are sent through the provider's
+            tools parameter, so the prompt leaves them out; otherwise the
+            prompt carries a compact tool index
+        fingerprint: The tool set's fingerprint, if already known
+    """
+    # The native prompt does not mention the tools, so one prompt fits every tool set
+    if native_tools:
+        key = (True, None)
+    else:
+        key = (False, fingerprint or tools_fingerprint(tools))
+
+    system_prompt = _prompt_cache.get(key)
+    if system_prompt is None:
+        system_prompt = _build_system_prompt(tools, native_tools)
+        _prompt_cache[key] = system_prompt
+    return system_prompt
+
+def _build_system_prompt(tools, native_tools):
+    """Build the system prompt from scratch."""
     prompt_generator = SystemPromptGenerator()
     tools_json = {"tools": tools}
 
-    system_prompt = prompt_generator.generate_prompt(tools_json)
+    tool_format = TOOL_FORMAT_NATIVE if native_tools else TOOL_FORMAT_INDEX
+    system_prompt = prompt_generator.generate_prompt(tools_json, tool_format=tool_format)
     system_prompt += """
 
 # Tone and style
@@ -1,22 +1,47 @@
 # mcp_cli/chat/tool_processor.py
 from rich.console import Console
 from rich import print
+import asyncio
 import json
 import logging
+import signal
+from contextlib import contextmanager
+
+# mcp cli imports
+from mcp_cli.llm.table_encoder import encode_tabular_content
+from mcp_cli.tool_results import ResultStore, READ_RESULT_TOOL_NAME
 
 class ToolProcessor:
     """Class to handle tool processing."""
-    
-    def __init__(self, context, ui_manager):
+
+    def __init__(self, context, ui_manager, parallel=True):
+        """
+        Initialize the tool processor.
+
+        Args:
+            context: The chat context
+            ui_manager: The chat UI manager
+            parallel: Run the tool calls of one completion concurrently; the
+                StreamManager applies each server's concurrency limit
+        """
         self.context = context
         self.ui_manager = ui_manager
-    
+        self.parallel = parallel
+        self._task_calls = {}  # Running tool call tasks -> their parsed call
+        self._interrupted = False  # Set when Ctrl+C cancelled this batch of calls
+
     async def process_tool_calls(self, tool_calls):
-        """Process a list of tool calls."""
+        """
+        Process a list of tool calls.
+
+        In parallel mode the calls run concurrently, so
+        the batch takes as long as its slowest call. History entries are
+        appended in the original tool_call order either way.
+        """
         if not tool_calls:
             print("[yellow]Warning: Empty tool_calls list received.[/yellow]")
             return
-            
+
         if not hasattr(self.context, 'stream_manager') or not self.context.stream_manager:
             print("[red]Error: No StreamManager available for tool calls.[/red]")
             # Add a failed tool response to the conversation history
@@ -26,114 +51,290 @@ class ToolProcessor:
                 "content": "Error: No StreamManager available to process tool calls."
             })
             return
-            
+
+        parsed_calls = []
         for tool_call in tool_calls:
             try:
-                # Extract tool_name and raw_arguments
-                if hasattr(tool_call, "function"):
-                    tool_name = getattr(tool_call.function, "name", "unknown tool")
-                    raw_arguments = getattr(tool_call.function, "arguments", {})
-                    tool_call_id = getattr(tool_call, "id", f"call_{tool_name}")
-                elif isinstance(tool_call, dict) and "function" in tool_call:
-                    fn_info = tool_call["function"]
-                    tool_name = fn_info.get("name", "unknown tool")
-                    raw_arguments = fn_info.get("arguments", {})
-                    tool_call_id = tool_call.get("id", f"call_{tool_name}")
-                else:
-                    tool_name = "unknown tool"
-                    raw_arguments = {}
-                    tool_call_id = f"call_{tool_name}"
-                
-                # Get the display name for UI (non-namespaced)
-                display_name = tool_name
-                if hasattr(self.context, 'namespaced_tool_map') and tool_name in self.context.namespaced_tool_map:
-                    display_name = self.context.namespaced_tool_map[tool_name]
-                    logging.debug(f"Using display name '{display_name}' for namespaced tool '{tool_name}'")
+                parsed_calls.append(self._parse_tool_call(tool_call))
+            except Exception as e:
+                print(f"[red]Error processing tool call: {e}[/red]")
+
+        if not parsed_calls:
+            return
+
+        self._interrupted = False
+        if not self.parallel or len(parsed_calls) == 1:
+            for parsed_call in parsed_calls:
+                tool_name, raw_arguments, tool_call_id, display_name = parsed_call
+
+                # Calls after an interrupt are not started
+                if self._interrupted:
+                    self.context.conversation_history.extend(
+                        self._error_entries(tool_name, raw_arguments, tool_call_id, "Tool call cancelled by user")
+                    )
+                    continue
 
                 # Display the tool call with the user-friendly name
                 self.ui_manager.print_tool_call(display_name, raw_arguments)
 
                 # Process tool call using StreamManager - stream_manager handles namespacing internally
+                task = self._start_task(self._execute_tool_call(*parsed_call), parsed_call)
                 with Console().status("[cyan]Executing tool...[/cyan]", spinner="dots"):
-                    try:
-                        # Parse arguments if they're a string
-                        if isinstance(raw_arguments, str):
-                            try:
-                                arguments = json.loads(raw_arguments)
-                            except json.JSONDecodeError:
-                                arguments = raw_arguments
-                        else:
-                            arguments = raw_arguments
-                            
-                        # Call the tool using StreamManager - keep the namespaced name from the LLM
-                        result = await self.context.stream_manager.call_tool(
-                            tool_name=tool_name,  # Use the original tool name from LLM (which should be namespaced)
-                            arguments=arguments
-                        )
-                        
-                        # Add the tool call to conversation history - keep the same namespaced name for consistency
-                        self.context.conversation_history.append({
-                            "role": "assistant",
-                            "content": None,
-                            "tool_calls": [
-                                {
-                                    "id": tool_call_id,
-                                    "type": "function",
-                                    "function": {
-                                        "name": tool_name,  # Keep the namespaced name in history
-                                        "arguments": json.dumps(arguments) if isinstance(arguments, dict) else str(arguments)
-                                    }
-                                }
-                            ]
-                        })
-                        
-                        # Extract content from result
-                        if isinstance(result, dict):
-                            if result.get("isError"):
-                                content = f"Error: {result.get('error', 'Unknown error')}"
-                            else:
-                                content = result.get("content", "No content returned")
-                                if isinstance(content, (list, dict)):
-                                    # Format structured content as JSON string
-                                    content = json.dumps(content, indent=2)
-                        else:
-                            content = str(result)
-                            
-                        # Add the tool response to conversation history - keep namespaced name here too
-                        self.context.conversation_history.append({
-                            "role": "tool",
+                    results = await self._wait_for_tasks([task])
+                self.context.conversation_history.extend(results[0])
+            return
+
+        # Show the whole batch as running at once
+        first_index = None
+        print_batch = getattr(self.ui_manager, "print_tool_call_batch", None)
+        if print_batch is not None:
+            first_index = print_batch([(display_name, raw_arguments) for _, raw_arguments, _, display_name in parsed_calls])
+        else:
+            for _, raw_arguments, _, display_name in parsed_calls:
+                self.ui_manager.print_tool_call(display_name, raw_arguments)
+
+        tasks = [
+            self._start_task(self._execute_concurrent(
+                first_index + batch_index if isinstance(first_index, int) else None,
+                *parsed_call
+            ), parsed_call)
+            for batch_index, parsed_call in enumerate(parsed_calls)
+        ]
+        with Console().status("[cyan]Executing tools...[/cyan]", spinner="dots"):
+            results = await self._wait_for_tasks(tasks)
+
+        # Append to history in the original tool_call order
+        for entries in results:
+            self.context.conversation_history.extend(entries)
+
+    def start_tool_call(self, tool_call):
+        """
+        Start executing a tool call right away, e.g. while a response is still streaming.
+
+        Returns:
+            A task for finish_tool_calls
+        """
+        parsed_call = self._parse_tool_call(tool_call)
+        tool_name, raw_arguments, _, display_name = parsed_call
+
+        ui_index = None
+        start_ui_call = getattr(self.ui_manager, "start_tool_call", None)
+        if start_ui_call is not None:
+            ui_index = start_ui_call(display_name, raw_arguments)
+        else:
+            self.ui_manager.print_tool_call(display_name, raw_arguments)
+
+        return self._start_task(self._execute_concurrent(
+            ui_index if isinstance(ui_index, int) else None, *parsed_call
+        ), parsed_call)
+
+    async def finish_tool_calls(self, tasks):
+        """Wait for tool calls started with start_tool_call and record them in their original order."""
+        self._interrupted = False
+        results = await self._wait_for_tasks(tasks)
+        for entries in results:
+            self.context.conversation_history.extend(entries)
+
+    async def cancel_tool_calls(self, tasks):
+        """Cancel tool calls started with start_tool_call and wait for them to stop, recording nothing."""
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for task in tasks:
+            self._task_calls.pop(task, None)
+
+    def _start_task(self, coro, parsed_call):
+        """Run a tool call in its own task, so an interrupt can cancel it."""
+        task = asyncio.create_task(coro)
+        self._task_calls[task] = parsed_call
+        return task
+
+    async def _wait_for_tasks(self, tasks):
+        """
+        Wait for tool call tasks; Ctrl+C cancels the ones still running.
+
+        Calls that completed keep their results and cancelled calls get an
+        error result, so the turn continues with whatever finished.
+
+        Returns:
+            The history entries of each task, in order
+        """
+        with self._cancel_on_interrupt(tasks):
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = []
+        for task, outcome in zip(tasks, outcomes):
+            tool_name, raw_arguments, tool_call_id, display_name = self._task_calls.pop(task)
+            if isinstance(outcome, asyncio.CancelledError):
+                outcome = self._error_entries(tool_name, raw_arguments, tool_call_id, "Tool call cancelled by user")
+            elif isinstance(outcome, BaseException):
+                print(f"[red]Error executing tool {display_name}: {outcome}[/red]")
+                outcome = self._error_entries(
+                    tool_name, raw_arguments, tool_call_id, f"Could not execute tool. {outcome}"
+                )
+            results.append(outcome)
+        return results
+
+    @contextmanager
+    def _cancel_on_interrupt(self, tasks):
+        """Make Ctrl+C cancel the given tasks instead of exiting, while in the block."""
+        loop = asyncio.get_running_loop()
+
+        def interrupt():
+            running = [task for task in tasks if not task.done()]
+            if running:
+                print("\n[yellow]Interrupted: cancelling running tool calls...[/yellow]")
+            self._interrupted = True
+            for task in running:
+                task.cancel()
+
+        try:
+            previous = signal.signal(signal.SIGINT, lambda signum, frame: loop.call_soon_threadsafe(interrupt))
+        except ValueError:
+            # Signal handlers can only be set from the main thread
+            yield
+            return
+        try:
+            yield
+        finally:
+            signal.signal(signal.SIGINT, previous)
+
+    def _parse_tool_call(self, tool_call):
+        """
+        Extract the tool name, raw arguments and call id from a tool call.
+
+        Returns:
+            Tuple of (tool_name, raw_arguments, tool_call_id, display_name)
+        """
+        # Extract tool_name and raw_arguments
+        if hasattr(tool_call, "function"):
+            tool_name = getattr(tool_call.function, "name", "unknown tool")
+            raw_arguments = getattr(tool_call.function, "arguments", {})
+            tool_call_id = getattr(tool_call, "id", f"call_{tool_name}")
+        elif isinstance(tool_call, dict) and "function" in tool_call:
+            fn_info = tool_call["function"]
+            tool_name = fn_info.get("name", "unknown tool")
+            raw_arguments = fn_info.get("arguments", {})
+            tool_call_id = tool_call.get("id", f"call_{tool_name}")
+        else:
+            tool_name = "unknown tool"
+            raw_arguments = {}
+            tool_call_id = f"call_{tool_name}"
+
+        # Get the display name for UI (non-namespaced)
+        display_name = tool_name
+        if hasattr(self.context, 'namespaced_tool_map') and tool_name in self.context.namespaced_tool_map:
+            display_name = self.context.namespaced_tool_map[tool_name]
+            logging.debug(f"Using display name '{display_name}' for namespaced tool '{tool_name}'")
+
+        return tool_name, raw_arguments, tool_call_id, display_name
+
+    async def _execute_concurrent(self, ui_index, tool_name, raw_arguments, tool_call_id, display_name):
+        """Execute one of several concurrent calls and mark it finished in the UI."""
+        entries = await self._execute_tool_call(tool_name, raw_arguments, tool_call_id, display_name)
+
+        finish_tool_call = getattr(self.ui_manager, "finish_tool_call", None)
+        if finish_tool_call is not None and ui_index is not None:
+            finish_tool_call(ui_index)
+        return entries
+
+    async def _execute_tool_call(self, tool_name, raw_arguments, tool_call_id, display_name):
+        """
+        Execute a single tool call.
+
+        Returns:
+            The assistant tool_call entry and the tool response entry to add
+            to the conversation history
+        """
+        try:
+            # Parse arguments if they're a string
+            if isinstance(raw_arguments, str):
+                try:
+                    arguments = json.loads(raw_arguments)
+                except json.JSONDecodeError:
+                    arguments = raw_arguments
+            else:
+                arguments = raw_arguments
+
+            # Call the tool using StreamManager - keep the namespaced name from the LLM
+            result = await self.context.stream_manager.call_tool(
+                tool_name=tool_name,  # Use the original tool name from LLM (which should be namespaced)
+                arguments=arguments
+            )
+
+            # Record the tool call - keep the same namespaced name for consistency
+            call_entry = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": tool_call_id,
+                        "type": "function",
+                        "function": {
                             "name": tool_name,  # Keep the namespaced name in history
-                            "content": content,
-                            "tool_call_id": tool_call_id
-                        })
-                        
-                    except Exception as e:
-                        print(f"[red]Error executing tool {display_name}: {e}[/red]")
-                        
-                        # Add a failed tool response to maintain conversation flow
-                        # Add a placeholder tool call to history
-                        self.context.conversation_history.append({
-                            "role": "assistant",
-                            "content": None,
-                            "tool_calls": [
-                                {
-                                    "id": tool_call_id,
-                                    "type": "function",
-                                    "function": {
-                                        "name": tool_name,  # Keep the namespaced name
-                                        "arguments": json.dumps(raw_arguments) if isinstance(raw_arguments, dict) else str(raw_arguments)
-                                    }
-                                }
-                            ]
-                        })
-                        
-                        # Add error response
-                        self.context.conversation_history.append({
-                            "role": "tool",
+                            "arguments": json.dumps(arguments) if isinstance(arguments, dict) else str(arguments)
+                        }
+                    }
+                ]
+            }
+
+            # Extract content from result
+            if isinstance(result, dict):
+                if result.get("isError"):
+                    content = f"Error: {result.get('error', 'Unknown error')}"
+                else:
+                    content = result.get("content", "No content returned")
+                    table = encode_tabular_content(content)
+                    if table is not None:
+                        content = table
+                    elif isinstance(content, (list, dict)):
+                        # Format structured content as JSON string
+                        content = json.dumps(content, indent=2)
+            else:
+                content = str(result)
+
+            # Keep oversized results out of the history; the full result is stored for paging
+            result_store = getattr(self.context.stream_manager, "result_store", None)
+            if isinstance(result_store, ResultStore) and tool_name != READ_RESULT_TOOL_NAME:
+                content = result_store.cap(tool_name, content)
+
+            # Record the tool response - keep namespaced name here too
+            return [call_entry, {
+                "role": "tool",
+                "name": tool_name,  # Keep the namespaced name in history
+                "content": content,
+                "tool_call_id": tool_call_id
+            }]
+
+        except Exception as e:
+            print(f"[red]Error executing tool {display_name}: {e}[/red]")
+
+            # Add a failed tool response to maintain conversation flow
+            return self._error_entries(tool_name, raw_arguments, tool_call_id, f"Could not execute tool. {str(e)}")
+
+    def _error_entries(self, tool_name, raw_arguments, tool_call_id, message):
+        """Build the history entries of a tool call that did not produce a result."""
+        return [
+            # Placeholder tool call
+            {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": tool_call_id,
+                        "type": "function",
+                        "function": {
                             "name": tool_name,  # Keep the namespaced name
-                            "content": f"Error: Could not execute tool. {str(e)}",
-                            "tool_call_id": tool_call_id
-                        })
-                        
-            except Exception as e:
-                print(f"[red]Error processing tool call: {e}[/red]")
\ No newline at end of file
+                            "arguments": json.dumps(raw_arguments) if isinstance(raw_arguments, dict) else str(raw_arguments)
+                        }
+                    }
+                ]
+            },
+            # Error response
+            {
+                "role": "tool",
+                "name": tool_name,  # Keep the namespaced name
+                "content": f"Error: {message}",
+                "tool_call_id": tool_call_id
+            }
+        ]
@@ -31,10 +31,9 @@ class ChatUIManager:
         self.spinner_frames = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
         self.spinner_idx = 0
         self.tool_start_time = None  # For timing tool execution
-        self.current_tool_start_time = None  # For timing individual tool
         self.tools_running = False  # Flag to track if tools are currently running
         self.interrupt_requested = False  # Flag to track if user requested interrupt
-        self.tool_times = []  # List to track time taken by each tool
+        self._group = 0  # Counter grouping tool calls that run concurrently
         self.last_input = None  # Store the last input
         self.assistant_live = None # Rich Live instance for streaming response
         self.current_assistant_text = Text() # Text object for streaming
@@ -84,35 +83,87 @@ class ChatUIManager:
     
     def print_tool_call(self, tool_name, raw_arguments):
         """Print formatted tool call."""
+        # Calls printed one by one run one after another, so this one
+        # starts when the previous one has finished
+        self._finish_running_tool_calls()
+        self._start_tool_calls([(tool_name, raw_arguments)])
+    
+    def print_tool_call_batch(self, calls):
+        """
+        Print a batch of tool calls that run concurrently.
+        
+        Args:
+            calls: List of (tool_name, raw_arguments) tuples, in call order
+            
+        Returns:
+            The index of the first call; the others follow in order
+        """
+        self._finish_running_tool_calls()
+        return self._start_tool_calls(calls)
+    
+    def start_tool_call(self, tool_name, raw_arguments):
+        """
+        Print a tool call that runs alongside any calls already running.
+        
+        Returns:
+            The index of the call, for finish_tool_call
+        """
+        running = any(tool["elapsed"] is None for tool in self.tool_calls)
+        return self._start_tool_calls([(tool_name, raw_arguments)], join_running=running)
+    
+    def finish_tool_call(self, index):
+        """
+        Mark a concurrently running tool call as completed.
+        
+        Args:
+            index: The index returned when the call was printed
+        """
+        if index < len(self.tool_calls) and self.tool_calls[index]["elapsed"] is None:
+            self.tool_calls[index]["elapsed"] = time.time() - self.tool_calls[index]["start"]
+            if self.live_display:
+                self.live_display.refresh()
+    
+    def _finish_running_tool_calls(self):
+        """Record the elapsed time of every tool call still marked as running."""
+        now = time.time()
+        for tool in self.tool_calls:
+            if tool["elapsed"] is None:
+                tool["elapsed"] = now - tool["start"]
+    
+    def _start_tool_calls(self, calls, join_running=False):
+        """
+        Record and display tool calls that start now.
+        
+        Returns:
+            The index of the first call
+        """
         # Initialize timer on first tool call
         if not self.tool_start_time:
             self.tool_start_time = time.time()
             self.tools_running = True
         
-        # If this isn't the first tool, record the time for the previous tool
-        if self.current_tool_start_time and self.tool_calls:
-            elapsed = time.time() - self.current_tool_start_time
-            self.tool_times.append(elapsed)
-        
-        # Start timer for this tool
-        self.current_tool_start_time = time.time()
+        now = time.time()
+        first_index = len(self.tool_calls)
+        if not join_running:
+            self._group += 1
         
-        # Handle JSON arguments
-        if isinstance(raw_arguments, str):
-            try:
-                raw_arguments = json.loads(raw_arguments)
-            except json.JSONDecodeError:
-                # If it's not valid JSON, just display as is
-                pass
-
-        # Format as JSON
-        tool_args_str = json.dumps(raw_arguments, indent=2)
-        
-        # Store tool call for compact mode
-        self.tool_calls.append({
-            "name": tool_name,
-            "args": raw_arguments
-        })
+        for tool_name, raw_arguments in calls:
+            # Handle JSON arguments
+            if isinstance(raw_arguments, str):
+                try:
+                    raw_arguments = json.loads(raw_arguments)
+                except json.JSONDecodeError:
+                    # If it's not valid JSON, just display as is
+                    pass
+            
+            # Store tool call for compact mode
+            self.tool_calls.append({
+                "name": tool_name,
+                "args": raw_arguments,
+                "start": now,
+                "elapsed": None,
+                "group": self._group
+            })
         
         # Check if interrupt was requested
         if self.interrupt_requested:
@@ -121,19 +172,20 @@ class ChatUIManager:
             self.interrupt_requested = False
             self.tools_running = False
             self.tool_start_time = None
-            self.current_tool_start_time = None
-            self.tool_times = []
             # You would need to implement actual interruption logic here
             # This might require changes to your async conversation processor
-            return
+            return first_index
         
         if self.verbose_mode:
             # Verbose mode - show full panel
-            tool_md = f"**Tool Call:** {tool_name}\n\n```json\n{tool_args_str}\n```"
-            print(Panel(Markdown(tool_md), style="bold magenta", title="Tool Invocation"))
+            for tool in self.tool_calls[first_index:]:
+                tool_args_str = json.dumps(tool["args"], indent=2)
+                tool_md = f"**Tool Call:** {tool['name']}\n\n```json\n{tool_args_str}\n```"
+                print(Panel(Markdown(tool_md), style="bold magenta", title="Tool Invocation"))
         else:
             # Compact mode - show animated tool calls
             self._display_compact_tool_calls()
+        return first_index
     
     def _get_spinner_char(self):
         """Get the next character in the spinner animation."""
@@ -144,42 +196,46 @@ class ChatUIManager:
     def _display_compact_tool_calls(self):
         """Display tool calls in a compact, animated format on a single line."""
         if self.live_display is None:
-            # Start a new live display with higher refresh rate for accurate timer
-            self.live_display = Live("", refresh_per_second=4, console=self.console)
+            # Start a new live display that re-renders on every refresh so the timers keep running
+            self.live_display = Live(
+                get_renderable=self._render_compact_tool_calls,
+                refresh_per_second=4,
+                console=self.console
+            )
             self.live_display.start()
             # Print interrupt hint below the live display
             print("[dim italic]Press Ctrl+C to interrupt tool execution[/dim italic]", end="\r")
+        else:
+            self.live_display.refresh()
+    
+    def _render_compact_tool_calls(self):
+        """Build the single-line summary of this turn's tool calls."""
+        if not self.tool_calls or not self.tool_start_time:
+            return Text("")
         
         # Calculate elapsed time - recalculate each time to ensure accuracy
         current_time = time.time()
-        current_tool_elapsed = int(current_time - self.current_tool_start_time)
-        total_elapsed_seconds = int(current_time - self.tool_start_time)
-        current_tool_elapsed_str = f"{current_tool_elapsed}s"
-        total_elapsed_str = f"{total_elapsed_seconds}s"
-        
-        # Create a text representation showing each step
+        total_elapsed_str = f"{int(current_time - self.tool_start_time)}s"
         spinner_char = self._get_spinner_char()
-        current_tools = []
         
-        # Show all completed tools with their timing - using dim color for less emphasis
-        for i, tool in enumerate(self.tool_calls[:-1]):
-            if i < len(self.tool_times):
-                time_str = f" ({self.tool_times[i]:.1f}s)"
+        # Tools that ran concurrently share a group and are shown side by side
+        groups = []
+        for i, tool in enumerate(self.tool_calls):
+            if tool["elapsed"] is not None:
+                # Completed tools with their timing - using dim color for less emphasis
+                entry = f"[dim green]{i+1}. {tool['name']} ({tool['elapsed']:.1f}s)[/dim green]"
             else:
-                time_str = ""
-            current_tools.append(f"[dim green]{i+1}. {tool['name']}{time_str}[/dim green]")
-        
-        # Show current tool with spinner and current timing - using less bright colors
-        current_tool = self.tool_calls[-1]
-        current_idx = len(self.tool_calls) - 1
-        current_tools.append(f"[magenta]{current_idx+1}. {current_tool['name']} ({current_tool_elapsed_str})[/magenta]")
+                # Running tools with current timing - using less bright colors
+                running_for = int(current_time - tool["start"])
+                entry = f"[magenta]{i+1}. {tool['name']} ({running_for}s)[/magenta]"
+            if groups and groups[-1][0] == tool["group"]:
+                groups[-1][1].append(entry)
+            else:
+                groups.append((tool["group"], [entry]))
         
         # Build the display text - using muted colors overall
-        tool_text = " → ".join(current_tools)
-        display_text = Text.from_markup(f"[dim]Calling tools (total: {total_elapsed_str}): {spinner_char}[/dim] {tool_text}")
-        
-        # Update the live display
-        self.live_display.update(display_text)
+        tool_text = " → ".join(" [dim]|[/dim] ".join(entries) for _, entries in groups)
+        return Text.from_markup(f"[dim]Calling tools (total: {total_elapsed_str}): {spinner_char}[/dim] {tool_text}")
     
     def print_assistant_response(self, response_content, response_time):
         """Print formatted assistant response (NON-STREAMING)."""
@@ -227,18 +283,14 @@ class ChatUIManager:
     def _stop_tool_display(self):
         """Stop and clear the tool display if active."""
         if not self.verbose_mode and self.live_display:
+            self._finish_running_tool_calls()
             self.live_display.stop()
-            if self.current_tool_start_time and len(self.tool_times) < len(self.tool_calls):
-                elapsed = time.time() - self.current_tool_start_time
-                self.tool_times.append(elapsed)
             print("\r" + " " * 120, end="\r")  # Clear line
             if self.tool_start_time:
                 tool_time = time.time() - self.tool_start_time
                 print(f"[dim]Tools completed in {tool_time:.2f}s total[/dim]")
             self.tool_start_time = None
-            self.current_tool_start_time = None
             self.tools_running = False
-            self.tool_times = []
             self.live_display = None # Ensure it's reset
 
     def _print_final_assistant_panel(self, content: str, response_time: float):
@@ -0,0 +1,236 @@
+# mcp_cli/commands/batch.py
+"""
+Batch command mode: run many prompts or tool calls in one process.
+
+`mcp-cli cmd --batch requests.jsonl` reads one JSON request per line (from a
+file, or stdin with `-`) and runs them concurrently against the command's
+StreamManager and a single LLM client, so the servers are started once for
+the whole batch instead of once per request. Each request is one of:
+
+    {"id": "a", "input": "text", "prompt": "Summarize: {{input}}"}
+    {"id": "b", "tool": "read_query", "args": {"query": "SELECT 1"}}
+
+"prompt" and "system_prompt" default to the command's --prompt and
+--system-prompt; "id" defaults to the line number. A result line is written
+to --output (stdout by default) as soon as each request finishes, so results
+come out in completion order:
+
+    {"id": "b", "line": 2, "ok": true, "result": [...], "elapsed": 0.012}
+    {"id": "a", "line": 1, "ok": false, "error": "...", "elapsed": 1.503}
+
+A failing request produces an error line and does not stop the batch.
+
+The number of requests run at once is set with --workers or
+MCP_CLI_BATCH_WORKERS (default: 8). Requests are read as workers free up, so
+the input can be arbitrarily long.
+"""
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, Optional, TextIO
+
+from mcp_cli.llm.llm_client import get_llm_client
+
+logger = logging.getLogger("mcp_cli.cmd")
+
+# Requests run at once when neither --workers nor MCP_CLI_BATCH_WORKERS is set
+DEFAULT_BATCH_WORKERS = 8
+
+def get_batch_workers(workers: Optional[int] = None) -> int:
+    """Get the worker count from the argument, MCP_CLI_BATCH_WORKERS or the default."""
+    if workers is None:
+        try:
+            workers = int(os.environ.get("MCP_CLI_BATCH_WORKERS", DEFAULT_BATCH_WORKERS))
+        except ValueError:
+            workers = DEFAULT_BATCH_WORKERS
+    return max(1, workers)
+
+class BatchRunner:
+    """Runs batch requests against one StreamManager and one shared LLM client."""
+
+    def __init__(self, stream_manager, provider: str, model: str,
+                 prompt: Optional[str] = None, system_prompt: Optional[str] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            stream_manager: StreamManager the requests' tool calls go through
+            provider: LLM provider for prompt requests
+            model: LLM model for prompt requests
+            prompt: Default prompt template for requests without one
+            system_prompt: Default custom system prompt for requests without one
+        """
+        self.stream_manager = stream_manager
+        self.provider = provider
+        self.model = model
+        self.prompt = prompt
+        self.system_prompt = system_prompt
+        self._client = None
+        self._client_error: Optional[Exception] = None
+        self._client_lock = asyncio.Lock()
+
+    async def _get_client(self):
+        """Create the LLM client on first use; a tool-only batch never needs one."""
+        async with self._client_lock:
+            if self._client is None and self._client_error is None:
+                try:
+                    self._client = get_llm_client(provider=self.provider, model=self.model)
+                    logger.debug(f"Using LLM provider: {self.provider}, model: {self.model}")
+                except Exception as e:
+                    self._client_error = e
+            if self._client_error is not None:
+                raise RuntimeError(
+                    f"Could not initialize LLM client with provider={self.provider}, "
+                    f"model={self.model}. {self._client_error}"
+                )
+            return self._client
+
+    async def run_item(self, line_number: int, line: str) -> Dict[str, Any]:
+        """
+        Run one request line.
+
+        Args:
+            line_number: 1-based line number in the batch input
+            line: The JSON request
+
+        Returns:
+            The result record for the line
+        """
+        record: Dict[str, Any] = {"id": line_number, "line": line_number, "ok": False}
+        start = time.perf_counter()
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            record["id"] = request.get("id", line_number)
+            record["result"] = await self._run_request(request)
+            record["ok"] = True
+        except Exception as e:
+            record.pop("result", None)
+            record["ok"] = False
+            record["error"] = str(e) or type(e).__name__
+        record["elapsed"] = round(time.perf_counter() - start, 4)
+        return record
+
+    async def _run_request(self, request: Dict[str, Any]) -> Any:
+        """Run a parsed request, raising on failure."""
+        if request.get("tool"):
+            args = request.get("args", request.get("tool_args")) or {}
+            if isinstance(args, str):
+                args = json.loads(args)
+            result = await self.stream_manager.call_tool(tool_name=request["tool"], arguments=args)
+            if result.get("isError"):
+                raise RuntimeError(result.get("error", "Unknown error"))
+            return result.get("content", "No content")
+
+        if "input" not in request and "prompt" not in request:
+            raise ValueError("request needs an 'input', 'prompt' or 'tool'")
+
+        # Imported here to avoid a circular import with cmd
+        from mcp_cli.commands.cmd import run_llm_with_tools
+
+        client = await self._get_client()
+        response = await run_llm_with_tools(
+            self.provider,
+            self.model,
+            str(request.get("input", "")),
+            request.get("prompt", self.prompt),
+            request.get("system_prompt", self.system_prompt),
+            self.stream_manager,
+            client=client
+        )
+        # run_llm_with_tools reports failures as "Error: ..." responses
+        if response is None:
+            raise RuntimeError("No content returned from command")
+        if isinstance(response, str) and response.startswith("Error:"):
+            raise RuntimeError(response[len("Error:"):].strip())
+        return response
+
+async def run_batch(source: TextIO, sink: TextIO, runner: BatchRunner,
+                    workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run every request in source, writing a JSON result line to sink as each finishes.
+
+    Args:
+        source: Text stream of JSONL requests
+        sink: Text stream the JSONL results are written to
+        runner: Runs the individual requests
+        workers: Requests run at once (default: MCP_CLI_BATCH_WORKERS)
+
+    Returns:
+        Summary with the number of requests, failures and total seconds
+    """
+    workers = get_batch_workers(workers)
+    # Bounded so that reading stays just ahead of the workers
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    summary = {"total": 0, "failed": 0}
+    start = time.perf_counter()
+
+    async def read_requests():
+        line_number = 0
+        while True:
+            # Reading a pipe blocks, so keep it off the event loop
+            line = await asyncio.to_thread(source.readline)
+            if not line:
+                break
+            line_number += 1
+            if line.strip():
+                await queue.put((line_number, line))
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def work():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            record = await runner.run_item(*item)
+            summary["total"] += 1
+            if not record["ok"]:
+                summary["failed"] += 1
+            sink.write(json.dumps(record, default=str) + "\n")
+            sink.flush()
+
+    tasks = [asyncio.create_task(read_requests())]
+    tasks += [asyncio.create_task(work()) for _ in range(workers)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    summary["elapsed"] = round(time.perf_counter() - start, 4)
+    logger.info(
+        f"Batch finished: {summary['total']} requests, {summary['failed']} failed "
+        f"in {summary['elapsed']}s with {workers} workers"
+    )
+    return summary
+
+async def run_batch_file(batch: str, output: Optional[str], runner: BatchRunner,
+                         workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run a batch from a path (or `-` for stdin) to a path (or stdout).
+
+    Args:
+        batch: Path of the JSONL requests, or `-` for stdin
+        output: Path for the JSONL results; None or `-` for stdout
+        runner: Runs the individual requests
+        workers: Requests run at once (default: MCP_CLI_BATCH_WORKERS)
+
+    Returns:
+        The summary from run_batch
+    """
+    source = sys.stdin if batch == "-" else open(batch, "r")
+    try:
+        sink = sys.stdout if output in (None, "-") else open(output, "w")
+        try:
+            return await run_batch(source, sink, runner, workers)
+        finally:
+            if sink is not sys.stdout:
+                sink.close()
+    finally:
+        if source is not sys.stdin:
+            source.close()
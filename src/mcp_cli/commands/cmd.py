@@ -13,10 +13,17 @@ from rich import print
 
 # llm imports
 from mcp_cli.llm.llm_client import get_llm_client
-from mcp_cli.llm.tools_handler import handle_tool_call, convert_to_openai_tools
+from mcp_cli.llm.tools_handler import handle_tool_call, convert_to_openai_tools, tools_fingerprint
+from mcp_cli.llm.tool_selector import get_tool_selector
+from mcp_cli.llm.request_builder import RequestBuilder
+from mcp_cli.tool_results import ResultStore
 
 # Chat context for system prompt generation
 from mcp_cli.chat.system_prompt import generate_system_prompt
+from mcp_cli.chat.conversation import READ_RESULT_OPENAI_TOOL
+
+# Batch mode
+from mcp_cli.commands.batch import BatchRunner, run_batch_file
 
 # Import StreamManager
 from mcp_cli.stream_manager import StreamManager
@@ -41,6 +48,8 @@ async def cmd_run(
     verbose: bool = False,
     server_names: Optional[Dict[int, str]] = None,
     stream_manager: StreamManager = None,
+    batch: Optional[str] = None,
+    workers: Optional[int] = None,
 ):
     """Run a command in non-interactive mode for automation and scripting."""
     
@@ -63,6 +72,16 @@ async def cmd_run(
         provider_name = provider or os.getenv("LLM_PROVIDER", "openai")
         model_name = model or os.getenv("LLM_MODEL", "gpt-4o-mini")
         
+        # Batch mode: JSONL requests in, JSONL results out, one set of servers
+        if batch:
+            runner = BatchRunner(stream_manager, provider_name, model_name, prompt, system_prompt)
+            try:
+                await run_batch_file(batch, output, runner, workers)
+            except OSError as e:
+                logger.error(f"Error reading batch input or writing results: {e}")
+                sys.exit(1)
+            return
+        
         # Handle input from file or stdin
         input_text = ""
         if input:
@@ -134,26 +153,37 @@ async def run_llm_with_tools(
     input_text, 
     prompt_template, 
     custom_system_prompt,
-    stream_manager
+    stream_manager,
+    client=None
 ):
-    """Run LLM inference with tool support."""
+    """Run LLM inference with tool support, optionally with an existing LLM client."""
     # Use the tools from stream_manager
     # For tools in the LLM context, use the internal (namespaced) tools
     all_tools = stream_manager.get_internal_tools()
     
-    # Convert tools to OpenAI format
-    openai_tools = convert_to_openai_tools(all_tools)
+    # Create LLM client
+    if client is None:
+        try:
+            client = get_llm_client(provider=provider, model=model)
+            logger.debug(f"Using LLM provider: {provider}, model: {model}")
+        except Exception as e:
+            logger.error(f"Error creating LLM client: {e}")
+            return f"Error: Could not initialize LLM client with provider={provider}, model={model}. {str(e)}"
     
-    # Generate system prompt
-    system_prompt = custom_system_prompt or generate_system_prompt(all_tools)
+    # Send tool schemas natively when the provider supports it, otherwise
+    # describe them with a compact index in the system prompt
+    native_tools = getattr(client, "supports_native_tools", True)
     
-    # Create LLM client
-    try:
-        client = get_llm_client(provider=provider, model=model)
-        logger.debug(f"Using LLM provider: {provider}, model: {model}")
-    except Exception as e:
-        logger.error(f"Error creating LLM client: {e}")
-        return f"Error: Could not initialize LLM client with provider={provider}, model={model}. {str(e)}"
+    # Prompt, tool payload and index are cached by tool set fingerprint
+    get_fingerprint = getattr(stream_manager, "get_tools_fingerprint", None)
+    fingerprint = get_fingerprint() if callable(get_fingerprint) else None
+    if not isinstance(fingerprint, str):
+        fingerprint = tools_fingerprint(all_tools)
+    
+    # Generate system prompt
+    system_prompt = custom_system_prompt or generate_system_prompt(
+        all_tools, native_tools=native_tools, fingerprint=fingerprint
+    )
     
     # Build the user prompt
     user_prompt = input_text
@@ -161,6 +191,13 @@ async def run_llm_with_tools(
         # Replace {{input}} in the template with the actual input
         user_prompt = prompt_template.replace("{{input}}", input_text)
     
+    # The tools most relevant to the prompt, in OpenAI format
+    openai_tools = []
+    if native_tools:
+        selected = get_tool_selector(all_tools, fingerprint).select(user_prompt)
+        # Deterministic tool order keeps the prefix cacheable across invocations
+        openai_tools = RequestBuilder().order_tools(convert_to_openai_tools(selected))
+    
     # Create conversation
     conversation = [
         {"role": "system", "content": system_prompt},
@@ -170,7 +207,7 @@ async def run_llm_with_tools(
     # Get completion
     try:
         logger.debug(f"Sending request to LLM...")
-        completion = client.create_completion(
+        completion = await client.create_completion(
             messages=conversation,
             tools=openai_tools
         )
@@ -191,7 +228,7 @@ async def run_llm_with_tools(
                 max_iterations = 3  # Maximum number of additional tool call iterations
                 iterations = 0
                 
-                final_completion = client.create_completion(messages=conversation)
+                final_completion = await create_follow_up_completion(client, conversation, stream_manager)
                 logger.debug(f"Final completion keys: {list(final_completion.keys() if final_completion else [])}")
                 
                 if final_completion is None:
@@ -205,7 +242,7 @@ async def run_llm_with_tools(
                     
                     # Try one more time with another completion
                     logger.debug(f"Getting final response after additional tool calls...")
-                    final_completion = client.create_completion(messages=conversation)
+                    final_completion = await create_follow_up_completion(client, conversation, stream_manager)
                     iterations += 1
                 
                 # If we max out on iterations but still have tool calls, consider it a success but mention it
@@ -257,6 +294,18 @@ async def run_llm_with_tools(
         logger.error(f"Error during LLM completion: {e}")
         return f"Error: An exception occurred while processing your request: {str(e)}"
     
+async def create_follow_up_completion(client, conversation, stream_manager):
+    """
+    Get the completion that follows tool results.
+    
+    Results over the size cap are replaced by a preview in the conversation,
+    so the built-in paging tool is offered once one has been stored.
+    """
+    result_store = getattr(stream_manager, "result_store", None)
+    if isinstance(result_store, ResultStore) and result_store.has_results():
+        return await client.create_completion(messages=conversation, tools=[READ_RESULT_OPENAI_TOOL])
+    return await client.create_completion(messages=conversation)
+
 async def process_tool_calls(tool_calls, conversation, stream_manager):
     """Process tool calls and update conversation."""
     
@@ -0,0 +1,56 @@
+# mcp_cli/commands/fan_out.py
+"""
+Run a per-server query against every server at once.
+
+Commands that report on every server (ping, prompts list, resources list)
+query all of them concurrently, each with its own timeout, and print the
+results in server order once they are all in. The command takes as long as
+the slowest server that answers, and a hung server costs at most the
+timeout instead of holding up the ones after it.
+
+The timeout is set with MCP_CLI_SERVER_QUERY_TIMEOUT (default: 10 seconds).
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Seconds each server gets to answer a command's query
+DEFAULT_SERVER_QUERY_TIMEOUT = 10.0
+
+def get_server_query_timeout() -> Optional[float]:
+    """Get the per-server timeout from MCP_CLI_SERVER_QUERY_TIMEOUT; 0 means none."""
+    try:
+        timeout = float(os.environ.get("MCP_CLI_SERVER_QUERY_TIMEOUT", DEFAULT_SERVER_QUERY_TIMEOUT))
+    except ValueError:
+        return DEFAULT_SERVER_QUERY_TIMEOUT
+    return timeout if timeout > 0 else None
+
+async def query_servers(server_info: List[Dict[str, Any]],
+                        query: Callable[[Dict[str, Any]], Awaitable[Any]],
+                        on_timeout: Callable[[Dict[str, Any], float], Any],
+                        timeout: Optional[float] = None) -> List[Any]:
+    """
+    Query every server concurrently.
+
+    Args:
+        server_info: The servers, as returned by StreamManager.get_server_info()
+        query: Coroutine function taking a server entry and returning its result
+        on_timeout: Function taking a server entry and the timeout, returning
+            the result of a server that did not answer in time
+        timeout: Seconds each server gets (default: MCP_CLI_SERVER_QUERY_TIMEOUT)
+
+    Returns:
+        The results, in the order of server_info
+    """
+    if timeout is None:
+        timeout = get_server_query_timeout()
+
+    async def run(server: Dict[str, Any]) -> Any:
+        try:
+            return await asyncio.wait_for(query(server), timeout)
+        except asyncio.TimeoutError:
+            logging.warning(f"Server {server.get('name')} did not answer within {timeout}s")
+            return on_timeout(server, timeout)
+
+    return await asyncio.gather(*(run(server) for server in server_info))
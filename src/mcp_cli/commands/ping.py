@@ -1,20 +1,93 @@
 # mcp_cli/commands/ping.py
 import typer
 import logging
+import time
 from rich import print
 from rich.markdown import Markdown
 from rich.panel import Panel
 
 # imports
 from chuk_mcp.mcp_client.messages.ping.send_messages import send_ping
+from mcp_cli.health import DEFAULT_TIMEOUT, HealthMonitor, format_health
+from mcp_cli.commands.fan_out import query_servers
+from mcp_cli.stream_manager import StreamManager
 
 # app
 app = typer.Typer(help="Ping commands")
 
+def _health_details(stream_manager, server_name):
+    """Format a server's live health for its ping result, if the stream manager tracks it."""
+    health = getattr(stream_manager, "health", None)
+    if not isinstance(health, HealthMonitor):
+        return ""
+    return f"\n\nHealth: {format_health(health.report(server_name))}"
+
+async def _send_ping(stream_manager, server_name, streams):
+    """
+    Ping a running server.
+    
+    Returns:
+        The round-trip time in seconds, or None if the server did not answer
+    """
+    if isinstance(stream_manager, StreamManager):
+        # Uses the health check timeout and records the result in the server's health
+        return await stream_manager.ping_server(server_name)
+    
+    # Servers attached through the daemon are pinged over their forwarded streams
+    r_stream, w_stream = streams
+    started = time.monotonic()
+    answered = await send_ping(r_stream, w_stream, timeout=DEFAULT_TIMEOUT, retries=1)
+    return time.monotonic() - started if answered else None
+
+async def _ping_server(stream_manager, server):
+    """Ping one server and return the panel reporting the result."""
+    server_display_name = server.get("name", f"Server {server.get('id', '?')}")
+    
+    # If the server already failed during initialization, report that
+    server_status = server.get("status", "Unknown")
+    if "Failed" in server_status or "Error" in server_status:
+        return Panel(Markdown(f"## {server_display_name} failed to initialize.\n\nStatus: {server_status}"), 
+                     style="bold red")
+        
+    # Get the server index in the streams list
+    server_index = stream_manager.server_streams_map.get(server_display_name)
+    if server_index is None:
+        return Panel(Markdown(f"## {server_display_name} not found in stream map."), 
+                     style="bold red")
+        
+    # Start the server if it was deferred in lazy mode
+    if stream_manager.streams[server_index] is None:
+        if not await stream_manager.ensure_server(server_display_name):
+            return Panel(Markdown(f"## {server_display_name} could not be started."), 
+                         style="bold red")
+        
+    # Send ping with error handling
+    try:
+        rtt = await _send_ping(stream_manager, server_display_name, stream_manager.streams[server_index])
+        details = _health_details(stream_manager, server_display_name)
+        if rtt is not None:
+            return Panel(Markdown(f"## {server_display_name} is up! ({rtt * 1000:.0f} ms){details}"), 
+                         style="bold green")
+        return Panel(Markdown(f"## {server_display_name} failed to respond.{details}"), 
+                     style="bold red")
+            
+    except Exception as e:
+        # Log the error but continue processing other servers
+        logging.error(f"Error pinging {server_display_name}: {e}")
+        return Panel(Markdown(f"## {server_display_name} error: {str(e)}"), 
+                     style="bold red")
+
+def _ping_timed_out(stream_manager, server, timeout):
+    """Report a server that did not answer the ping in time."""
+    server_display_name = server.get("name", f"Server {server.get('id', '?')}")
+    details = _health_details(stream_manager, server_display_name)
+    return Panel(Markdown(f"## {server_display_name} failed to respond within {timeout:g}s.{details}"), 
+                 style="bold red")
+
 @app.command("run")
 async def ping_run(stream_manager, server_names=None):
     """
-    Ping all connected servers.
+    Ping all connected servers at once.
     
     Args:
         stream_manager: StreamManager instance
@@ -24,37 +97,11 @@ async def ping_run(stream_manager, server_names=None):
     
     server_info = stream_manager.get_server_info()
     
-    for server in server_info:
-        server_display_name = server.get("name", f"Server {server.get('id', '?')}")
-        
-        # If the server already failed during initialization, report that
-        server_status = server.get("status", "Unknown")
-        if "Failed" in server_status or "Error" in server_status:
-            print(Panel(Markdown(f"## {server_display_name} failed to initialize.\n\nStatus: {server_status}"), 
-                         style="bold red"))
-            continue
-            
-        # Get the server index in the streams list
-        server_index = stream_manager.server_streams_map.get(server_display_name)
-        if server_index is None:
-            print(Panel(Markdown(f"## {server_display_name} not found in stream map."), 
-                         style="bold red"))
-            continue
-            
-        # Get streams for this server
-        r_stream, w_stream = stream_manager.streams[server_index]
-        
-        # Send ping with error handling
-        try:
-            if await send_ping(r_stream, w_stream):
-                print(Panel(Markdown(f"## {server_display_name} is up!"), 
-                            style="bold green"))
-            else:
-                print(Panel(Markdown(f"## {server_display_name} failed to respond."), 
-                            style="bold red"))
-                
-        except Exception as e:
-            # Log the error but continue processing other servers
-            logging.error(f"Error pinging {server_display_name}: {e}")
-            print(Panel(Markdown(f"## {server_display_name} error: {str(e)}"), 
-                        style="bold red"))
\ No newline at end of file
+    # Every server is pinged concurrently; the results are shown in server order
+    panels = await query_servers(
+        server_info,
+        lambda server: _ping_server(stream_manager, server),
+        lambda server, timeout: _ping_timed_out(stream_manager, server, timeout)
+    )
+    for panel in panels:
+        print(panel)
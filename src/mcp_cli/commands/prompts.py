@@ -7,14 +7,78 @@ from rich.panel import Panel
 
 # imports
 from chuk_mcp.mcp_client.messages.prompts.send_messages import send_prompts_list
+from mcp_cli.commands.fan_out import query_servers
 
 # app
 app = typer.Typer(help="Prompts commands")
 
+async def _list_server_prompts(stream_manager, server):
+    """Fetch one server's prompts and return the panel listing them."""
+    server_display_name = server.get("name", f"Server {server.get('id', '?')}")
+    server_status = server.get("status", "Unknown")
+    
+    # Skip servers that failed to initialize
+    if "Failed" in server_status or "Error" in server_status:
+        return Panel(Markdown(f"## {server_display_name} Prompts List\n\nServer not connected."), 
+                     title=f"{server_display_name} Prompts", 
+                     style="bold red")
+        
+    # Get the server index in the streams list
+    server_index = stream_manager.server_streams_map.get(server_display_name)
+    if server_index is None:
+        return Panel(Markdown(f"## {server_display_name} Prompts List\n\nServer not found in streams map."), 
+                     title=f"{server_display_name} Prompts", 
+                     style="bold yellow")
+        
+    # Start the server if it was deferred in lazy mode
+    if stream_manager.streams[server_index] is None:
+        if not await stream_manager.ensure_server(server_display_name):
+            return Panel(Markdown(f"## {server_display_name} Prompts List\n\nServer could not be started."), 
+                         title=f"{server_display_name} Prompts", 
+                         style="bold red")
+        
+    # Get streams for this server
+    r_stream, w_stream = stream_manager.streams[server_index]
+    
+    # Fetch prompts with error handling
+    try:
+        response = await send_prompts_list(r_stream, w_stream)
+        
+        # Handle None response
+        if response is None:
+            return Panel(Markdown(f"## {server_display_name} Prompts List\n\nNo prompts available."), 
+                         title=f"{server_display_name} Prompts", 
+                         style="bold yellow")
+            
+        prompts = response.get("prompts", [])
+        
+        if not prompts:
+            md = f"## {server_display_name} Prompts List\n\nNo prompts available."
+            panel_style = "bold yellow"
+        else:
+            md = f"## {server_display_name} Prompts List\n\n" + "\n".join(f"- {p}" for p in prompts)
+            panel_style = "bold cyan"
+        
+        return Panel(Markdown(md), title=f"{server_display_name} Prompts", style=panel_style)
+        
+    except Exception as e:
+        # Log the error but continue processing other servers
+        logging.error(f"Error fetching prompts from {server_display_name}: {e}")
+        return Panel(Markdown(f"## {server_display_name} Prompts List\n\nError: {str(e)}"), 
+                     title=f"{server_display_name} Prompts", 
+                     style="bold red")
+
+def _prompts_timed_out(server, timeout):
+    """Report a server that did not list its prompts in time."""
+    server_display_name = server.get("name", f"Server {server.get('id', '?')}")
+    return Panel(Markdown(f"## {server_display_name} Prompts List\n\nNo answer within {timeout:g}s."), 
+                 title=f"{server_display_name} Prompts", 
+                 style="bold red")
+
 @app.command("list")
 async def prompts_list(stream_manager, server_names=None):
     """
-    List prompts from all servers.
+    List prompts from all servers, querying them at once.
     
     Args:
         stream_manager: StreamManager instance
@@ -24,53 +88,11 @@ async def prompts_list(stream_manager, server_names=None):
     
     server_info = stream_manager.get_server_info()
     
-    for server in server_info:
-        server_display_name = server.get("name", f"Server {server.get('id', '?')}")
-        server_status = server.get("status", "Unknown")
-        
-        # Skip servers that failed to initialize
-        if "Failed" in server_status or "Error" in server_status:
-            print(Panel(Markdown(f"## {server_display_name} Prompts List\n\nServer not connected."), 
-                         title=f"{server_display_name} Prompts", 
-                         style="bold red"))
-            continue
-            
-        # Get the server index in the streams list
-        server_index = stream_manager.server_streams_map.get(server_display_name)
-        if server_index is None:
-            print(Panel(Markdown(f"## {server_display_name} Prompts List\n\nServer not found in streams map."), 
-                         title=f"{server_display_name} Prompts", 
-                         style="bold yellow"))
-            continue
-            
-        # Get streams for this server
-        r_stream, w_stream = stream_manager.streams[server_index]
-        
-        # Fetch prompts with error handling
-        try:
-            response = await send_prompts_list(r_stream, w_stream)
-            
-            # Handle None response
-            if response is None:
-                print(Panel(Markdown(f"## {server_display_name} Prompts List\n\nNo prompts available."), 
-                            title=f"{server_display_name} Prompts", 
-                            style="bold yellow"))
-                continue
-                
-            prompts = response.get("prompts", [])
-            
-            if not prompts:
-                md = f"## {server_display_name} Prompts List\n\nNo prompts available."
-                panel_style = "bold yellow"
-            else:
-                md = f"## {server_display_name} Prompts List\n\n" + "\n".join(f"- {p}" for p in prompts)
-                panel_style = "bold cyan"
-            
-            print(Panel(Markdown(md), title=f"{server_display_name} Prompts", style=panel_style))
-            
-        except Exception as e:
-            # Log the error but continue processing other servers
-            logging.error(f"Error fetching prompts from {server_display_name}: {e}")
-            print(Panel(Markdown(f"## {server_display_name} Prompts List\n\nError: {str(e)}"), 
-                        title=f"{server_display_name} Prompts", 
-                        style="bold red"))
\ No newline at end of file
+    # Every server is queried concurrently; the results are shown in server order
+    panels = await query_servers(
+        server_info,
+        lambda server: _list_server_prompts(stream_manager, server),
+        _prompts_timed_out
+    )
+    for panel in panels:
+        print(panel)
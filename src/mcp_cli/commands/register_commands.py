@@ -1,11 +1,12 @@
 # mcp_cli/commands/register_commands.py
 import typer
 from mcp_cli.commands import ping, chat, prompts, tools, resources, interactive, cmd
-from mcp_cli.commands import discord_bot # Import the new discord bot module
+from mcp_cli import daemon
 
 # Import our improved run_command implementation
 from mcp_cli.run_command import run_command
 from mcp_cli.stream_manager import StreamManager
+import asyncio
 import logging
 import os
 from typing import Optional
@@ -20,7 +21,8 @@ def ping_command(
     """Simple ping command."""
     from mcp_cli.cli_options import process_options
     servers, user_specified, server_names = process_options(server, disable_filesystem, provider, model, config_file)
-    run_command(ping.ping_run, config_file, servers, user_specified, {"server_names": server_names})
+    run_command(ping.ping_run, config_file, servers, user_specified, {"server_names": server_names},
+                attach_daemon=True)
     return 0
 
 def chat_command(
@@ -75,7 +77,8 @@ def prompts_list_command(
     """List available prompts."""
     from mcp_cli.cli_options import process_options
     servers, user_specified, server_names = process_options(server, disable_filesystem, provider, model, config_file)
-    run_command(prompts.prompts_list, config_file, servers, user_specified, {"server_names": server_names})
+    run_command(prompts.prompts_list, config_file, servers, user_specified, {"server_names": server_names},
+                attach_daemon=True)
     return 0
 
 def tools_list_command(
@@ -88,7 +91,8 @@ def tools_list_command(
     """List available tools."""
     from mcp_cli.cli_options import process_options
     servers, user_specified, server_names = process_options(server, disable_filesystem, provider, model, config_file)
-    run_command(tools.tools_list, config_file, servers, user_specified, {"server_names": server_names})
+    run_command(tools.tools_list, config_file, servers, user_specified, {"server_names": server_names},
+                attach_daemon=True)
     return 0
 
 def tools_call_command(
@@ -101,7 +105,8 @@ def tools_call_command(
     """Call a tool with JSON arguments."""
     from mcp_cli.cli_options import process_options
     servers, user_specified, server_names = process_options(server, disable_filesystem, provider, model, config_file)
-    run_command(tools.tools_call, config_file, servers, user_specified, {"server_names": server_names})
+    run_command(tools.tools_call, config_file, servers, user_specified, {"server_names": server_names},
+                attach_daemon=True)
     return 0
 
 def resources_list_command(
@@ -114,7 +119,8 @@ def resources_list_command(
     """List available resources."""
     from mcp_cli.cli_options import process_options
     servers, user_specified, server_names = process_options(server, disable_filesystem, provider, model, config_file)
-    run_command(resources.resources_list, config_file, servers, user_specified, {"server_names": server_names})
+    run_command(resources.resources_list, config_file, servers, user_specified, {"server_names": server_names},
+                attach_daemon=True)
     return 0
 
 def cmd_command(
@@ -130,8 +136,10 @@ def cmd_command(
     tool: str = None,
     tool_args: str = None,
     system_prompt: str = None,
+    batch: str = None,
+    workers: int = None,
 ):
-    """Command mode for scriptable usage."""
+    """Command mode for scriptable usage; --batch runs a JSONL file of requests."""
     from mcp_cli.cli_options import process_options
     servers, user_specified, server_names = process_options(server, disable_filesystem, provider, model, config_file)
     
@@ -144,10 +152,12 @@ def cmd_command(
         "tool": tool,
         "tool_args": tool_args,
         "system_prompt": system_prompt,
-        "server_names": server_names
+        "server_names": server_names,
+        "batch": batch,
+        "workers": workers
     }
     
-    run_command(cmd.cmd_run, config_file, servers, user_specified, extra_params)
+    run_command(cmd.cmd_run, config_file, servers, user_specified, extra_params, attach_daemon=True)
     return 0
 
 def discord_command(
@@ -158,6 +168,9 @@ def discord_command(
     disable_filesystem: bool = False,
 ):
     """Run the Discord bot to interact with MCP servers and LLM."""
+    # Imported here: discord and aiohttp take longer to import than a tool
+    # call through the daemon takes to run
+    from mcp_cli.commands import discord_bot
     from mcp_cli.cli_options import process_options
     servers, user_specified, server_names = process_options(server, disable_filesystem, provider, model, config_file)
     
@@ -169,6 +182,32 @@ def discord_command(
     run_command(discord_bot.run_discord_bot, config_file, servers, user_specified, {"server_names": server_names})
     return 0
 
+def daemon_command(
+    config_file: str = "server_config.json",
+    server: str = None,
+    provider: str = "openai",
+    model: str = None,
+    disable_filesystem: bool = False,
+    socket: str = None,
+    stop: bool = False,
+):
+    """Keep servers running for later commands to attach to, or --stop a running daemon."""
+    if stop:
+        if asyncio.run(daemon.stop_daemon(socket)):
+            print("Daemon stopped")
+            return 0
+        print("No daemon is running")
+        return 1
+    
+    from mcp_cli.cli_options import process_options
+    servers, user_specified, server_names = process_options(server, disable_filesystem, provider, model, config_file)
+    run_command(daemon.serve_daemon, config_file, servers, user_specified, {
+        "config_file": config_file,
+        "servers": servers,
+        "socket_path": socket
+    })
+    return 0
+
 def register_commands(app: typer.Typer, process_options, run_command_func):
     """Register all commands on the provided Typer app."""
     # Note: We ignore the run_command_func parameter and use our improved version
@@ -178,6 +217,7 @@ def register_commands(app: typer.Typer, process_options, run_command_func):
     app.command("interactive")(interactive_command)
     app.command("cmd")(cmd_command)
     app.command("discord")(discord_command)
+    app.command("daemon")(daemon_command)
     
     # Create sub-typer apps for prompts, tools, and resources.
     prompts_app = typer.Typer(help="Prompts commands")
@@ -12,85 +12,109 @@ from builtins import print as regular_print
 
 # imports
 from chuk_mcp.mcp_client.messages.resources.send_messages import send_resources_list
+from mcp_cli.commands.fan_out import query_servers
 
 # app
 app = typer.Typer(help="Resources commands")
 
-@app.command("list")
-async def resources_list(stream_manager, server_names=None):
+async def _list_server_resources(stream_manager, server):
     """
-    List resources from all servers.
+    Fetch one server's resources.
     
-    Args:
-        stream_manager: StreamManager instance
-        server_names: Optional dictionary mapping server indices to their names
+    Returns:
+        The panel listing them, and any plain lines to print after it
     """
-    rich_print("[cyan]\nFetching Resources List from all servers...[/cyan]")
+    server_display_name = server.get("name", f"Server {server.get('id', '?')}")
+    server_status = server.get("status", "Unknown")
     
-    server_info = stream_manager.get_server_info()
+    # Skip servers that failed to initialize
+    if "Failed" in server_status or "Error" in server_status:
+        return Panel(Markdown(f"## {server_display_name} Resources List\n\nServer not connected."), 
+                     title=f"{server_display_name} Resources", 
+                     style="bold red"), []
     
-    for server in server_info:
-        server_display_name = server.get("name", f"Server {server.get('id', '?')}")
-        server_status = server.get("status", "Unknown")
+    # Get the server index in the streams list
+    server_index = stream_manager.server_streams_map.get(server_display_name)
+    if server_index is None:
+        return Panel(Markdown(f"## {server_display_name} Resources List\n\nServer not found in streams map."), 
+                     title=f"{server_display_name} Resources", 
+                     style="bold yellow"), []
         
-        # Skip servers that failed to initialize
-        if "Failed" in server_status or "Error" in server_status:
-            rich_print(Panel(Markdown(f"## {server_display_name} Resources List\n\nServer not connected."), 
+    # Start the server if it was deferred in lazy mode
+    if stream_manager.streams[server_index] is None:
+        if not await stream_manager.ensure_server(server_display_name):
+            return Panel(Markdown(f"## {server_display_name} Resources List\n\nServer could not be started."), 
                          title=f"{server_display_name} Resources", 
-                         style="bold red"))
-            continue
+                         style="bold red"), []
         
-        # Get the server index in the streams list
-        server_index = stream_manager.server_streams_map.get(server_display_name)
-        if server_index is None:
-            rich_print(Panel(Markdown(f"## {server_display_name} Resources List\n\nServer not found in streams map."), 
+    # Get streams for this server
+    r_stream, w_stream = stream_manager.streams[server_index]
+    
+    # Fetch resources with error handling
+    try:
+        response = await send_resources_list(r_stream, w_stream)
+        
+        # Handle None response
+        if response is None:
+            return Panel(Markdown(f"## {server_display_name} Resources List\n\nNo resources available."), 
                          title=f"{server_display_name} Resources", 
-                         style="bold yellow"))
-            continue
+                         style="bold yellow"), []
             
-        # Get streams for this server
-        r_stream, w_stream = stream_manager.streams[server_index]
+        resources = response.get("resources", [])
         
-        # Fetch resources with error handling
-        try:
-            response = await send_resources_list(r_stream, w_stream)
-            
-            # Handle None response
-            if response is None:
-                rich_print(Panel(Markdown(f"## {server_display_name} Resources List\n\nNo resources available."), 
-                            title=f"{server_display_name} Resources", 
-                            style="bold yellow"))
-                continue
-                
-            resources = response.get("resources", [])
-            
-            if not resources:
-                md = f"## {server_display_name} Resources List\n\nNo resources available."
-                rich_print(Panel(Markdown(md), title=f"{server_display_name} Resources", style="bold yellow"))
+        if not resources:
+            md = f"## {server_display_name} Resources List\n\nNo resources available."
+            return Panel(Markdown(md), title=f"{server_display_name} Resources", style="bold yellow"), []
+        
+        # Format resources as usual for the rich output
+        md = f"## {server_display_name} Resources List\n\n"
+        
+        for r in resources:
+            if isinstance(r, dict):
+                md += f"```json\n{json.dumps(r, indent=2)}\n```\n\n"
             else:
-                # Format resources as usual for the rich output
-                md = f"## {server_display_name} Resources List\n\n"
-                
-                for r in resources:
-                    if isinstance(r, dict):
-                        md += f"```json\n{json.dumps(r, indent=2)}\n```\n\n"
-                    else:
-                        md += f"- {r}\n"
-                
-                # Use the rich library for display
-                rich_print(Panel(Markdown(md), title=f"{server_display_name} Resources", style="bold cyan"))
-                
-                # ADDITIONAL OUTPUT: For the test to catch, print the resources directly to stdout
-                # This won't affect the UI but will be captured by the test
-                if any(isinstance(r, str) for r in resources):
-                    for r in resources:
-                        if isinstance(r, str):
-                            # Print the exact format that the test is looking for
-                            regular_print(f"- {r}")
-            
-        except Exception as e:
-            # Log the error but continue processing other servers
-            logging.error(f"Error fetching resources from {server_display_name}: {e}")
-            rich_print(Panel(Markdown(f"## {server_display_name} Resources List\n\nError: {str(e)}"), 
-                        title=f"{server_display_name} Resources", 
-                        style="bold red"))
\ No newline at end of file
+                md += f"- {r}\n"
+        
+        # ADDITIONAL OUTPUT: For the test to catch, string resources are also
+        # printed directly to stdout in the exact format the test looks for
+        lines = [f"- {r}" for r in resources if isinstance(r, str)]
+        return Panel(Markdown(md), title=f"{server_display_name} Resources", style="bold cyan"), lines
+        
+    except Exception as e:
+        # Log the error but continue processing other servers
+        logging.error(f"Error fetching resources from {server_display_name}: {e}")
+        return Panel(Markdown(f"## {server_display_name} Resources List\n\nError: {str(e)}"), 
+                     title=f"{server_display_name} Resources", 
+                     style="bold red"), []
+
+def _resources_timed_out(server, timeout):
+    """Report a server that did not list its resources in time."""
+    server_display_name = server.get("name", f"Server {server.get('id', '?')}")
+    return Panel(Markdown(f"## {server_display_name} Resources List\n\nNo answer within {timeout:g}s."), 
+                 title=f"{server_display_name} Resources", 
+                 style="bold red"), []
+
+@app.command("list")
+async def resources_list(stream_manager, server_names=None):
+    """
+    List resources from all servers, querying them at once.
+    
+    Args:
+        stream_manager: StreamManager instance
+        server_names: Optional dictionary mapping server indices to their names
+    """
+    rich_print("[cyan]\nFetching Resources List from all servers...[/cyan]")
+    
+    server_info = stream_manager.get_server_info()
+    
+    # Every server is queried concurrently; the results are shown in server order
+    results = await query_servers(
+        server_info,
+        lambda server: _list_server_resources(stream_manager, server),
+        _resources_timed_out
+    )
+    for panel, lines in results:
+        # Use the rich library for display
+        rich_print(panel)
+        for line in lines:
+            regular_print(line)
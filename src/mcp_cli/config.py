@@ -1,6 +1,8 @@
 # mcp_cli/config.py
 import json
+import hashlib
 import logging
+from typing import Any, Dict
 
 # mcp_client imports
 from chuk_mcp.mcp_client.transport.stdio.stdio_server_parameters import StdioServerParameters
@@ -51,3 +53,40 @@ async def load_config(config_path: str, server_name: str) -> StdioServerParamete
         # error
         logging.error(str(e))
         raise
+
+def read_config_file(config_path: str) -> Dict[str, Any]:
+    """
+    Read the whole configuration file, for optional settings.
+
+    Returns:
+        The parsed file, or an empty dict if it is missing or invalid
+    """
+    try:
+        with open(config_path, "r") as config_file:
+            config = json.load(config_file)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.debug(f"Could not read settings from {config_path}: {e}")
+        return {}
+    return config if isinstance(config, dict) else {}
+
+def server_config_hash(server_params) -> str:
+    """
+    Hash a server's command, args and env into a stable cache key.
+
+    Accepts either StdioServerParameters or a raw server entry dictionary
+    from the configuration file.
+    """
+    if isinstance(server_params, dict):
+        identity = {
+            "command": server_params.get("command"),
+            "args": list(server_params.get("args") or []),
+            "env": server_params.get("env") or {},
+        }
+    else:
+        identity = {
+            "command": server_params.command,
+            "args": list(server_params.args or []),
+            "env": server_params.env or {},
+        }
+    encoded = json.dumps(identity, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
@@ -0,0 +1,616 @@
+# mcp_cli/daemon.py
+"""
+Local daemon that keeps servers warm between CLI invocations.
+
+Every ping, tools or cmd invocation normally spawns and initializes all of
+its servers, runs one command and tears them down again, so scripted use
+is dominated by server startup. `mcp-cli daemon` instead brings the
+servers up once and serves a StreamManager over a Unix domain socket:
+
+    mcp-cli daemon --server sqlite &
+    mcp-cli cmd --server sqlite --tool list_tables    # attaches to the daemon
+
+Short-lived commands attach to a running daemon when it serves the same
+configuration file and servers, with the same command, args and env as the
+file has now, and fall back to starting the servers themselves otherwise. The attached process gets a stand-in stream manager:
+tool calls go through the daemon's StreamManager, so its result cache,
+deduplication, concurrency limits and deadlines apply across invocations,
+and each server's stream pair forwards JSON-RPC requests to the server.
+
+The socket is ~/.cache/mcp-cli/daemon.sock by default, or
+MCP_CLI_DAEMON_SOCKET; MCP_CLI_DAEMON=0 stops commands from attaching.
+The protocol is one JSON object per line in each direction: requests carry
+an id, a method and params, and each response carries the id with either a
+result or an error. A client that stops waiting for a request sends a
+cancel notification with the request's id. Forwarded requests are held to
+the server's tool call deadline, and a cancelled one is cancelled on the
+server too.
+"""
+import asyncio
+import json
+import logging
+import os
+import signal
+import weakref
+from typing import Any, Dict, List, Optional
+
+from chuk_mcp.mcp_client.messages.json_rpc_message import JSONRPCMessage
+
+from mcp_cli.config import read_config_file, server_config_hash
+from mcp_cli.tool_catalog import DEFAULT_CACHE_DIR
+
+# Default path of the daemon's socket
+DEFAULT_SOCKET_PATH = os.path.join(DEFAULT_CACHE_DIR, "daemon.sock")
+
+# Seconds a command waits to connect and attach before starting its own servers
+ATTACH_TIMEOUT = 1.0
+
+# Largest line either side accepts, in bytes
+MAX_LINE_BYTES = 64 * 1024 * 1024
+
+class DaemonError(Exception):
+    """Raised when the daemon answers a request with an error."""
+
+def get_socket_path() -> str:
+    """Get the daemon socket path from MCP_CLI_DAEMON_SOCKET."""
+    return os.environ.get("MCP_CLI_DAEMON_SOCKET") or DEFAULT_SOCKET_PATH
+
+def daemon_attach_enabled() -> bool:
+    """Check whether commands may attach to a daemon (MCP_CLI_DAEMON=0 disables it)."""
+    return os.environ.get("MCP_CLI_DAEMON", "1").lower() not in ("0", "false", "no")
+
+def config_hashes(config_file: str, servers: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Hash the configuration of each server, to tell whether it has changed.
+
+    Args:
+        config_file: Path to the configuration file
+        servers: Names of the servers in the file
+
+    Returns:
+        Server names mapped to their hash, or None if the server is not in the file
+    """
+    servers_config = read_config_file(config_file).get("mcpServers") or {}
+    hashes = {}
+    for server in servers:
+        entry = servers_config.get(server)
+        hashes[server] = server_config_hash(entry) if isinstance(entry, dict) else None
+    return hashes
+
+def _encode(payload: Dict[str, Any]) -> bytes:
+    """Encode one protocol line."""
+    return (json.dumps(payload, default=str) + "\n").encode("utf-8")
+
+class DaemonServer:
+    """Serve a StreamManager to other processes over a Unix domain socket."""
+
+    def __init__(self, stream_manager, config_file: str, servers: List[str],
+                 socket_path: Optional[str] = None):
+        """
+        Initialize the daemon.
+
+        Args:
+            stream_manager: The StreamManager whose servers are shared
+            config_file: Path of the configuration file the servers came from
+            servers: Names of the servers, as given on the command line
+            socket_path: Path of the socket (default: MCP_CLI_DAEMON_SOCKET or ~/.cache/mcp-cli/daemon.sock)
+        """
+        self.stream_manager = stream_manager
+        self.config_file = os.path.abspath(config_file)
+        self.servers = list(servers)
+        self.socket_path = socket_path or get_socket_path()
+        # The configuration the servers were started with
+        self.config_hashes = config_hashes(self.config_file, self.servers)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stopped = asyncio.Event()
+        self._connection_tasks = set()  # Requests being handled, across connections
+
+    async def start(self) -> None:
+        """
+        Start listening on the socket.
+
+        Raises:
+            RuntimeError: If another daemon is already listening on it
+        """
+        if os.path.exists(self.socket_path):
+            if await _is_listening(self.socket_path):
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+            # Left behind by a daemon that did not shut down cleanly
+            os.unlink(self.socket_path)
+        os.makedirs(os.path.dirname(self.socket_path) or ".", mode=0o700, exist_ok=True)
+
+        # The daemon runs tools with the user's permissions, so only they may
+        # connect; the socket is created without access for anyone else
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, path=self.socket_path, limit=MAX_LINE_BYTES
+            )
+        finally:
+            os.umask(previous_umask)
+        os.chmod(self.socket_path, 0o600)
+        logging.info(f"Daemon listening on {self.socket_path}")
+
+    def stop(self) -> None:
+        """Ask serve_forever() to return."""
+        self._stopped.set()
+
+    async def serve_forever(self) -> None:
+        """Serve until stop() is called or a shutdown request arrives, then clean up."""
+        try:
+            await self._stopped.wait()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop listening, abandon requests in progress and remove the socket."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for task in list(self._connection_tasks):
+            task.cancel()
+        if self._connection_tasks:
+            await asyncio.gather(*self._connection_tasks, return_exceptions=True)
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the requests of one client; requests run concurrently."""
+        write_lock = asyncio.Lock()
+        tasks = set()
+        requests: Dict[Any, asyncio.Task] = {}  # Request id -> task running it
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.debug(f"Ignoring malformed daemon request: {line[:200]!r}")
+                    continue
+                if request.get("method") == "cancel":
+                    # The client stopped waiting, so stop working on the request
+                    task = requests.get((request.get("params") or {}).get("id"))
+                    if task is not None:
+                        task.cancel()
+                    continue
+                task = asyncio.create_task(self._handle_request(request, writer, write_lock))
+                tasks.add(task)
+                self._connection_tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                task.add_done_callback(self._connection_tasks.discard)
+                request_id = request.get("id")
+                if request_id is not None:
+                    requests[request_id] = task
+                    task.add_done_callback(lambda t, request_id=request_id: requests.pop(request_id, None))
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            logging.debug(f"Daemon client connection ended: {e}")
+        finally:
+            # Nobody is left to read the answers
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _handle_request(self, request: Dict[str, Any], writer: asyncio.StreamWriter,
+                              write_lock: asyncio.Lock) -> None:
+        """Run one request and write its response."""
+        request_id = request.get("id")
+        try:
+            result = await self._dispatch(request.get("method"), request.get("params") or {})
+            response = {"id": request_id, "result": result}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.debug(f"Daemon request {request.get('method')} failed: {e}")
+            response = {"id": request_id, "error": str(e) or type(e).__name__}
+        if request_id is None:
+            return
+        async with write_lock:
+            try:
+                writer.write(_encode(response))
+                await writer.drain()
+            except ConnectionError as e:
+                logging.debug(f"Could not answer daemon client: {e}")
+
+    async def _dispatch(self, method: str, params: Dict[str, Any]) -> Any:
+        """Run a request method."""
+        if method == "attach":
+            return self.snapshot()
+        if method == "call_tool":
+            return await self.stream_manager.call_tool(
+                params["tool_name"], params.get("arguments") or {}, params.get("server_name")
+            )
+        if method in ("rpc", "notify"):
+            return await self._forward(params["server"], params["message"], expect_response=(method == "rpc"))
+        if method == "server_info":
+            return self.stream_manager.get_server_info()
+        if method == "shutdown":
+            logging.info("Daemon shutdown requested")
+            self.stop()
+            return True
+        raise DaemonError(f"Unknown method: {method}")
+
+    async def _forward(self, server_name: str, message: Dict[str, Any], expect_response: bool) -> Any:
+        """
+        Send a client's JSON-RPC message to one of the servers and return the answer.
+
+        The wait for the answer is held to the server's deadline for the call,
+        as for call_tool; when it passes or the request is cancelled, the
+        server is sent notifications/cancelled for it.
+        """
+        if not await self.stream_manager.ensure_server(server_name):
+            raise DaemonError(f"Server '{server_name}' could not be started")
+        server_index = self.stream_manager.server_streams_map[server_name]
+        read_stream, write_stream = self.stream_manager.streams[server_index]
+
+        await write_stream.send(JSONRPCMessage.model_validate(message))
+        if not expect_response:
+            return None
+
+        method = message.get("method")
+        params = message.get("params") or {}
+        tool_name = params.get("name") if method == "tools/call" else method
+        deadline = self.stream_manager.deadlines.deadline(server_name, tool_name or "")
+        try:
+            async with asyncio.timeout(deadline):
+                response = await read_stream.receive()
+        except TimeoutError:
+            raise DaemonError(f"Request '{method}' to server '{server_name}' timed out after {deadline:g}s")
+        return response.model_dump(exclude_none=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get what an attaching client needs to stand in for the stream manager."""
+        stream_manager = self.stream_manager
+        tools = stream_manager.get_all_tools()
+        internal_tools = stream_manager.get_internal_tools()
+        tool_names = {tool["name"] for tool in tools} | {tool["name"] for tool in internal_tools}
+        return {
+            "config_file": self.config_file,
+            "servers": self.servers,
+            "config_hashes": self.config_hashes,
+            "pid": os.getpid(),
+            "server_info": stream_manager.get_server_info(),
+            "server_streams_map": dict(stream_manager.server_streams_map),
+            "tools": tools,
+            "internal_tools": internal_tools,
+            "tool_to_server_map": dict(stream_manager.tool_to_server_map),
+            "tool_servers": {name: stream_manager.get_server_for_tool(name) for name in tool_names},
+            "tools_fingerprint": stream_manager.get_tools_fingerprint(),
+            "queue_stats": stream_manager.get_queue_stats(),
+        }
+
+async def _is_listening(socket_path: str) -> bool:
+    """Check whether something accepts connections on a socket path."""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_unix_connection(socket_path), ATTACH_TIMEOUT)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    return True
+
+async def serve_daemon(stream_manager, config_file: str, servers: List[str],
+                       socket_path: Optional[str] = None, **kwargs) -> bool:
+    """
+    Run the daemon until it is asked to shut down or gets SIGINT or SIGTERM.
+
+    Args:
+        stream_manager: The StreamManager whose servers are shared
+        config_file: Path of the configuration file the servers came from
+        servers: Names of the servers
+        socket_path: Path of the socket (default: MCP_CLI_DAEMON_SOCKET or ~/.cache/mcp-cli/daemon.sock)
+
+    Returns:
+        bool: False if the daemon could not start
+    """
+    daemon = DaemonServer(stream_manager, config_file, servers, socket_path)
+    try:
+        await daemon.start()
+    except (RuntimeError, OSError) as e:
+        logging.error(f"Could not start daemon: {e}")
+        return False
+    print(f"mcp-cli daemon serving {', '.join(servers)} on {daemon.socket_path}", flush=True)
+
+    # Shut down cleanly on Ctrl+C or SIGTERM, so the servers are stopped and the socket removed
+    loop = asyncio.get_running_loop()
+    previous = {}
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            previous[signum] = signal.signal(signum, lambda s, frame: loop.call_soon_threadsafe(daemon.stop))
+        except ValueError:
+            # Signal handlers can only be set from the main thread
+            pass
+    try:
+        await daemon.serve_forever()
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+    return True
+
+class DaemonConnection:
+    """Client side of a connection to the daemon."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._pending: Dict[int, asyncio.Future] = {}  # Request id -> future for its response
+        self._next_id = 0
+        self._closed: Optional[Exception] = None
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    @classmethod
+    async def open(cls, socket_path: str, timeout: float = ATTACH_TIMEOUT) -> "DaemonConnection":
+        """Connect to the daemon listening on a socket path."""
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_unix_connection(socket_path, limit=MAX_LINE_BYTES), timeout
+        )
+        return cls(reader, writer)
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Send a request and wait for its result.
+
+        Raises:
+            DaemonError: If the daemon answered with an error
+            ConnectionError: If the connection to the daemon was lost
+        """
+        if self._closed is not None:
+            raise ConnectionError(str(self._closed))
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.write(_encode({"id": request_id, "method": method, "params": params or {}}))
+            await self._writer.drain()
+            response = await future
+        except asyncio.CancelledError:
+            # Let the daemon stop working on a request nobody waits for
+            if self._closed is None and (future.cancelled() or not future.done()):
+                self._writer.write(_encode({"method": "cancel", "params": {"id": request_id}}))
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+        if "error" in response:
+            raise DaemonError(response["error"])
+        return response.get("result")
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Send a request without waiting for a result."""
+        if self._closed is not None:
+            raise ConnectionError(str(self._closed))
+        self._writer.write(_encode({"method": method, "params": params or {}}))
+        await self._writer.drain()
+
+    async def _read_loop(self) -> None:
+        """Hand each response to the request with the same id."""
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.get(response.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.debug(f"Daemon connection ended: {e!r}")
+        self._fail_pending(ConnectionError("Daemon connection closed"))
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every waiting request and refuse new ones."""
+        self._closed = error
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self) -> None:
+        """Close the connection."""
+        self._fail_pending(ConnectionError("Daemon connection closed"))
+        self._reader_task.cancel()
+        try:
+            await self._reader_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._writer.close()
+
+class _RemoteServer:
+    """JSON-RPC traffic of one server, forwarded through the daemon."""
+
+    def __init__(self, connection: DaemonConnection, server_name: str):
+        self.connection = connection
+        self.server_name = server_name
+        self._task_requests = weakref.WeakKeyDictionary()  # Task -> its request in progress
+
+    async def send(self, message) -> None:
+        """Forward a message; a request's answer is picked up by the sending task's next receive()."""
+        params = {"server": self.server_name, "message": message.model_dump(exclude_none=True)}
+        if getattr(message, "id", None) is not None and getattr(message, "method", None):
+            task = asyncio.current_task()
+            self._task_requests[task] = asyncio.ensure_future(self.connection.request("rpc", params))
+        else:
+            await self.connection.notify("notify", params)
+
+    async def receive(self):
+        """Wait for the answer to the request most recently sent by the current task."""
+        pending = self._task_requests.pop(asyncio.current_task(), None)
+        if pending is None:
+            raise RuntimeError("No request in flight for this task")
+        try:
+            return JSONRPCMessage.model_validate(await pending)
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+
+class _RemoteReadStream:
+    """Read side of a server connection forwarded through the daemon."""
+
+    def __init__(self, remote: _RemoteServer):
+        self.remote = remote
+
+    async def receive(self):
+        return await self.remote.receive()
+
+class _RemoteWriteStream:
+    """Write side of a server connection forwarded through the daemon."""
+
+    def __init__(self, remote: _RemoteServer):
+        self.remote = remote
+
+    async def send(self, message):
+        await self.remote.send(message)
+
+class AttachedStreamManager:
+    """
+    Stand-in for a StreamManager whose servers run in the daemon.
+
+    Provides the parts of the StreamManager interface that commands use:
+    tool calls go to the daemon's StreamManager, and each server's stream
+    pair forwards JSON-RPC requests to the server through the daemon.
+    """
+
+    def __init__(self, connection: DaemonConnection, snapshot: Dict[str, Any]):
+        """
+        Initialize from the daemon's answer to attach.
+
+        Args:
+            connection: Open connection to the daemon
+            snapshot: The daemon's state, from DaemonServer.snapshot()
+        """
+        self.connection = connection
+        self.server_info = snapshot["server_info"]
+        self.server_streams_map = snapshot["server_streams_map"]
+        self.tools = snapshot["tools"]
+        self.internal_tools = snapshot["internal_tools"]
+        self.tool_to_server_map = snapshot["tool_to_server_map"]
+        self.server_names = dict(enumerate(snapshot["servers"]))
+        self._tool_servers = snapshot["tool_servers"]
+        self._tools_fingerprint = snapshot.get("tools_fingerprint")
+        self._queue_stats = snapshot.get("queue_stats") or {}
+
+        # One forwarding stream pair per server, in stream index order
+        self.streams = [None] * len(self.server_streams_map)
+        for server_name, server_index in self.server_streams_map.items():
+            remote = _RemoteServer(connection, server_name)
+            self.streams[server_index] = (_RemoteReadStream(remote), _RemoteWriteStream(remote))
+
+    @classmethod
+    async def attach(cls, config_file: str, servers: List[str],
+                     socket_path: Optional[str] = None) -> Optional["AttachedStreamManager"]:
+        """
+        Attach to a running daemon serving the same configuration and servers.
+
+        The daemon is only used if the servers' command, args and env in the
+        configuration file are unchanged since it started them.
+
+        Args:
+            config_file: Path to the configuration file
+            servers: Names of the servers the command needs
+            socket_path: Path of the socket (default: MCP_CLI_DAEMON_SOCKET or ~/.cache/mcp-cli/daemon.sock)
+
+        Returns:
+            The attached stream manager, or None if no suitable daemon is running
+        """
+        socket_path = socket_path or get_socket_path()
+        if not os.path.exists(socket_path):
+            return None
+        try:
+            connection = await DaemonConnection.open(socket_path)
+        except (OSError, asyncio.TimeoutError) as e:
+            logging.debug(f"No daemon listening on {socket_path}: {e}")
+            return None
+
+        try:
+            snapshot = await asyncio.wait_for(connection.request("attach"), ATTACH_TIMEOUT)
+        except (DaemonError, ConnectionError, asyncio.TimeoutError) as e:
+            logging.debug(f"Could not attach to daemon on {socket_path}: {e}")
+            await connection.close()
+            return None
+
+        if snapshot.get("config_file") != os.path.abspath(config_file) or list(snapshot.get("servers", [])) != list(servers):
+            logging.info(
+                f"Daemon on {socket_path} serves {snapshot.get('servers')} from {snapshot.get('config_file')}; "
+                "starting servers instead"
+            )
+            await connection.close()
+            return None
+
+        if snapshot.get("config_hashes") != config_hashes(os.path.abspath(config_file), list(servers)):
+            logging.info(
+                f"Daemon on {socket_path} runs servers from an older version of {config_file}; "
+                "starting servers instead"
+            )
+            await connection.close()
+            return None
+
+        logging.info(f"Attached to daemon (pid {snapshot.get('pid')}) on {socket_path}")
+        return cls(connection, snapshot)
+
+    async def call_tool(self, tool_name: str, arguments: Any, server_name: Optional[str] = None) -> Dict[str, Any]:
+        """Call a tool through the daemon's StreamManager."""
+        try:
+            return await self.connection.request(
+                "call_tool", {"tool_name": tool_name, "arguments": arguments, "server_name": server_name}
+            )
+        except (DaemonError, ConnectionError) as e:
+            logging.error(f"Exception calling tool {tool_name} through the daemon: {e}")
+            return {"isError": True, "error": str(e), "content": f"Error: {str(e)}"}
+
+    async def ensure_server(self, server_name: str) -> bool:
+        """The daemon starts servers as requests reach them."""
+        return server_name in self.server_streams_map
+
+    def get_all_tools(self) -> List[Dict[str, Any]]:
+        """Get all display tools."""
+        return self.tools
+
+    def get_internal_tools(self) -> List[Dict[str, Any]]:
+        """Get all internal (namespaced) tools."""
+        return self.internal_tools
+
+    def get_tools_fingerprint(self) -> Optional[str]:
+        """Get the daemon's fingerprint of the internal tools."""
+        return self._tools_fingerprint
+
+    def get_server_info(self) -> List[Dict[str, Any]]:
+        """Get information about all servers, as of attaching."""
+        return self.server_info
+
+    def get_queue_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the daemon's per-server queue metrics, as of attaching."""
+        return self._queue_stats
+
+    def get_server_for_tool(self, tool_name: str) -> str:
+        """Get the server name for a tool."""
+        return self._tool_servers.get(tool_name, "Unknown")
+
+    def has_tools(self) -> bool:
+        """Check if any tools are available from any server."""
+        return len(self.tools) > 0
+
+    async def close(self) -> None:
+        """Detach from the daemon; its servers keep running."""
+        await self.connection.close()
+
+async def stop_daemon(socket_path: Optional[str] = None) -> bool:
+    """
+    Ask a running daemon to shut down.
+
+    Returns:
+        bool: True if a daemon was running and accepted the request
+    """
+    socket_path = socket_path or get_socket_path()
+    try:
+        connection = await DaemonConnection.open(socket_path)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    try:
+        return bool(await asyncio.wait_for(connection.request("shutdown"), ATTACH_TIMEOUT))
+    except (DaemonError, ConnectionError, asyncio.TimeoutError):
+        return False
+    finally:
+        await connection.close()
@@ -0,0 +1,122 @@
+# mcp_cli/deadlines.py
+"""
+Per-server and per-tool deadlines for tool calls.
+
+A tool call that has not completed by its deadline is cancelled: the server
+is sent notifications/cancelled for the request and the caller gets an
+error result, so one hung server cannot hold up a chat turn. The deadline
+covers the whole call, including time spent waiting for a free slot on the
+server. Deadlines are set in server_config.json:
+
+    "toolTimeout": 120,
+    "mcpServers": {
+      "code-sandbox": {
+        "command": "uv",
+        "timeout": 300,
+        "toolTimeouts": {"list_files": 10}
+      }
+    }
+
+A tool's own timeout takes precedence over its server's, which takes
+precedence over the top-level "toolTimeout". The default for all servers can
+also be set with MCP_CLI_TOOL_TIMEOUT; 0 means no deadline.
+"""
+import fnmatch
+import logging
+import os
+from typing import Any, Dict, Optional
+
+# Default deadline in seconds for a tool call
+DEFAULT_TOOL_TIMEOUT = 120.0
+
+def _seconds(value: Any, where: str) -> Optional[float]:
+    """Parse a timeout setting; 0 or less means no deadline."""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        logging.warning(f"Ignoring invalid timeout for {where}: {value}")
+        raise
+    return seconds if seconds > 0 else None
+
+def get_default_tool_timeout() -> Optional[float]:
+    """Get the default deadline from MCP_CLI_TOOL_TIMEOUT."""
+    try:
+        return _seconds(os.environ.get("MCP_CLI_TOOL_TIMEOUT", DEFAULT_TOOL_TIMEOUT), "MCP_CLI_TOOL_TIMEOUT")
+    except (TypeError, ValueError):
+        return DEFAULT_TOOL_TIMEOUT
+
+class ToolDeadlines:
+    """Deadlines of tool calls, by server and tool."""
+
+    def __init__(self, default: Optional[float] = DEFAULT_TOOL_TIMEOUT,
+                 servers: Optional[Dict[str, Optional[float]]] = None,
+                 tools: Optional[Dict[str, Dict[str, Optional[float]]]] = None):
+        """
+        Initialize the deadlines.
+
+        Args:
+            default: Deadline in seconds of calls without a more specific one; None for no deadline
+            servers: Server display names mapped to their deadline
+            tools: Server display names mapped to tool names or glob patterns and their deadline
+        """
+        self.default = default
+        self.servers = servers or {}
+        self.tools = tools or {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], server_config_names: Dict[str, str]) -> "ToolDeadlines":
+        """
+        Build the deadlines from a parsed server_config.json.
+
+        Args:
+            config: The configuration file contents
+            server_config_names: Server display names mapped to their entry names in the file
+        """
+        default = get_default_tool_timeout()
+        if "toolTimeout" in config:
+            try:
+                default = _seconds(config["toolTimeout"], "all servers")
+            except (TypeError, ValueError):
+                pass
+
+        servers_config = config.get("mcpServers") or {}
+        servers = {}
+        tools = {}
+        for display_name, entry_name in server_config_names.items():
+            entry = servers_config.get(entry_name) or {}
+            if "timeout" in entry:
+                try:
+                    servers[display_name] = _seconds(entry["timeout"], entry_name)
+                except (TypeError, ValueError):
+                    pass
+            tool_timeouts = entry.get("toolTimeouts")
+            if isinstance(tool_timeouts, dict):
+                parsed = {}
+                for pattern, value in tool_timeouts.items():
+                    try:
+                        parsed[pattern] = _seconds(value, f"{entry_name}.{pattern}")
+                    except (TypeError, ValueError):
+                        pass
+                tools[display_name] = parsed
+        return cls(default, servers, tools)
+
+    def deadline(self, server_name: str, tool_name: str) -> Optional[float]:
+        """
+        Get the deadline of a call.
+
+        Args:
+            server_name: Display name of the server
+            tool_name: The tool's name on the server
+
+        Returns:
+            The deadline in seconds, or None for no deadline
+        """
+        tool_timeouts = self.tools.get(server_name) or {}
+        if tool_name in tool_timeouts:
+            return tool_timeouts[tool_name]
+        for pattern, seconds in tool_timeouts.items():
+            if fnmatch.fnmatchcase(tool_name, pattern):
+                return seconds
+        if server_name in self.servers:
+            return self.servers[server_name]
+        return self.default
@@ -0,0 +1,198 @@
+# mcp_cli/health.py
+"""
+Live health of servers, from a background heartbeat.
+
+StreamManager pings every running server at once on an interval and records
+the round-trip times. Each server's health is derived from its recent
+pings:
+
+- up: answering pings promptly
+- degraded: the last ping failed, or the 95th percentile round-trip time is
+  above the degraded threshold
+- down: several pings in a row have failed
+- unknown: not checked since the server (re)started
+
+Servers that are busy with tool calls are not pinged, since a
+single-threaded server cannot answer until its calls are done; a completed
+call counts as a sign of life instead. The heartbeat is configured with a
+top-level "healthCheck" entry in server_config.json:
+
+    "healthCheck": {"interval": 30, "timeout": 5, "degradedLatency": 1.0, "downAfter": 3}
+
+or with MCP_CLI_HEALTH_INTERVAL; an interval of 0 turns it off.
+"""
+import logging
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+# Seconds between heartbeats
+DEFAULT_INTERVAL = 30.0
+
+# Seconds a server gets to answer a ping
+DEFAULT_TIMEOUT = 5.0
+
+# 95th percentile round-trip time in seconds above which a server is degraded
+DEFAULT_DEGRADED_LATENCY = 1.0
+
+# Failed pings in a row after which a server is down
+DEFAULT_DOWN_AFTER = 3
+
+# Round-trip times kept per server for the percentiles
+RTT_WINDOW = 50
+
+UP = "up"
+DEGRADED = "degraded"
+DOWN = "down"
+UNKNOWN = "unknown"
+
+def get_default_interval() -> float:
+    """Get the heartbeat interval from MCP_CLI_HEALTH_INTERVAL."""
+    try:
+        return max(0.0, float(os.environ.get("MCP_CLI_HEALTH_INTERVAL", DEFAULT_INTERVAL)))
+    except ValueError:
+        return DEFAULT_INTERVAL
+
+def percentile(values, fraction: float) -> Optional[float]:
+    """Get a percentile of some values by the nearest-rank method."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+class ServerHealth:
+    """Recent ping results of one server."""
+
+    def __init__(self, window: int = RTT_WINDOW):
+        self.rtts = deque(maxlen=window)  # Round-trip times in seconds of recent pings
+        self.consecutive_failures = 0
+        self.checks = 0
+        self.failures = 0
+        self.last_checked: Optional[float] = None  # Wall clock time of the last result
+
+    def record_success(self, rtt: Optional[float] = None) -> None:
+        """Record an answered ping, or a completed call if rtt is None."""
+        if rtt is not None:
+            self.rtts.append(rtt)
+            self.checks += 1
+        self.consecutive_failures = 0
+        self.last_checked = time.time()
+
+    def record_failure(self) -> None:
+        """Record a ping that failed or went unanswered."""
+        self.checks += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_checked = time.time()
+
+    def latency(self) -> Dict[str, Optional[float]]:
+        """Get the 50th, 95th and 99th percentile round-trip times in seconds."""
+        return {
+            "p50": percentile(self.rtts, 0.50),
+            "p95": percentile(self.rtts, 0.95),
+            "p99": percentile(self.rtts, 0.99),
+        }
+
+class HealthMonitor:
+    """Health of every server, with the heartbeat settings."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, timeout: float = DEFAULT_TIMEOUT,
+                 degraded_latency: float = DEFAULT_DEGRADED_LATENCY, down_after: int = DEFAULT_DOWN_AFTER):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between heartbeats; 0 turns the heartbeat off
+            timeout: Seconds a server gets to answer a ping
+            degraded_latency: 95th percentile round-trip time above which a server is degraded
+            down_after: Failed pings in a row after which a server is down
+        """
+        self.interval = interval
+        self.timeout = timeout
+        self.degraded_latency = degraded_latency
+        self.down_after = down_after
+        self._servers: Dict[str, ServerHealth] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "HealthMonitor":
+        """
+        Build the monitor from a parsed server_config.json.
+
+        Args:
+            config: The configuration file contents
+        """
+        entry = config.get("healthCheck")
+        interval = get_default_interval()
+        if entry is None:
+            return cls(interval)
+        if entry is False:
+            return cls(0)
+        if not isinstance(entry, dict):
+            logging.warning(f"Ignoring invalid healthCheck setting: {entry}")
+            return cls(interval)
+        try:
+            return cls(
+                interval=max(0.0, float(entry.get("interval", interval))),
+                timeout=max(0.1, float(entry.get("timeout", DEFAULT_TIMEOUT))),
+                degraded_latency=max(0.0, float(entry.get("degradedLatency", DEFAULT_DEGRADED_LATENCY))),
+                down_after=max(1, int(entry.get("downAfter", DEFAULT_DOWN_AFTER))),
+            )
+        except (TypeError, ValueError):
+            logging.warning(f"Ignoring invalid healthCheck setting: {entry}")
+            return cls(interval)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the heartbeat runs."""
+        return self.interval > 0
+
+    def server(self, server_name: str) -> ServerHealth:
+        """Get a server's health record, creating it on first use."""
+        health = self._servers.get(server_name)
+        if health is None:
+            health = ServerHealth()
+            self._servers[server_name] = health
+        return health
+
+    def reset(self, server_name: str) -> None:
+        """Forget a server's results, e.g. because it was (re)started."""
+        self._servers.pop(server_name, None)
+
+    def state(self, server_name: str) -> str:
+        """Get a server's health: up, degraded, down or unknown."""
+        health = self._servers.get(server_name)
+        if health is None or health.last_checked is None:
+            return UNKNOWN
+        if health.consecutive_failures >= self.down_after:
+            return DOWN
+        if health.consecutive_failures:
+            return DEGRADED
+        p95 = percentile(health.rtts, 0.95)
+        if p95 is not None and p95 > self.degraded_latency:
+            return DEGRADED
+        return UP
+
+    def report(self, server_name: str) -> Dict[str, Any]:
+        """Get a server's health, latency percentiles and check counts."""
+        health = self._servers.get(server_name) or ServerHealth()
+        return {
+            "state": self.state(server_name),
+            "latency": health.latency(),
+            "checks": health.checks,
+            "failures": health.failures,
+            "last_checked": health.last_checked,
+        }
+
+def format_health(report: Dict[str, Any]) -> str:
+    """Render a health report as e.g. "up (p50 12 ms, p95 30 ms, p99 41 ms)"."""
+    latency = report.get("latency") or {}
+    parts = [
+        f"{name} {latency[name] * 1000:.0f} ms"
+        for name in ("p50", "p95", "p99")
+        if latency.get(name) is not None
+    ]
+    state = report.get("state", UNKNOWN)
+    return f"{state} ({', '.join(parts)})" if parts else state
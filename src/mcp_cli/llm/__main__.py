@@ -13,8 +13,10 @@ from typing import List, Dict, Any
 
 # Import LLM-related functionality
 from mcp_cli.llm.llm_client import get_llm_client
-from mcp_cli.llm.system_prompt_generator import SystemPromptGenerator
-from mcp_cli.llm.tools_handler import convert_to_openai_tools
+from mcp_cli.llm.system_prompt_generator import (
+    SystemPromptGenerator, TOOL_FORMAT_NATIVE, TOOL_FORMAT_INDEX
+)
+from mcp_cli.llm.tools_handler import get_tool_payload
 
 
 async def test_llm_client(provider: str = "openai",
@@ -40,8 +42,12 @@ async def test_llm_client(provider: str = "openai",
     prompt_generator = SystemPromptGenerator()
     if tools:
         tools_dict = {"tools": tools}
-        system_prompt = prompt_generator.generate_prompt(tools_dict)
-        openai_tools = convert_to_openai_tools(tools)
+        if client.supports_native_tools:
+            system_prompt = prompt_generator.generate_prompt(tools_dict, tool_format=TOOL_FORMAT_NATIVE)
+            openai_tools = get_tool_payload(tools).tools
+        else:
+            system_prompt = prompt_generator.generate_prompt(tools_dict, tool_format=TOOL_FORMAT_INDEX)
+            openai_tools = None
         print(f"Generated system prompt with {len(tools)} tools")
         if verbose:
             print(f"System prompt: {system_prompt[:300]}...\n")
@@ -62,10 +68,10 @@ async def test_llm_client(provider: str = "openai",
         print("\nSending request to LLM...")
         start_time = asyncio.get_event_loop().time()
         
-        if tools:
-            completion = client.create_completion(messages=messages, tools=openai_tools)
+        if openai_tools:
+            completion = await client.create_completion(messages=messages, tools=openai_tools)
         else:
-            completion = client.create_completion(messages=messages)
+            completion = await client.create_completion(messages=messages)
             
         end_time = asyncio.get_event_loop().time()
         elapsed = end_time - start_time
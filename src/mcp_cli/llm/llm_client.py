@@ -1,4 +1,6 @@
 # mcp_cli/llm/llm_client.py
+import sys
+
 from mcp_cli.llm.providers.base import BaseLLMClient
 
 def get_llm_client(provider="openai", model="gpt-4o-mini", api_key=None, api_base=None) -> BaseLLMClient:
@@ -17,3 +19,11 @@ def get_llm_client(provider="openai", model="gpt-4o-mini", api_key=None, api_bas
     else:
         # unsupported provider
         raise ValueError(f"Unsupported provider: {provider}")
+
+async def close_llm_clients() -> None:
+    """Close the connection pools shared by LLM clients created in this event loop."""
+    # Only providers that were used have anything to close; importing the
+    # others just to find that out would slow down every command
+    openai_client = sys.modules.get("mcp_cli.llm.providers.openai_client")
+    if openai_client is not None:
+        await openai_client.close_shared_http_clients()
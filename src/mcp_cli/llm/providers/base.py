@@ -3,9 +3,13 @@ import abc
 from typing import Any, Dict, List, Callable
 
 class BaseLLMClient(abc.ABC):
+    # Whether the provider accepts tool schemas through a native tools parameter.
+    # Providers without function calling get a compact tool index in the prompt instead.
+    supports_native_tools = True
+
     @abc.abstractmethod
-    def create_completion(self, messages: List[Dict], tools: List = None) -> Dict[str, Any]:
-        """Create a chat completion using the specified LLM provider."""
+    async def create_completion(self, messages: List[Dict], tools: List = None) -> Dict[str, Any]:
+        """Create a chat completion using the specified LLM provider. Must be awaited."""
         pass
 
     @abc.abstractmethod
@@ -1,6 +1,7 @@
 # src/llm/providers/ollama_client.py
 import logging
 import json
+import os
 import uuid
 import ollama
 from typing import Any, Dict, List, Optional, Callable
@@ -9,10 +10,16 @@ from typing import Any, Dict, List, Optional, Callable
 from mcp_cli.llm.providers.base import BaseLLMClient
 
 class OllamaLLMClient(BaseLLMClient):
-    def __init__(self, model: str = "qwen2.5-coder"):
+    def __init__(self, model: str = "qwen2.5-coder", native_tools: Optional[bool] = None):
         # set the model
         self.model = model
 
+        # Many Ollama models have no function calling; OLLAMA_NATIVE_TOOLS=0
+        # describes the tools in the system prompt instead of sending them
+        if native_tools is None:
+            native_tools = os.getenv("OLLAMA_NATIVE_TOOLS", "1").lower() not in ("0", "false", "no")
+        self.supports_native_tools = native_tools
+
         # Check for AsyncClient and initialize it
         if not hasattr(ollama, "AsyncClient"):
             raise ValueError("Ollama AsyncClient not found. Please update the ollama library.")
@@ -45,27 +52,7 @@ class OllamaLLMClient(BaseLLMClient):
             # Process any tool calls returned in the message
             if message and message.get('tool_calls'):
                 for tool in message['tool_calls']:
-                    # Ensure arguments are in string format for consistency
-                    arguments = tool.get('function', {}).get('arguments')
-                    if isinstance(arguments, dict):
-                        arguments = json.dumps(arguments)
-                    elif not isinstance(arguments, str):
-                        arguments = str(arguments) if arguments is not None else '{}'
-                    
-                    # Check if an ID is provided; if so, preserve it; otherwise, generate one.
-                    tool_call_id = tool.get("id")
-                    if not tool_call_id:
-                        tool_name = tool.get('function', {}).get('name', 'unknown_tool')
-                        tool_call_id = f"call_{tool_name}_{str(uuid.uuid4())[:8]}"
-                    
-                    tool_calls.append({
-                        "id": tool_call_id,
-                        "type": "function",
-                        "function": {
-                            "name": tool.get('function', {}).get('name', 'unknown_tool'),
-                            "arguments": arguments,
-                        },
-                    })
+                    tool_calls.append(self._normalize_tool_call(tool))
 
             # Return standardized response format
             return {
@@ -76,6 +63,70 @@ class OllamaLLMClient(BaseLLMClient):
             logging.error(f"Ollama API Error: {str(e)}", exc_info=True)
             raise ValueError(f"Ollama API Error: {str(e)}")
 
+    def _normalize_tool_call(self, tool) -> Dict[str, Any]:
+        """Convert an Ollama tool call into the standard tool call format."""
+        # Ensure arguments are in string format for consistency
+        arguments = tool.get('function', {}).get('arguments')
+        if isinstance(arguments, dict):
+            arguments = json.dumps(arguments)
+        elif not isinstance(arguments, str):
+            arguments = str(arguments) if arguments is not None else '{}'
+        
+        # Check if an ID is provided; if so, preserve it; otherwise, generate one.
+        tool_call_id = tool.get("id")
+        if not tool_call_id:
+            tool_name = tool.get('function', {}).get('name', 'unknown_tool')
+            tool_call_id = f"call_{tool_name}_{str(uuid.uuid4())[:8]}"
+        
+        return {
+            "id": tool_call_id,
+            "type": "function",
+            "function": {
+                "name": tool.get('function', {}).get('name', 'unknown_tool'),
+                "arguments": arguments,
+            },
+        }
+
+    async def stream_chat(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None
+    ):
+        """
+        Stream a completion, reporting text and tool calls from the same generation.
+        
+        Yields:
+            Dicts with either a "content" key holding a text chunk or a
+            "tool_call" key holding a tool call in the same format as
+            create_completion returns.
+        """
+        ollama_messages = [{"role": msg["role"], "content": msg["content"]} for msg in messages]
+        logging.debug(f"Starting Ollama streaming chat with model: {self.model}")
+        
+        try:
+            stream = await self.async_client.chat(
+                model=self.model,
+                messages=ollama_messages,
+                stream=True,
+                tools=tools or [],
+            )
+            
+            async for chunk in stream:
+                message = chunk.get('message') if chunk else None
+                if not message:
+                    continue
+                
+                content = message.get('content')
+                if content:
+                    yield {"content": content}
+                
+                # Ollama sends each tool call whole, in a single chunk
+                for tool in message.get('tool_calls') or []:
+                    yield {"tool_call": self._normalize_tool_call(tool)}
+        except Exception as e:
+            logging.error(f"Ollama streaming API Error: {str(e)}", exc_info=True)
+            raise ValueError(f"Ollama streaming API Error: {str(e)}")
+
     async def stream_completion(self, messages: List[Dict[str, Any]]) -> None:
         """Streams the completion from Ollama using the AsyncClient."""
         ollama_messages = [{"role": msg["role"], "content": msg["content"]} for msg in messages]
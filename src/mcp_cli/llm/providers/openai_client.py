@@ -1,18 +1,110 @@
 # src/llm/providers/openai_client.py
+import asyncio
 import os
 import logging
 import json
 import uuid
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from mcp_cli.llm.providers.base import BaseLLMClient
+from mcp_cli.llm.request_builder import make_usage
 
 load_dotenv()
 
+# Connection pool defaults, overridable with OPENAI_MAX_CONNECTIONS,
+# OPENAI_MAX_KEEPALIVE_CONNECTIONS and OPENAI_KEEPALIVE_EXPIRY
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+# Host of the official API; OpenAI-compatible servers set through
+# OPENAI_API_BASE may reject request fields they do not know
+OPENAI_API_HOST = "api.openai.com"
+
+# HTTP clients shared by every OpenAILLMClient, keyed by event loop and pool
+# limits, so clients created per request still reuse warm keep-alive
+# connections; pooled connections belong to the loop that opened them
+_shared_http_clients: Dict[Tuple, httpx.AsyncClient] = {}
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Get the running event loop, or None outside of one."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+def _env_number(name: str, default, cast=int):
+    """Read a numeric setting from the environment, falling back to the default."""
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        logging.warning(f"Ignoring invalid {name}: {raw}")
+        return default
+
+def get_shared_http_client(max_connections: Optional[int] = None,
+                           max_keepalive_connections: Optional[int] = None,
+                           keepalive_expiry: Optional[float] = None) -> httpx.AsyncClient:
+    """
+    Get the shared keep-alive HTTP client for the given pool limits.
+    
+    Args:
+        max_connections: Maximum concurrent connections (default: OPENAI_MAX_CONNECTIONS or 100)
+        max_keepalive_connections: Maximum idle connections kept open (default: OPENAI_MAX_KEEPALIVE_CONNECTIONS or 20)
+        keepalive_expiry: Seconds an idle connection is kept open (default: OPENAI_KEEPALIVE_EXPIRY or 60)
+        
+    Returns:
+        An httpx.AsyncClient configured for the OpenAI API
+    """
+    if max_connections is None:
+        max_connections = _env_number("OPENAI_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)
+    if max_keepalive_connections is None:
+        max_keepalive_connections = _env_number("OPENAI_MAX_KEEPALIVE_CONNECTIONS", DEFAULT_MAX_KEEPALIVE_CONNECTIONS)
+    if keepalive_expiry is None:
+        keepalive_expiry = _env_number("OPENAI_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY, float)
+    
+    # Clients of event loops that have since been closed cannot be reused
+    for stale_key in [k for k in _shared_http_clients if k[0] is not None and k[0].is_closed()]:
+        del _shared_http_clients[stale_key]
+    
+    key = (_running_loop(), max_connections, max_keepalive_connections, keepalive_expiry)
+    http_client = _shared_http_clients.get(key)
+    if http_client is None or http_client.is_closed:
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+        )
+        _shared_http_clients[key] = http_client
+    return http_client
+
+async def close_shared_http_clients() -> None:
+    """
+    Close the shared HTTP clients of the running event loop and their pooled connections.
+    
+    Clients of other event loops are dropped; their connections cannot be
+    closed from this one.
+    """
+    loop = _running_loop()
+    for key in list(_shared_http_clients):
+        http_client = _shared_http_clients.pop(key)
+        if key[0] is loop or key[0] is None:
+            try:
+                await http_client.aclose()
+            except Exception as e:
+                logging.debug(f"Error closing HTTP client: {e}")
+
 class OpenAILLMClient(BaseLLMClient):
-    def __init__(self, model="gpt-4o-mini", api_key=None, api_base=None):
+    def __init__(self, model="gpt-4o-mini", api_key=None, api_base=None,
+                 max_connections=None, max_keepalive_connections=None, keepalive_expiry=None):
         self.model = model
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.api_base = api_base or os.getenv("OPENAI_API_BASE")
@@ -20,14 +112,23 @@ class OpenAILLMClient(BaseLLMClient):
         if not self.api_key:
             raise ValueError("The OPENAI_API_KEY environment variable is not set.")
 
+        # Requests go through the shared connection pool
+        http_client = get_shared_http_client(max_connections, max_keepalive_connections, keepalive_expiry)
         if self.api_key and self.api_base:
-            self.client = OpenAI(api_key=self.api_key, base_url=self.api_base)
+            self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.api_base, http_client=http_client)
         else:
-            self.client = OpenAI(api_key=self.api_key)
+            self.client = AsyncOpenAI(api_key=self.api_key, http_client=http_client)
+
+    @property
+    def is_official_endpoint(self) -> bool:
+        """Whether requests go to the official OpenAI API rather than a compatible server."""
+        if not self.api_base:
+            return True
+        return urlparse(self.api_base).hostname == OPENAI_API_HOST
 
-    def create_completion(self, messages: List[Dict], tools: List = None) -> Dict[str, Any]:
+    async def create_completion(self, messages: List[Dict], tools: List = None) -> Dict[str, Any]:
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 tools=tools or [],
@@ -42,41 +143,161 @@ class OpenAILLMClient(BaseLLMClient):
             else:
                 final_tool_calls = []
                 for call in raw_tool_calls:
-                    # Ensure we have some ID
-                    call_id = call.id or f"call_{uuid.uuid4().hex[:8]}"
-                    
-                    # Parse arguments to JSON string
-                    # This is the key fix to preserve the "location" argument
-                    try:
-                        # If arguments is a string, try to parse it
-                        if isinstance(call.function.arguments, str):
-                            arguments = json.loads(call.function.arguments)
-                        # If it's already a dict, use it as-is
-                        elif isinstance(call.function.arguments, dict):
-                            arguments = call.function.arguments
-                        # If it's None or can't be parsed, use an empty dict
-                        else:
-                            arguments = {}
-                        
-                        # Convert back to JSON string to match test expectations
-                        arguments_str = json.dumps(arguments)
-                    except (json.JSONDecodeError, TypeError):
-                        # Fallback to empty JSON string if parsing fails
-                        arguments_str = "{}"
-                    
-                    # Build the final structure your tests expect
-                    final_tool_calls.append({
-                        "id": call_id,
-                        "function": {
-                            "name": call.function.name,
-                            "arguments": arguments_str,
-                        },
-                    })
-
-            return {
+                    final_tool_calls.append(
+                        self._format_tool_call(call.id, call.function.name, call.function.arguments)
+                    )
+
+            result = {
                 "response": main_response,
                 "tool_calls": final_tool_calls
             }
+            usage = self._extract_usage(getattr(response, "usage", None))
+            if usage is not None:
+                result["usage"] = usage
+            return result
         except Exception as e:
             logging.error(f"OpenAI API Error: {str(e)}")
-            raise ValueError(f"OpenAI API Error: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"OpenAI API Error: {str(e)}")
+
+    def _extract_usage(self, usage) -> Optional[Dict[str, int]]:
+        """Get the prompt and completion token counts, including cached prompt tokens, from a response."""
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        if not isinstance(prompt_tokens, int):
+            return None
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None)
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        return make_usage(
+            prompt_tokens,
+            cached_tokens if isinstance(cached_tokens, int) else 0,
+            completion_tokens if isinstance(completion_tokens, int) else 0,
+        )
+
+    def _format_tool_call(self, call_id: Optional[str], name: str, raw_arguments: Any) -> Dict[str, Any]:
+        """Build a tool call in the standard format with its arguments as a JSON string."""
+        # Ensure we have some ID
+        call_id = call_id or f"call_{uuid.uuid4().hex[:8]}"
+        
+        # Parse arguments to JSON string
+        # This is the key fix to preserve the "location" argument
+        try:
+            # If arguments is a string, try to parse it
+            if isinstance(raw_arguments, str):
+                arguments = json.loads(raw_arguments) if raw_arguments.strip() else {}
+            # If it's already a dict, use it as-is
+            elif isinstance(raw_arguments, dict):
+                arguments = raw_arguments
+            # If it's None or can't be parsed, use an empty dict
+            else:
+                arguments = {}
+            
+            # Convert back to JSON string to match test expectations
+            arguments_str = json.dumps(arguments)
+        except (json.JSONDecodeError, TypeError):
+            # Fallback to empty JSON string if parsing fails
+            arguments_str = "{}"
+        
+        # Build the final structure your tests expect
+        return {
+            "id": call_id,
+            "function": {
+                "name": name,
+                "arguments": arguments_str,
+            },
+        }
+
+    async def stream_chat(self, messages: List[Dict[str, Any]], tools: List = None):
+        """
+        Stream a completion, reporting text deltas and tool calls as they arrive.
+        
+        Tool call arguments arrive as fragments spread over many chunks; each
+        call is yielded as soon as it is complete, i.e. when the next call
+        starts or the stream ends, so it can run while the rest of the
+        response is still being generated.
+        
+        Yields:
+            Dicts with either a "content" key holding a text delta, a
+            "tool_call" key holding a tool call in the same format as
+            create_completion returns, or, at the end, a "usage" key with
+            the token counts of the request.
+        """
+        request = {
+            "model": self.model,
+            "messages": messages,
+            "stream": True,
+        }
+        # Compatible servers may reject stream_options, so usage is only
+        # requested from the official API
+        if self.is_official_endpoint:
+            request["stream_options"] = {"include_usage": True}
+        if tools:
+            request["tools"] = tools
+        
+        # Tool calls being assembled, by index
+        partial_calls: Dict[int, Dict[str, Any]] = {}
+        
+        def complete(call):
+            return {"tool_call": self._format_tool_call(call["id"], call["name"], "".join(call["arguments"]))}
+        
+        try:
+            stream = await self.client.chat.completions.create(**request)
+            usage = None
+            async for chunk in stream:
+                # The final chunk carries the usage of the whole request
+                usage = self._extract_usage(getattr(chunk, "usage", None)) or usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                
+                content = getattr(delta, "content", None)
+                if content:
+                    yield {"content": content}
+                
+                for fragment in getattr(delta, "tool_calls", None) or []:
+                    if fragment.index not in partial_calls:
+                        # A new call starts, so every earlier one is complete
+                        for index in sorted(partial_calls):
+                            if index < fragment.index and not partial_calls[index]["done"]:
+                                partial_calls[index]["done"] = True
+                                yield complete(partial_calls[index])
+                        partial_calls[fragment.index] = {"id": None, "name": None, "arguments": [], "done": False}
+                    
+                    call = partial_calls[fragment.index]
+                    if fragment.id:
+                        call["id"] = fragment.id
+                    function = getattr(fragment, "function", None)
+                    if function is not None:
+                        if function.name:
+                            call["name"] = function.name
+                        if function.arguments:
+                            call["arguments"].append(function.arguments)
+            
+            # The stream has ended, so the remaining calls are complete
+            for index in sorted(partial_calls):
+                if not partial_calls[index]["done"]:
+                    partial_calls[index]["done"] = True
+                    yield complete(partial_calls[index])
+            
+            if usage is not None:
+                yield {"usage": usage}
+        except Exception as e:
+            logging.error(f"OpenAI streaming API Error: {str(e)}")
+            raise ValueError(f"OpenAI streaming API Error: {str(e)}")
+
+    async def stream_completion(self, messages: List[Dict[str, Any]]):
+        """Streams the completion text from OpenAI, yielding content chunks."""
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                stream=True,
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = getattr(chunk.choices[0].delta, "content", None)
+                if content:
+                    yield content
+        except Exception as e:
+            logging.error(f"OpenAI streaming API Error: {str(e)}")
+            yield f"OpenAI streaming error: {str(e)}"
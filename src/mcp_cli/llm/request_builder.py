@@ -0,0 +1,128 @@
+# mcp_cli/llm/request_builder.py
+"""
+Prefix-stable request layout for provider-side prompt caching.
+
+Provider prompt caches only hit when a request starts with exactly the same
+bytes as an earlier one. A chat request is laid out as tools, system prompt
+and then the conversation, so the builder keeps the first two frozen:
+
+- Tools are ordered deterministically, by name, rather than by server
+  start order, so turns that select the same tools send identical bytes.
+- Only the tools selected for the turn are sent, so the request stays
+  small; a turn whose selection changes starts a new cached prefix.
+
+Content that changes from request to request belongs at the tail, after
+the system prompt and the conversation so far.
+
+PromptUsage accumulates the cached and uncached prompt token counts
+reported by the provider, to verify the cache hit rate.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+def tool_name(tool: Dict[str, Any]) -> str:
+    """Get the name of a tool in OpenAI or MCP format."""
+    function = tool.get("function")
+    if isinstance(function, dict):
+        return function.get("name", "")
+    return tool.get("name", "")
+
+def make_usage(prompt_tokens: Optional[int], cached_prompt_tokens: Optional[int],
+               completion_tokens: Optional[int]) -> Dict[str, int]:
+    """
+    Build the usage entry returned with completions.
+
+    Args:
+        prompt_tokens: Total prompt tokens reported by the provider
+        cached_prompt_tokens: Prompt tokens served from the provider's prompt cache
+        completion_tokens: Generated tokens
+
+    Returns:
+        Dict with prompt_tokens, cached_prompt_tokens, uncached_prompt_tokens and completion_tokens
+    """
+    prompt_tokens = prompt_tokens or 0
+    cached_prompt_tokens = cached_prompt_tokens or 0
+    return {
+        "prompt_tokens": prompt_tokens,
+        "cached_prompt_tokens": cached_prompt_tokens,
+        "uncached_prompt_tokens": max(0, prompt_tokens - cached_prompt_tokens),
+        "completion_tokens": completion_tokens or 0,
+    }
+
+class PromptUsage:
+    """Running totals of the prompt tokens a conversation used, and how many were cached."""
+
+    def __init__(self):
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.completion_tokens = 0
+        self.last: Optional[Dict[str, int]] = None
+
+    @property
+    def uncached_prompt_tokens(self) -> int:
+        """Prompt tokens the provider had to process from scratch."""
+        return self.prompt_tokens - self.cached_prompt_tokens
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Fraction of prompt tokens served from the provider's cache."""
+        if not self.prompt_tokens:
+            return 0.0
+        return self.cached_prompt_tokens / self.prompt_tokens
+
+    def record(self, usage: Optional[Dict[str, int]]) -> None:
+        """Add the usage reported with one completion."""
+        if not usage:
+            return
+        self.requests += 1
+        self.prompt_tokens += usage.get("prompt_tokens", 0)
+        self.cached_prompt_tokens += usage.get("cached_prompt_tokens", 0)
+        self.completion_tokens += usage.get("completion_tokens", 0)
+        self.last = usage
+        logging.debug(
+            f"Prompt tokens: {usage.get('prompt_tokens', 0)} "
+            f"({usage.get('cached_prompt_tokens', 0)} cached), "
+            f"completion tokens: {usage.get('completion_tokens', 0)}"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the totals as a dictionary."""
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_prompt_tokens": self.cached_prompt_tokens,
+            "uncached_prompt_tokens": self.uncached_prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cache_hit_rate": self.cache_hit_rate,
+        }
+
+class RequestBuilder:
+    """Build prefix-stable completion requests for one conversation."""
+
+    def __init__(self):
+        self.usage = PromptUsage()
+        self._tools: List[Dict[str, Any]] = []  # Tools sent with the most recent request
+
+    @property
+    def tools(self) -> List[Dict[str, Any]]:
+        """The tools sent with the most recent request, in request order."""
+        return list(self._tools)
+
+    def order_tools(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Get the tools to send, in prefix-stable order.
+
+        Args:
+            tools: The tools selected for this request
+
+        Returns:
+            The selected tools sorted by name; tools with the same name keep
+            their selection order
+        """
+        self._tools = sorted(tools, key=tool_name)
+        return self.tools
+
+    def record_usage(self, usage: Optional[Dict[str, int]]) -> None:
+        """Record the token usage reported with a completion."""
+        self.usage.record(usage)
@@ -1,6 +1,11 @@
 # mcp_cli/llm/system_prompt_generator.py
 import json
 
+# How tool definitions are presented in the system prompt
+TOOL_FORMAT_JSON = "json"      # Full JSON schemas embedded in the prompt
+TOOL_FORMAT_NATIVE = "native"  # Schemas are sent via the provider's tools parameter only
+TOOL_FORMAT_INDEX = "index"    # One compact line per tool, for providers without function calling
+
 class SystemPromptGenerator:
     """
     A class for generating system prompts dynamically based on tools JSON and user inputs.
@@ -19,11 +24,26 @@ class SystemPromptGenerator:
         {{ USER SYSTEM PROMPT }}
         {{ TOOL CONFIGURATION }}
         """
+        self.native_template = """
+        In this environment you have access to a set of tools you can use to answer the user's question.
+        The available tools and their parameters are provided with each request.
+        {{ USER SYSTEM PROMPT }}
+        {{ TOOL CONFIGURATION }}
+        """
+        self.index_template = """
+        In this environment you have access to a set of tools you can use to answer the user's question.
+        String and scalar parameters should be specified as is, while lists and objects should use JSON format. Parameters marked with ? are optional.
+        Here are the functions available:
+        {{ TOOL INDEX }}
+        {{ USER SYSTEM PROMPT }}
+        {{ TOOL CONFIGURATION }}
+        """
         self.default_user_system_prompt = "You are AGENT X, an intelligent assistant capable of using tools to solve user queries effectively."
         self.default_tool_config = "No additional configuration is required."
 
     def generate_prompt(
-        self, tools: dict, user_system_prompt: str = None, tool_config: str = None
+        self, tools: dict, user_system_prompt: str = None, tool_config: str = None,
+        tool_format: str = TOOL_FORMAT_JSON
     ) -> str:
         """
         Generate a system prompt based on the provided tools JSON, user prompt, and tool configuration.
@@ -32,6 +52,8 @@ class SystemPromptGenerator:
             tools (dict): The tools JSON containing definitions of the available tools.
             user_system_prompt (str): A user-provided description or instruction for the assistant (optional).
             tool_config (str): Additional tool configuration information (optional).
+            tool_format (str): How to present the tools: "json" (full schemas), "native"
+                (omitted; sent via the provider's tools parameter) or "index" (one line per tool).
 
         Returns:
             str: The dynamically generated system prompt.
@@ -43,16 +65,53 @@ class SystemPromptGenerator:
         # set the tools config
         tool_config = tool_config or self.default_tool_config
 
-        # get the tools schema
-        tools_json_schema = json.dumps(tools, indent=2)
+        if tool_format == TOOL_FORMAT_NATIVE:
+            prompt = self.native_template
+        elif tool_format == TOOL_FORMAT_INDEX:
+            prompt = self.index_template.replace(
+                "{{ TOOL INDEX }}", self.generate_tool_index(tools.get("tools", []))
+            )
+        else:
+            # get the tools schema
+            tools_json_schema = json.dumps(tools, indent=2)
+
+            # perform replacements
+            prompt = self.template.replace(
+                "{{ TOOL DEFINITIONS IN JSON SCHEMA }}", tools_json_schema
+            )
+            prompt = prompt.replace("{{ FORMATTING INSTRUCTIONS }}", "")
 
-        # perform replacements
-        prompt = self.template.replace(
-            "{{ TOOL DEFINITIONS IN JSON SCHEMA }}", tools_json_schema
-        )
-        prompt = prompt.replace("{{ FORMATTING INSTRUCTIONS }}", "")
         prompt = prompt.replace("{{ USER SYSTEM PROMPT }}", user_system_prompt)
         prompt = prompt.replace("{{ TOOL CONFIGURATION }}", tool_config)
 
         # return the prompt
         return prompt
+
+    def generate_tool_index(self, tools: list) -> str:
+        """
+        Generate a compact index of tools, one line per tool.
+
+        Each line has the tool name, its parameter names (optional ones
+        marked with ?) and the first line of its description.
+
+        Args:
+            tools (list): Tool definitions with name, description and inputSchema.
+
+        Returns:
+            str: The tool index.
+        """
+        lines = []
+        for tool in tools:
+            schema = tool.get("inputSchema") or {}
+            required = set(schema.get("required", []))
+            params = ", ".join(
+                name if name in required else f"{name}?"
+                for name in schema.get("properties", {})
+            )
+            line = f"- {tool.get('name', 'unknown')}({params})"
+
+            description = (tool.get("description") or "").strip()
+            if description:
+                line += f": {description.splitlines()[0]}"
+            lines.append(line)
+        return "\n".join(lines)
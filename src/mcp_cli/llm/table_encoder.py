@@ -0,0 +1,192 @@
+# mcp_cli/llm/table_encoder.py
+"""
+Compact encoding of tabular tool results.
+
+Query results are lists of row dicts. As pretty-printed JSON every column
+name is repeated on every row along with the indentation, so most of the
+tokens are overhead. Homogeneous row lists are encoded as CSV instead, with
+the column names once in the header. Large tables are preceded by summary
+statistics, so the model can answer aggregate questions from the start of
+the result even when the rows themselves are truncated.
+"""
+import ast
+import json
+import logging
+from typing import Any, List, Optional
+
+# Minimum number of rows for the table encoding to pay off
+MIN_TABLE_ROWS = 2
+
+# Tables with more rows than this get summary statistics
+SUMMARY_MIN_ROWS = 50
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+def is_tabular(data: Any) -> bool:
+    """
+    Check if data is a homogeneous list of flat rows.
+
+    Args:
+        data: A decoded tool result
+
+    Returns:
+        True if data is a list of at least MIN_TABLE_ROWS dicts that share
+        the same keys and only hold scalar values
+    """
+    if not isinstance(data, list) or len(data) < MIN_TABLE_ROWS:
+        return False
+    first = data[0]
+    if not isinstance(first, dict) or not first:
+        return False
+    # MCP content items are handled elsewhere
+    if "type" in first and ("text" in first or "data" in first or "resource" in first):
+        return False
+
+    keys = first.keys()
+    for row in data:
+        if not isinstance(row, dict) or row.keys() != keys:
+            return False
+        if not all(isinstance(value, _SCALAR_TYPES) for value in row.values()):
+            return False
+    return True
+
+def parse_rows(text: str) -> Optional[List[Any]]:
+    """
+    Decode rows serialized as text, as JSON or as a Python literal.
+
+    Some servers return query results as the str() of a list of dicts, so
+    Python literals are accepted as well; literal_eval never runs code.
+
+    Returns:
+        The rows if text holds a tabular result, None otherwise
+    """
+    stripped = text.strip()
+    if not (stripped.startswith("[") and stripped.endswith("]")):
+        return None
+    for decode in (json.loads, ast.literal_eval):
+        try:
+            data = decode(stripped)
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            continue
+        return data if is_tabular(data) else None
+    return None
+
+def encode_tabular_content(content: Any) -> Optional[str]:
+    """
+    Encode tool result content compactly if it holds a table.
+
+    Handles rows returned directly as structured content and rows serialized
+    into the text of a single MCP text item.
+
+    Args:
+        content: The content of a tool result
+
+    Returns:
+        The encoded table, or None if the content is not tabular
+    """
+    rows = None
+    if is_tabular(content):
+        rows = content
+    elif isinstance(content, str):
+        rows = parse_rows(content)
+    elif (isinstance(content, list) and len(content) == 1 and isinstance(content[0], dict)
+          and content[0].get("type") == "text" and isinstance(content[0].get("text"), str)):
+        rows = parse_rows(content[0]["text"])
+    if rows is None:
+        return None
+
+    try:
+        return encode_table(rows)
+    except Exception as e:
+        logging.debug(f"Could not encode table: {e}")
+        return None
+
+def encode_table(rows: List[dict]) -> str:
+    """
+    Encode a tabular result as CSV, with summary statistics for large tables.
+
+    The rows are written from the raw values, so every value round-trips
+    exactly: None is an empty field, an empty string is a quoted empty
+    field, and integers stay integers even in columns with nulls.
+
+    Args:
+        rows: Rows that pass is_tabular
+
+    Returns:
+        A header line describing the table, optional summary statistics and the rows as CSV
+    """
+    columns = list(rows[0].keys())
+    parts = [f"Table: {len(rows)} rows x {len(columns)} columns"]
+
+    if len(rows) > SUMMARY_MIN_ROWS:
+        # pandas is slow to import, so it is only loaded for large tables
+        import pandas as pd
+
+        summary = summarize_table(pd.DataFrame.from_records(rows, columns=columns))
+        if summary:
+            parts.append(f"Summary statistics (CSV):\n{summary}")
+
+    lines = [",".join(_csv_field(str(column)) for column in columns)]
+    for row in rows:
+        lines.append(",".join(_csv_value(row[column]) for column in columns))
+    parts.append("Rows (CSV):\n" + "\n".join(lines))
+    return "\n\n".join(parts)
+
+def summarize_table(frame) -> str:
+    """
+    Summarize each column of a table.
+
+    Numeric columns get count, mean, std, min and max; other columns get
+    count, the number of unique values and the most frequent value.
+
+    Returns:
+        The summary as CSV with one row per column, or an empty string
+    """
+    try:
+        lines = ["column,count,mean,std,min,max,unique,top"]
+        for column in frame.columns:
+            series = frame[column]
+            count = int(series.count())
+            if series.dtype.kind in "iuf" and count:
+                values = [
+                    count,
+                    _number(series.mean()), _number(series.std()),
+                    _number(series.min()), _number(series.max()),
+                    "", "",
+                ]
+            else:
+                top = series.mode(dropna=True)
+                values = [
+                    count, "", "", "", "",
+                    int(series.nunique(dropna=True)),
+                    _csv_field(str(top.iloc[0])) if len(top) else "",
+                ]
+            lines.append(",".join([_csv_field(str(column))] + [str(value) for value in values]))
+        return "\n".join(lines)
+    except Exception as e:
+        logging.debug(f"Could not summarize table: {e}")
+        return ""
+
+def _number(value) -> str:
+    """Format a statistic compactly."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return ""
+    if value != value:  # NaN
+        return ""
+    return f"{value:.6g}"
+
+def _csv_value(value: Any) -> str:
+    """Format a cell: None is empty and an empty string is quoted, so they stay distinct."""
+    if value is None:
+        return ""
+    if value == "":
+        return '""'
+    return _csv_field(str(value))
+
+def _csv_field(text: str) -> str:
+    """Quote a CSV field if needed."""
+    if any(ch in text for ch in ',"\n\r'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
@@ -0,0 +1,87 @@
+# mcp_cli/llm/token_estimator.py
+"""
+Approximate token counts for conversation messages.
+
+The estimate uses the common rule of thumb of about four characters per
+token for English text and JSON, plus a small fixed overhead per message for
+the role and separators. It is only used for budgeting, so it trades
+accuracy for not needing a provider-specific tokenizer.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+# Average characters per token
+CHARS_PER_TOKEN = 4
+
+# Tokens added per message for the role and message separators
+MESSAGE_OVERHEAD_TOKENS = 4
+
+def estimate_text_tokens(text: Optional[str]) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def estimate_message_tokens(message: Dict[str, Any]) -> int:
+    """Estimate the number of tokens a message adds to a request."""
+    content = message.get("content")
+    if content is not None and not isinstance(content, str):
+        content = json.dumps(content)
+    tokens = MESSAGE_OVERHEAD_TOKENS + estimate_text_tokens(content)
+    tokens += estimate_text_tokens(message.get("name"))
+
+    for tool_call in message.get("tool_calls") or []:
+        function = tool_call.get("function", {}) if isinstance(tool_call, dict) else {}
+        arguments = function.get("arguments")
+        if arguments is not None and not isinstance(arguments, str):
+            arguments = json.dumps(arguments)
+        tokens += MESSAGE_OVERHEAD_TOKENS
+        tokens += estimate_text_tokens(function.get("name")) + estimate_text_tokens(arguments)
+    return tokens
+
+def estimate_messages_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Estimate the number of tokens in a list of messages."""
+    return sum(estimate_message_tokens(message) for message in messages)
+
+class TokenEstimator:
+    """
+    Running token estimate of a conversation history.
+
+    Histories normally only grow at the end, so update() estimates just the
+    messages appended since the last call. If the history was rewritten
+    (e.g. cleared or compacted) it is estimated again from scratch.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self._counted = 0  # Number of messages included in total
+        self._first = None  # First and last counted message, to detect rewrites
+        self._last = None
+
+    def update(self, messages: List[Dict[str, Any]]) -> int:
+        """
+        Bring the estimate up to date with a history.
+
+        Args:
+            messages: The conversation history
+
+        Returns:
+            The estimated number of tokens in the history
+        """
+        unchanged = (
+            self._counted
+            and len(messages) >= self._counted
+            and messages[0] is self._first
+            and messages[self._counted - 1] is self._last
+        )
+        if not unchanged:
+            self.total = 0
+            self._counted = 0
+
+        for message in messages[self._counted:]:
+            self.total += estimate_message_tokens(message)
+
+        self._counted = len(messages)
+        self._first = messages[0] if messages else None
+        self._last = messages[-1] if messages else None
+        return self.total
@@ -0,0 +1,166 @@
+# mcp_cli/llm/tool_selector.py
+"""
+Relevance-ranked tool selection.
+
+Sending every tool from every server with each completion makes request
+size and model latency grow with the number of configured servers.
+ToolSelector builds a BM25 index over each tool's name, description and
+schema property names once, and picks the tools most relevant to the
+current request, plus any tools already used in the conversation.
+"""
+import math
+import os
+import re
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from mcp_cli.llm.tools_handler import tools_fingerprint
+
+# Number of tools sent per completion; 0 sends every tool
+DEFAULT_TOOL_TOP_K = 20
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Number of tool sets whose indexes are kept in memory
+MAX_CACHED_SELECTORS = 8
+
+# Selectors by (tool set fingerprint, top_k), least recently used first
+_selectors: "OrderedDict[tuple, ToolSelector]" = OrderedDict()
+
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+def get_tool_top_k() -> int:
+    """Get the number of tools to send per completion from MCP_CLI_TOOL_TOP_K."""
+    try:
+        return max(0, int(os.environ.get("MCP_CLI_TOOL_TOP_K", DEFAULT_TOOL_TOP_K)))
+    except ValueError:
+        return DEFAULT_TOOL_TOP_K
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, breaking snake_case and camelCase identifiers apart."""
+    terms = []
+    for word in _WORD_RE.findall(text or ""):
+        parts = _CAMEL_RE.findall(word)
+        terms.extend(part.lower() for part in parts)
+        if len(parts) > 1:
+            terms.append(word.lower())
+    return terms
+
+def _tool_terms(tool: Dict[str, Any]) -> List[str]:
+    """Get the indexed terms of a tool: its name, description and schema property names."""
+    schema = tool.get("inputSchema") or {}
+    properties = schema.get("properties") or {}
+    text = " ".join([tool.get("name", ""), tool.get("description") or "", " ".join(properties)])
+    return tokenize(text)
+
+def used_tool_names(conversation: Iterable[Dict[str, Any]]) -> List[str]:
+    """Get the names of the tools called so far in a conversation, in first-use order."""
+    names = []
+    for message in conversation:
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call.get("function", {}) if isinstance(tool_call, dict) else {}
+            name = function.get("name")
+            if name and name not in names:
+                names.append(name)
+    return names
+
+def latest_user_message(conversation: Iterable[Dict[str, Any]]) -> str:
+    """Get the content of the last user message in a conversation."""
+    for message in reversed(list(conversation)):
+        if message.get("role") == "user" and isinstance(message.get("content"), str):
+            return message["content"]
+    return ""
+
+class ToolSelector:
+    """BM25 index over a fixed set of tools."""
+
+    def __init__(self, tools: List[Dict[str, Any]], top_k: Optional[int] = None):
+        """
+        Build the index.
+
+        Args:
+            tools: Tool definitions with name, description and inputSchema
+            top_k: Number of tools to select (default: MCP_CLI_TOOL_TOP_K); 0 selects every tool
+        """
+        self.tools = list(tools)
+        self.top_k = get_tool_top_k() if top_k is None else top_k
+
+        self._term_counts = [Counter(_tool_terms(tool)) for tool in self.tools]
+        self._lengths = [sum(counts.values()) for counts in self._term_counts]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+        document_frequency = Counter()
+        for counts in self._term_counts:
+            document_frequency.update(counts.keys())
+        count = len(self.tools)
+        self._idf = {
+            term: math.log(1 + (count - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    def score(self, query: str) -> List[float]:
+        """Score every tool against a query, in tool order."""
+        query_terms = set(tokenize(query))
+        scores = []
+        for counts, length in zip(self._term_counts, self._lengths):
+            score = 0.0
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / self._avg_length) if self._avg_length else BM25_K1
+            for term in query_terms:
+                tf = counts.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+    def select(self, query: str, used_tools: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """
+        Select the tools to send with a request.
+
+        Args:
+            query: Text of the request, usually the latest user message
+            used_tools: Names of tools already used in the conversation, always included
+
+        Returns:
+            The top_k most relevant tools plus the used tools, in their original order
+        """
+        if not self.top_k or len(self.tools) <= self.top_k:
+            return list(self.tools)
+
+        scores = self.score(query)
+        ranked = sorted(range(len(self.tools)), key=lambda i: (-scores[i], i))
+        chosen = set(ranked[:self.top_k])
+
+        used = set(used_tools)
+        chosen.update(i for i, tool in enumerate(self.tools) if tool.get("name") in used)
+
+        # Keep the original order so the same selection always serializes identically
+        return [self.tools[i] for i in sorted(chosen)]
+
+def get_tool_selector(tools: List[Dict[str, Any]], fingerprint: Optional[str] = None,
+                      top_k: Optional[int] = None) -> ToolSelector:
+    """
+    Get the cached selector for a tool set, building its index on first use.
+
+    Args:
+        tools: The tools to index
+        fingerprint: The tool set's fingerprint, if already known; computed from tools otherwise
+        top_k: Number of tools to select (default: MCP_CLI_TOOL_TOP_K)
+    """
+    if fingerprint is None:
+        fingerprint = tools_fingerprint(tools)
+    if top_k is None:
+        top_k = get_tool_top_k()
+
+    key = (fingerprint, top_k)
+    selector = _selectors.get(key)
+    if selector is None:
+        selector = ToolSelector(tools, top_k=top_k)
+        _selectors[key] = selector
+        while len(_selectors) > MAX_CACHED_SELECTORS:
+            _selectors.popitem(last=False)
+    else:
+        _selectors.move_to_end(key)
+    return selector
@@ -1,10 +1,21 @@
 # mcp_cli/llm/tools_handler.py
+import hashlib
 import json
 import logging
 import re
 import uuid
+from collections import OrderedDict
 from typing import Any, Dict, Optional, List, Union
 
+from mcp_cli.llm.table_encoder import encode_tabular_content
+from mcp_cli.tool_results import ResultStore, READ_RESULT_TOOL_NAME
+
+# Number of tool sets whose payloads are kept in memory
+MAX_CACHED_TOOL_PAYLOADS = 8
+
+# Tool payloads by tool set fingerprint, least recently used first
+_tool_payloads: "OrderedDict[str, ToolPayload]" = OrderedDict()
+
 def parse_tool_response(response: str) -> Optional[Dict[str, Any]]:
     """Parse tool call from Llama's XML-style format.
 
@@ -29,8 +40,13 @@ def format_tool_response(response_content: Union[List[Dict[str, Any]], Any]) ->
     """Format the response content from a tool.
     
     Preserves structured data in a readable format, ensuring that all data is
-    available for the model in future conversation turns.
+    available for the model in future conversation turns. Tabular results
+    are encoded as CSV, with the column names once in the header.
     """
+    table = encode_tabular_content(response_content)
+    if table is not None:
+        return table
+
     # Handle list of dictionaries (likely structured data like SQL results)
     if isinstance(response_content, list) and response_content and isinstance(response_content[0], dict):
         # Check if this looks like text records with type field
@@ -170,6 +186,11 @@ async def handle_tool_call(
         
         # Format the tool response
         formatted_response: str = format_tool_response(raw_content)
+
+        # Keep oversized results out of the history; the full result is stored for paging
+        result_store = getattr(stream_manager, "result_store", None)
+        if isinstance(result_store, ResultStore) and tool_name != READ_RESULT_TOOL_NAME:
+            formatted_response = result_store.cap(tool_name, formatted_response)
         logging.debug(f"Tool '{tool_name}' Response: {formatted_response}")
 
         # Append the tool call (for tracking purposes)
@@ -206,13 +227,66 @@ async def handle_tool_call(
 
 def convert_to_openai_tools(tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Convert tools into OpenAI-compatible function definitions."""
-    return [
-        {
-            "type": "function",
-            "function": {
-                "name": tool["name"],
-                "parameters": tool.get("inputSchema", {}),
-            },
+    openai_tools = []
+    for tool in tools:
+        function = {
+            "name": tool["name"],
+            "parameters": tool.get("inputSchema", {}),
         }
-        for tool in tools
-    ]
\ No newline at end of file
+        # The native tools parameter is the only place the model sees the
+        # description when the system prompt omits the tool schemas
+        if tool.get("description"):
+            function["description"] = tool["description"]
+        openai_tools.append({"type": "function", "function": function})
+    return openai_tools
+
+
+def tools_fingerprint(tools: List[Dict[str, Any]]) -> str:
+    """Fingerprint a tool set: the sha256 of its canonical JSON encoding."""
+    encoded = json.dumps(tools, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ToolPayload:
+    """
+    OpenAI tool definitions for one tool set, built once and shared.
+
+    Attributes:
+        fingerprint: Fingerprint of the tool set the payload was built from
+        tools: The OpenAI-compatible function definitions
+    """
+
+    def __init__(self, fingerprint: str, tools: List[Dict[str, Any]]):
+        self.fingerprint = fingerprint
+        self.tools = convert_to_openai_tools(tools)
+
+
+def get_tool_payload(tools: List[Dict[str, Any]], fingerprint: Optional[str] = None) -> ToolPayload:
+    """
+    Get the cached OpenAI tool payload for a tool set, building it on first use.
+
+    Args:
+        tools: The tools to convert
+        fingerprint: The tool set's fingerprint, if already known (e.g. from
+            StreamManager.get_tools_fingerprint); computed from tools otherwise
+
+    Returns:
+        The shared ToolPayload; it is rebuilt only when the tool set changes
+    """
+    if fingerprint is None:
+        fingerprint = tools_fingerprint(tools)
+
+    payload = _tool_payloads.get(fingerprint)
+    if payload is None:
+        payload = ToolPayload(fingerprint, tools)
+        _tool_payloads[fingerprint] = payload
+        while len(_tool_payloads) > MAX_CACHED_TOOL_PAYLOADS:
+            _tool_payloads.popitem(last=False)
+    else:
+        _tool_payloads.move_to_end(fingerprint)
+    return payload
+
+
+def clear_tool_payloads() -> None:
+    """Drop every cached tool payload."""
+    _tool_payloads.clear()
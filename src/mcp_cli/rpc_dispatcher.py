@@ -0,0 +1,230 @@
+# mcp_cli/rpc_dispatcher.py
+"""
+JSON-RPC response routing for a single server connection.
+
+The chuk_mcp send_* helpers write a request to a server's write stream and
+then read the shared read stream until they see the matching response,
+dropping anything else they read. Two concurrent requests on the same
+server can therefore consume each other's responses.
+
+RpcDispatcher sits between the helpers and the server streams. A single
+reader task owns the server's read stream and hands each response to the
+request with the same JSON-RPC id, so any number of requests can be in
+flight on one server at a time. The dispatcher exposes a read_stream and
+write_stream pair with the same interface as the original streams, so the
+helpers are used unchanged.
+
+When a caller stops waiting for a response, e.g. because its deadline
+passed, the server is sent notifications/cancelled for the request so it
+can stop working on it.
+
+When the connection is lost, e.g. because the server process exited, every
+waiting request fails with ConnectionError and the optional on_close
+callback is called so the owner can restart the server.
+"""
+import asyncio
+import logging
+import weakref
+from typing import Any, Callable, Dict, Optional
+
+from chuk_mcp.mcp_client.messages.json_rpc_message import JSONRPCMessage
+
+class RpcDispatcher:
+    """Route JSON-RPC responses from one server to the requests awaiting them."""
+
+    def __init__(self, read_stream, write_stream,
+                 on_notification: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None,
+                 on_close: Optional[Callable[[], None]] = None):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            read_stream: The server's read stream; owned by the dispatcher from now on
+            write_stream: The server's write stream
+            on_notification: Optional callback taking (method, params) for server notifications
+            on_close: Optional callback for when the connection is lost; not called by close()
+        """
+        self._read_stream = read_stream
+        self._write_stream = write_stream
+        self.on_notification = on_notification
+        self.on_close = on_close
+        self._pending: Dict[Any, asyncio.Future] = {}  # Request id -> future for its response
+        self._task_requests = weakref.WeakKeyDictionary()  # Task -> id of the request it sent last
+        self._reader_task: Optional[asyncio.Task] = None
+        self._notification_tasks = set()  # Notifications being sent in the background
+        self._closed: Optional[Exception] = None
+
+        # Drop-in replacements for the server streams
+        self.read_stream = _DispatchedReadStream(self, read_stream)
+        self.write_stream = _DispatchedWriteStream(self, write_stream)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests waiting for a response."""
+        return len(self._pending)
+
+    async def send(self, message) -> None:
+        """
+        Send a message to the server, registering it if it expects a response.
+
+        The request is associated with the current task so that the task's
+        next receive() returns its response.
+        """
+        if self._closed is not None:
+            raise ConnectionError(str(self._closed))
+
+        request_id = getattr(message, "id", None)
+        if request_id is not None and getattr(message, "method", None):
+            future = self._pending.get(request_id)
+            if future is None or future.done():
+                self._pending[request_id] = asyncio.get_running_loop().create_future()
+            task = asyncio.current_task()
+            if task is not None:
+                self._task_requests[task] = request_id
+
+        try:
+            await self._write_stream.send(message)
+        except Exception as e:
+            logging.debug(f"Server write stream failed: {e!r}")
+            self._connection_lost()
+            raise ConnectionError("Server connection closed") from e
+
+    async def receive(self):
+        """Wait for the response to the request most recently sent by the current task."""
+        task = asyncio.current_task()
+        request_id = self._task_requests.pop(task, None) if task is not None else None
+        if request_id is None or request_id not in self._pending:
+            raise RuntimeError("No request in flight for this task")
+
+        future = self._pending[request_id]
+        self._start_reader()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # The caller gave up (e.g. a deadline passed), so tell the server
+            # to stop working on the request
+            # Awaiting the future directly cancels it along with the caller
+            if future.cancelled() or not future.done():
+                self._notify_cancelled(request_id)
+            raise
+        finally:
+            # Forget the request even if the caller gave up waiting
+            if self._pending.get(request_id) is future:
+                del self._pending[request_id]
+
+    def _notify_cancelled(self, request_id: Any) -> None:
+        """Send notifications/cancelled for a request in the background."""
+        if self._closed is not None:
+            return
+        message = JSONRPCMessage(
+            method="notifications/cancelled",
+            params={"requestId": request_id, "reason": "Request cancelled by the client"}
+        )
+        task = asyncio.create_task(self._send_notification(message))
+        self._notification_tasks.add(task)
+        task.add_done_callback(self._notification_tasks.discard)
+
+    async def _send_notification(self, message) -> None:
+        """Send a notification, ignoring a connection that has gone away."""
+        try:
+            await self._write_stream.send(message)
+        except Exception as e:
+            logging.debug(f"Could not send {message.method}: {e}")
+
+    def _start_reader(self) -> None:
+        """Start the reader task on first use."""
+        if self._reader_task is None and self._closed is None:
+            self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        """Read messages from the server and route them until the stream ends."""
+        try:
+            while True:
+                message = await self._read_stream.receive()
+                self._route(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.debug(f"Server read stream ended: {e!r}")
+        self._connection_lost()
+
+    def _connection_lost(self) -> None:
+        """Fail waiting requests and tell the owner, unless the dispatcher was closed."""
+        if self._closed is not None:
+            return
+        self._fail_pending(ConnectionError("Server connection closed"))
+        if self.on_close is not None:
+            try:
+                self.on_close()
+            except Exception as e:
+                logging.debug(f"Error handling lost connection: {e}")
+
+    def _route(self, message) -> None:
+        """Deliver a message read from the server."""
+        if isinstance(message, Exception):
+            logging.debug(f"Ignoring error read from server stream: {message}")
+            return
+
+        request_id = getattr(message, "id", None)
+        method = getattr(message, "method", None)
+
+        if method:
+            if request_id is None:
+                if self.on_notification is not None:
+                    try:
+                        self.on_notification(method, getattr(message, "params", None))
+                    except Exception as e:
+                        logging.debug(f"Error handling notification {method}: {e}")
+            else:
+                logging.debug(f"Ignoring request from server: {method}")
+            return
+
+        future = self._pending.get(request_id)
+        if future is None or future.done():
+            logging.debug(f"Ignoring response with no waiting request: {request_id}")
+            return
+        future.set_result(message)
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every waiting request and refuse new ones."""
+        self._closed = error
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self) -> None:
+        """Stop the reader task and fail any requests still waiting."""
+        self._fail_pending(ConnectionError("Server connection closed"))
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._reader_task = None
+
+class _DispatchedReadStream:
+    """Read side of a dispatched server connection."""
+
+    def __init__(self, dispatcher: RpcDispatcher, stream):
+        self.dispatcher = dispatcher
+        self._stream = stream
+
+    async def receive(self):
+        return await self.dispatcher.receive()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+class _DispatchedWriteStream:
+    """Write side of a dispatched server connection."""
+
+    def __init__(self, dispatcher: RpcDispatcher, stream):
+        self.dispatcher = dispatcher
+        self._stream = stream
+
+    async def send(self, message):
+        await self.dispatcher.send(message)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
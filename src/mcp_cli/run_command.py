@@ -4,13 +4,43 @@ Utilities for running commands with proper setup and cleanup.
 """
 import asyncio
 import logging
+import os
 import time
 from typing import Callable, List, Dict, Any, Optional
 
 # Import our StreamManager
 from mcp_cli.stream_manager import StreamManager
+from mcp_cli.daemon import AttachedStreamManager, daemon_attach_enabled
+from mcp_cli.llm.llm_client import close_llm_clients
 
-async def run_command_async(command_func, config_file, servers, user_specified, extra_params=None):
+# Server bring-up limits used by CLI commands (seconds)
+SERVER_INIT_TIMEOUT = 60.0
+GLOBAL_INIT_TIMEOUT = 120.0
+
+def _startup_settings():
+    """
+    Read tool catalog and lazy server activation settings from the environment.
+    
+    MCP_CLI_TOOL_CACHE=0 disables the tool catalog, MCP_CLI_LAZY=1 defers
+    starting servers whose tools are already in the catalog, and
+    MCP_CLI_IDLE_TIMEOUT stops them again after that many idle seconds.
+    
+    Returns:
+        Tuple of (use_catalog, lazy, idle_timeout)
+    """
+    use_catalog = os.getenv("MCP_CLI_TOOL_CACHE", "1").lower() not in ("0", "false", "no")
+    lazy = os.getenv("MCP_CLI_LAZY", "").lower() in ("1", "true", "yes")
+    idle_timeout = None
+    raw_timeout = os.getenv("MCP_CLI_IDLE_TIMEOUT")
+    if raw_timeout:
+        try:
+            idle_timeout = float(raw_timeout) or None
+        except ValueError:
+            logging.warning(f"Ignoring invalid MCP_CLI_IDLE_TIMEOUT: {raw_timeout}")
+    return use_catalog, lazy, idle_timeout
+
+async def run_command_async(command_func, config_file, servers, user_specified, extra_params=None,
+                            attach_daemon=False):
     """
     Run a command with proper setup and cleanup.
     
@@ -20,6 +50,8 @@ async def run_command_async(command_func, config_file, servers, user_specified,
         servers: List of server names to connect to.
         user_specified: List of servers specified by the user.
         extra_params: Optional dictionary of additional parameters to pass to the command function.
+        attach_daemon: Use the servers of a running daemon for the same configuration
+            and servers instead of starting them, if there is one.
         
     Returns:
         The result of the command function.
@@ -31,14 +63,29 @@ async def run_command_async(command_func, config_file, servers, user_specified,
         logging.warning("No servers specified!")
         return False
         
-    logging.info(f"Initializing servers: {servers}")
+    # Servers kept warm by a daemon skip startup altogether
+    stream_manager = None
+    if attach_daemon and daemon_attach_enabled():
+        stream_manager = await AttachedStreamManager.attach(config_file, servers)
     
-    # Create a stream manager to handle server connections
-    stream_manager = await StreamManager.create(
-        config_file=config_file,
-        servers=servers,
-        server_names={i: name for i, name in enumerate(servers)} if servers else None
-    )
+    if stream_manager is None:
+        logging.info(f"Initializing servers: {servers}")
+        
+        use_catalog, lazy, idle_timeout = _startup_settings()
+        
+        # Create a stream manager to handle server connections, bringing
+        # all servers up in parallel so startup costs only the slowest one
+        stream_manager = await StreamManager.create(
+            config_file=config_file,
+            servers=servers,
+            server_names={i: name for i, name in enumerate(servers)} if servers else None,
+            concurrent=True,
+            server_timeout=SERVER_INIT_TIMEOUT,
+            global_timeout=GLOBAL_INIT_TIMEOUT,
+            lazy=lazy,
+            idle_timeout=idle_timeout,
+            use_catalog=use_catalog
+        )
     
     try:
         # Initialize extra_params if None
@@ -53,8 +100,11 @@ async def run_command_async(command_func, config_file, servers, user_specified,
     finally:
         # Ensure streams are properly closed
         await stream_manager.close()
+        # Pooled LLM connections are bound to this event loop
+        await close_llm_clients()
 
-def run_command(command_func, config_file, servers, user_specified, extra_params=None):
+def run_command(command_func, config_file, servers, user_specified, extra_params=None,
+                attach_daemon=False):
     """
     Synchronous wrapper for run_command_async.
     
@@ -64,6 +114,7 @@ def run_command(command_func, config_file, servers, user_specified, extra_params
         servers: List of server names to connect to.
         user_specified: List of servers specified by the user.
         extra_params: Optional dictionary of additional parameters to pass to the command function.
+        attach_daemon: Use the servers of a running daemon if there is one.
         
     Returns:
         The result of the command function.
@@ -77,7 +128,8 @@ def run_command(command_func, config_file, servers, user_specified, extra_params
         
         # Run the command
         return loop.run_until_complete(
-            run_command_async(command_func, config_file, servers, user_specified, extra_params)
+            run_command_async(command_func, config_file, servers, user_specified, extra_params,
+                              attach_daemon=attach_daemon)
         )
     except KeyboardInterrupt:
         logging.debug("KeyboardInterrupt received")
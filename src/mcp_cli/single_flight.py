@@ -0,0 +1,165 @@
+# mcp_cli/single_flight.py
+"""
+Single-flight deduplication of identical in-flight tool calls.
+
+When several callers (parallel tool calls in one turn, or several chat
+sessions sharing a StreamManager) call the same tool on the same server with
+the same arguments at the same moment, only the first call is sent. The
+others wait for it and receive a copy of its result. Once a call completes,
+the next identical call is sent again; caching completed results is the job
+of the tool result cache.
+
+Merging two calls drops one call's side effects, so only tools known to be
+safe to repeat are deduplicated: the tools marked cacheable in the server's
+"cache" entry, and the tools listed in its "singleFlight" entry:
+
+    "sqlite": {
+      "command": "uvx",
+      "singleFlight": {"tools": ["list_tables", "read_*"], "exclude": ["read_log"]}
+    }
+
+"tools" and "exclude" are tool names or glob patterns; excluded tools are
+never deduplicated, even if cacheable. "singleFlight": false turns it off for
+the whole server.
+"""
+import asyncio
+import copy
+import fnmatch
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from mcp_cli.tool_cache import canonical_arguments
+
+FlightKey = Tuple[str, str, str]
+
+def _patterns(setting: Any) -> List[str]:
+    """Normalize a tool name or list of tool names and patterns."""
+    return [setting] if isinstance(setting, str) else list(setting)
+
+class _Flight:
+    """One call in flight and the number of callers waiting for it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Share the result of a call among identical concurrent calls."""
+
+    def __init__(self, tools: Optional[Dict[str, List[str]]] = None,
+                 exclude: Optional[Dict[str, Optional[List[str]]]] = None):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            tools: Server display names mapped to tool names or glob patterns
+                that are deduplicated besides the cacheable tools
+            exclude: Server display names mapped to tool names or glob
+                patterns that are not deduplicated; None excludes every tool
+        """
+        self.tools = tools or {}
+        self.exclude = exclude or {}
+        self._flights: Dict[FlightKey, _Flight] = {}
+        self.calls = 0  # Calls actually sent
+        self.shared = 0  # Calls that joined one in flight
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], server_config_names: Dict[str, str]) -> "SingleFlight":
+        """
+        Build the deduplicator from a parsed server_config.json.
+
+        Args:
+            config: The configuration file contents
+            server_config_names: Server display names mapped to their entry names in the file
+        """
+        servers = config.get("mcpServers") or {}
+        tools = {}
+        exclude = {}
+        for display_name, entry_name in server_config_names.items():
+            setting = (servers.get(entry_name) or {}).get("singleFlight", True)
+            if setting is False:
+                exclude[display_name] = None
+            elif isinstance(setting, dict):
+                if setting.get("tools"):
+                    tools[display_name] = _patterns(setting["tools"])
+                if setting.get("exclude"):
+                    exclude[display_name] = _patterns(setting["exclude"])
+            elif setting is not True:
+                logging.warning(f"Ignoring invalid singleFlight setting for {entry_name}: {setting}")
+        return cls(tools, exclude)
+
+    def key(self, server_name: str, tool_name: str, arguments: Any,
+            cacheable: bool = False) -> Optional[FlightKey]:
+        """
+        Get the deduplication key of a call.
+
+        Args:
+            server_name: The server display name
+            tool_name: The tool's name on the server
+            arguments: The call's arguments
+            cacheable: Whether the tool is marked cacheable, and so safe to repeat
+
+        Returns:
+            The key, or None if calls of the tool are not deduplicated
+        """
+        if server_name in self.exclude:
+            patterns = self.exclude[server_name]
+            if patterns is None or any(fnmatch.fnmatchcase(tool_name, pattern) for pattern in patterns):
+                return None
+        if not cacheable and not any(
+            fnmatch.fnmatchcase(tool_name, pattern) for pattern in self.tools.get(server_name, [])
+        ):
+            return None
+        return (server_name, tool_name, canonical_arguments(arguments))
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct calls in flight."""
+        return len(self._flights)
+
+    async def do(self, key: FlightKey, call: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Run a call, or join an identical call already in flight.
+
+        The call runs in its own task, so a caller that is cancelled does
+        not cancel it for the others. It is cancelled only once every
+        caller waiting for it has been cancelled.
+
+        Args:
+            key: The call's deduplication key
+            call: Starts the call
+
+        Returns:
+            The call's result; callers that joined get a copy
+        """
+        flight = self._flights.get(key)
+        joined = flight is not None
+        if joined:
+            self.shared += 1
+            logging.debug(f"Joining in-flight call of '{key[1]}' on server '{key[0]}'")
+        else:
+            self.calls += 1
+            flight = _Flight(asyncio.create_task(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()
+                self._forget(key, flight)
+            raise
+        flight.waiters -= 1
+        return copy.deepcopy(result) if joined else result
+
+    def _forget(self, key: FlightKey, flight: _Flight) -> None:
+        """Remove a completed call so the next identical call is sent again."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Get the deduplication counters."""
+        return {"calls": self.calls, "shared": self.shared, "in_flight": self.in_flight}
@@ -8,21 +8,62 @@ This module provides a centralized way to:
 3. Ensure proper cleanup of streams and resources
 4. Handle connection errors gracefully
 5. Handle duplicate tool names across servers automatically
+6. Restart servers whose connection is lost
+7. Track server health with a background heartbeat
 """
 import asyncio
 import logging
-import gc
 import json
+import time
 from contextlib import asynccontextmanager
 from typing import Dict, List, Tuple, Any, Optional, Set
 
 # mcp imports
-from chuk_mcp.mcp_client.transport.stdio.stdio_client import stdio_client
+from chuk_mcp.mcp_client.transport.stdio.stdio_client import StdioClient
 from chuk_mcp.mcp_client.messages.initialize.send_messages import send_initialize
 from chuk_mcp.mcp_client.messages.tools.send_messages import send_tools_list, send_tools_call
+from chuk_mcp.mcp_client.messages.ping.send_messages import send_ping
 
 # Use our own config loader
-from mcp_cli.config import load_config
+from mcp_cli.config import load_config, read_config_file, server_config_hash
+from mcp_cli.tool_catalog import ToolCatalog
+from mcp_cli.rpc_dispatcher import RpcDispatcher
+from mcp_cli.llm.tools_handler import tools_fingerprint
+from mcp_cli.tool_results import ResultStore, READ_RESULT_TOOL_NAME
+from mcp_cli.tool_cache import ToolResultCache
+from mcp_cli.single_flight import SingleFlight
+from mcp_cli.admission import AdmissionControl, ServerBusyError
+from mcp_cli.deadlines import ToolDeadlines, get_default_tool_timeout
+from mcp_cli.supervisor import RestartPolicy, load_restart_policies
+from mcp_cli.health import HealthMonitor, DOWN
+
+# The client class is used directly, rather than the stdio_client context
+# manager, so the handle of the process it spawns stays reachable
+stdio_client = StdioClient
+
+# Seconds server processes get to exit after SIGTERM on shutdown before being killed
+SHUTDOWN_TIMEOUT = 2.0
+
+# Seconds to wait for killed server processes to be reaped
+KILL_TIMEOUT = 0.5
+
+# Seconds close() waits for servers started from the catalog to confirm their
+# tool lists, so short commands still refresh a stale catalog
+CATALOG_REVALIDATE_TIMEOUT = 10.0
+
+# Server processes spawned by any StreamManager, so exit handlers can reap
+# them without scanning the heap
+_live_processes = set()
+
+def kill_server_processes() -> None:
+    """Kill every server process that is still running. Meant for exit handlers."""
+    for process in list(_live_processes):
+        try:
+            if process.returncode is None:
+                process.kill()
+        except Exception as e:
+            logging.debug(f"Error killing server process: {e}")
+    _live_processes.clear()
 
 class StreamManager:
     """
@@ -32,10 +73,15 @@ class StreamManager:
     connections, ensuring proper resource management across the application.
     """
     
-    def __init__(self):
-        """Initialize the StreamManager."""
-        self.streams = []
-        self.client_contexts = []
+    def __init__(self, catalog: Optional[ToolCatalog] = None):
+        """
+        Initialize the StreamManager.
+        
+        Args:
+            catalog: Optional tool catalog (default: ~/.cache/mcp-cli)
+        """
+        self.streams = []  # (read_stream, write_stream) per server, None while not started
+        self.client_contexts = []  # Client context per server, None while not started
         self.server_info = []
         self.tools = []  # Display tools (with original names)
         self.internal_tools = []  # Internal tools (with namespaced names)
@@ -45,11 +91,50 @@ class StreamManager:
         self.original_to_default = {}    # Maps original tool names to default namespaced name
         self.server_names = {}
         self.server_streams_map = {}  # Maps server names to stream indices
-        self.active_subprocesses = set()
+        self.active_subprocesses = set()  # Processes of running servers
+        self._server_processes = {}  # Maps server display names to their process
+        
+        # Catalog and lazy mode state
+        self.catalog = catalog
+        self.catalog_keys = {}  # Maps server display names to config hashes
+        self.config_file = None
+        self.server_timeout = None
+        self.lazy = False
+        self.idle_timeout = None
+        self.server_config_names = {}  # Maps server display names to config entry names
+        self._server_tools = {}  # Maps server display names to their raw tool lists
+        self._stale_tools = set()  # Servers whose tool list changed and must be refetched
+        self._refresh_tasks = {}  # Background tool list refetches in progress
+        self._start_tasks = {}  # Background server starts in progress
+        self._revalidating = set()  # Servers started to confirm their cataloged tools
+        self._last_used = {}  # Per-server monotonic time of last use
+        self._in_flight = {}  # Per-server count of running tool calls
+        self._idle_task = None
+        self._heartbeat_task = None
+        self._closing = False  # Set by close() so lost connections are not restarted
+        self._restarting = set()  # Servers being restarted after losing their connection
+        self._restart_counts = {}  # Per-server number of successful restarts
+        self._context_owners = {}  # Client context -> task that entered it
+        self._retired_contexts = []  # Contexts of lost connections left for close() to exit
+        self._tools_fingerprint = None  # Fingerprint of internal_tools, computed on demand
+        self.result_store = ResultStore()  # Spill store for tool results over the size cap
+        self.tool_cache = ToolResultCache()  # Results of cacheable tools; disabled until configured
+        self.single_flight = SingleFlight()  # Identical tool calls in flight
+        self.admission = AdmissionControl()  # Per-server concurrency limits and wait queues
+        self.deadlines = ToolDeadlines(get_default_tool_timeout())  # Per-server and per-tool call deadlines
+        self.restart_policies = {}  # Per-server restart policy; servers without one use the defaults
+        self.health = HealthMonitor()  # Live server health from the heartbeat
 
     @classmethod
     async def create(cls, config_file: str, servers: List[str], 
-                    server_names: Optional[Dict[int, str]] = None) -> 'StreamManager':
+                    server_names: Optional[Dict[int, str]] = None,
+                    concurrent: bool = False,
+                    server_timeout: Optional[float] = None,
+                    global_timeout: Optional[float] = None,
+                    lazy: bool = False,
+                    idle_timeout: Optional[float] = None,
+                    use_catalog: bool = False,
+                    catalog: Optional[ToolCatalog] = None) -> 'StreamManager':
         """
         Create and initialize a StreamManager instance.
         
@@ -59,140 +144,736 @@ class StreamManager:
             config_file: Path to the configuration file
             servers: List of server names to connect to
             server_names: Optional dictionary mapping server indices to friendly names
+            concurrent: Bring all servers up in parallel instead of one at a time
+            server_timeout: Optional per-server initialization timeout in seconds
+            global_timeout: Optional timeout in seconds for the whole concurrent bring-up
+            lazy: Defer spawning servers whose tools are in the catalog until first use
+            idle_timeout: Optional idle period in seconds after which lazy servers are stopped
+            use_catalog: Register cached tools immediately and revalidate in the background
+            catalog: Optional tool catalog (default: ~/.cache/mcp-cli)
             
         Returns:
             An initialized StreamManager instance
         """
-        manager = cls()
-        await manager.initialize_servers(config_file, servers, server_names)
+        manager = cls(catalog=catalog)
+        await manager.initialize_servers(
+            config_file, servers, server_names,
+            concurrent=concurrent,
+            server_timeout=server_timeout,
+            global_timeout=global_timeout,
+            lazy=lazy,
+            idle_timeout=idle_timeout,
+            use_catalog=use_catalog
+        )
         return manager
         
     async def initialize_servers(self, config_file: str, servers: List[str], 
-                                server_names: Optional[Dict[int, str]] = None) -> bool:
+                                server_names: Optional[Dict[int, str]] = None,
+                                concurrent: bool = False,
+                                server_timeout: Optional[float] = None,
+                                global_timeout: Optional[float] = None,
+                                lazy: bool = False,
+                                idle_timeout: Optional[float] = None,
+                                use_catalog: bool = False) -> bool:
         """
         Initialize connections to the specified servers.
         
+        In concurrent mode every server is spawned and initialized in parallel,
+        but the results are merged in the order the servers were given, so
+        tools, internal_tools, server_info and server_streams_map come out the
+        same as with sequential initialization.
+        
+        With use_catalog, servers whose tools are already in the catalog are
+        registered from it without a round trip and started in the
+        background; when a server's live tool list differs from the cached
+        one, the catalog and the tool maps are updated.
+        
+        In lazy mode (which implies use_catalog), cached servers are not
+        started until call_tool first routes to them and, if idle_timeout is
+        set, are stopped again once they have been idle for that long.
+        
         Args:
             config_file: Path to the configuration file
             servers: List of server names to connect to
             server_names: Optional dictionary mapping server indices to friendly names
+            concurrent: Bring all servers up in parallel instead of one at a time
+            server_timeout: Optional per-server initialization timeout in seconds
+            global_timeout: Optional timeout in seconds for the whole concurrent bring-up
+            lazy: Defer spawning servers whose tools are in the catalog until first use
+            idle_timeout: Optional idle period in seconds after which lazy servers are stopped
+            use_catalog: Register cached tools immediately and revalidate in the background
             
         Returns:
             bool: True if at least one server was successfully initialized
         """
         self.server_names = server_names or {}
+        self.config_file = config_file
+        self.server_timeout = server_timeout
+        self.lazy = lazy
+        self.idle_timeout = idle_timeout
+        use_catalog = use_catalog or lazy
         tool_index = 0
         
+        display_names = [
+            self._get_server_display_name(i, server_name)
+            for i, server_name in enumerate(servers)
+        ]
         for i, server_name in enumerate(servers):
-            try:
-                # Get the display name for this server
-                server_display_name = self._get_server_display_name(i, server_name)
+            self.server_config_names[display_names[i]] = server_name
+        
+        # Caching, deduplication, concurrency limits, deadlines, restarts and
+        # health checks are optional settings in the config file
+        settings = read_config_file(config_file)
+        self.tool_cache = ToolResultCache.from_config(settings, self.server_config_names)
+        self.single_flight = SingleFlight.from_config(settings, self.server_config_names)
+        self.admission = AdmissionControl.from_config(settings, self.server_config_names)
+        self.deadlines = ToolDeadlines.from_config(settings, self.server_config_names)
+        self.restart_policies = load_restart_policies(settings, self.server_config_names)
+        self.health = HealthMonitor.from_config(settings)
+        
+        if use_catalog and self.catalog is None:
+            self.catalog = ToolCatalog()
+        
+        # Servers already in the catalog are registered without a round trip
+        cached = {}
+        if use_catalog:
+            for i, server_name in enumerate(servers):
+                config_hash = await self._get_config_hash(config_file, server_name)
+                if config_hash is None:
+                    continue
+                self.catalog_keys[display_names[i]] = config_hash
+                cached_tools = self.catalog.get(config_hash)
+                if cached_tools is not None:
+                    logging.info(f"Using cataloged tools for server {display_names[i]}")
+                    cached[i] = {"tools": cached_tools}
+        
+        if not concurrent:
+            for i, server_name in enumerate(servers):
+                if i in cached:
+                    outcome = cached[i]
+                else:
+                    outcome = await self._bring_up_server(
+                        config_file, server_name, display_names[i], server_timeout
+                    )
+                tool_index = self._register_server(i, display_names[i], outcome, tool_index)
+        else:
+            # Start every server at once
+            tasks = {
+                i: asyncio.create_task(
+                    self._bring_up_server(config_file, server_name, display_names[i], server_timeout)
+                )
+                for i, server_name in enumerate(servers)
+                if i not in cached
+            }
+            
+            if tasks:
+                done, pending = await asyncio.wait(tasks.values(), timeout=global_timeout)
                 
+                # Abandon anything that did not finish within the global timeout
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+            
+            # Merge the results in the original server order
+            for i in range(len(servers)):
+                if i in cached:
+                    outcome = cached[i]
+                elif tasks[i].cancelled():
+                    outcome = {"error": f"Error: Timed out after {global_timeout}s"}
+                else:
+                    outcome = tasks[i].result()
+                tool_index = self._register_server(i, display_names[i], outcome, tool_index)
+        
+        # Revalidate cached servers in the background unless they start lazily
+        if not lazy:
+            for i in cached:
+                self._revalidating.add(display_names[i])
+                self._schedule_start(display_names[i])
+        
+        self._start_idle_monitor()
+        self._start_heartbeat()
+        
+        # Return success if at least one server is running or can be started
+        return len(self.server_streams_map) > 0
+    
+    async def _get_config_hash(self, config_file: str, server_name: str) -> Optional[str]:
+        """Get the catalog key for a server, or None if its config cannot be loaded."""
+        try:
+            server_params = await load_config(config_file, server_name)
+        except Exception as e:
+            logging.debug(f"No catalog key for server {server_name}: {e}")
+            return None
+        return server_config_hash(server_params)
+    
+    async def _bring_up_server(self, config_file: str, server_name: str,
+                               server_display_name: str,
+                               timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Spawn and initialize a single server and fetch its tools.
+        
+        This does not touch any shared state, so it is safe to run for several
+        servers at once. A failed server is cleaned up before returning.
+        
+        Returns:
+            A dict with client_ctx, streams and tools on success, or a dict
+            with a status string under "error" on failure.
+        """
+        client_ctx = None
+        entered = False
+        dispatcher = None
+        try:
+            async with asyncio.timeout(timeout):
                 logging.info(f"Initializing server: {server_display_name}")
                 
                 # Load the server configuration
                 server_params = await load_config(config_file, server_name)
                 
-                # Create the stdio client context manager and add it to our tracking list
+                # Create the stdio client context manager
                 client_ctx = stdio_client(server_params)
-                self.client_contexts.append(client_ctx)
                 
                 # Enter the context to get read_stream and write_stream
                 read_stream, write_stream = await client_ctx.__aenter__()
+                entered = True
+                
+                # Route responses by request id so requests can be pipelined,
+                # and watch for server notifications and lost connections
+                dispatcher = RpcDispatcher(
+                    read_stream, write_stream,
+                    on_notification=lambda method, params: self._handle_notification(server_display_name, method, params),
+                    on_close=lambda: self._handle_disconnect(server_display_name, dispatcher)
+                )
+                read_stream, write_stream = dispatcher.read_stream, dispatcher.write_stream
                 
                 # Send the initialize message
                 init_success = await send_initialize(read_stream, write_stream)
                 if not init_success:
                     logging.error(f"Failed to initialize server {server_display_name}")
-                    await client_ctx.__aexit__(None, None, None)
-                    self.client_contexts.remove(client_ctx)
-                    
-                    # Add failed server to server_info
-                    self.server_info.append({
-                        "id": i+1,
-                        "name": server_display_name,
-                        "tools": 0,
-                        "status": "Failed to initialize",
-                        "tool_start_index": tool_index
-                    })
-                    continue
+                    await self._discard_client_context(client_ctx, entered, dispatcher)
+                    return {"error": "Failed to initialize"}
                 
                 # Fetch tools from this server
                 fetched_tools = await send_tools_list(read_stream, write_stream)
-                tools = fetched_tools.get("tools", [])
-                
-                # Process tools to handle duplicates
-                display_tools = []  # For UI display (original names)
-                namespaced_tools = []  # For internal use (namespaced names)
-                
-                for tool in tools:
-                    # Create display tool (original names for UI)
-                    display_tool = tool.copy()
-                    original_name = tool["name"]
-                    
-                    # Create namespaced tool (for internal use)
-                    namespaced_tool = tool.copy()
-                    namespaced_name = f"{server_display_name}_{original_name}"
-                    namespaced_tool["name"] = namespaced_name
-                    
-                    # Store mappings
-                    self.tool_to_server_map[original_name] = server_display_name
-                    self.namespaced_tool_map[namespaced_name] = original_name
-                    
-                    # Handle the case where one original name maps to multiple namespaced names
-                    if original_name in self.original_to_namespaced:
-                        # Append this namespaced name to the list
-                        self.original_to_namespaced[original_name].append(namespaced_name)
-                    else:
-                        # First server with this tool, create new list
-                        self.original_to_namespaced[original_name] = [namespaced_name]
-                        # Also set this as the default namespaced name for this tool
-                        self.original_to_default[original_name] = namespaced_name
-                    
-                    display_tools.append(display_tool)
-                    namespaced_tools.append(namespaced_tool)
-                
-                # Store the stream index in the map
-                self.server_streams_map[server_display_name] = len(self.streams)
-                
-                # Store the streams and update server info
-                self.streams.append((read_stream, write_stream))
-                self.tools.extend(display_tools)
-                self.internal_tools.extend(namespaced_tools)
-                
-                # Track the connection info
-                self.server_info.append({
-                    "id": i+1,
-                    "name": server_display_name,
-                    "tools": len(tools),
-                    "status": "Connected",
-                    "tool_start_index": tool_index
-                })
-                
-                tool_index += len(tools)
-                logging.info(f"Successfully initialized server: {server_display_name}")
+            
+            logging.info(f"Successfully initialized server: {server_display_name}")
+            return {
+                "client_ctx": client_ctx,
+                "owner": asyncio.current_task(),
+                "process": getattr(client_ctx, "process", None),
+                "streams": (read_stream, write_stream),
+                "tools": fetched_tools.get("tools", [])
+            }
+        except asyncio.CancelledError:
+            await self._discard_client_context(client_ctx, entered, dispatcher)
+            raise
+        except TimeoutError:
+            logging.error(f"Timed out initializing server {server_display_name} after {timeout}s")
+            await self._discard_client_context(client_ctx, entered, dispatcher)
+            return {"error": f"Error: Timed out after {timeout}s"}
+        except Exception as e:
+            # Log the error
+            logging.error(f"Error initializing server {server_display_name}: {e}")
+            await self._discard_client_context(client_ctx, entered, dispatcher)
+            return {"error": f"Error: {str(e)}"}
+    
+    async def _discard_client_context(self, client_ctx, entered: bool,
+                                      dispatcher: Optional[RpcDispatcher] = None) -> None:
+        """Exit a client context that will not be kept, ignoring errors."""
+        if dispatcher is not None:
+            await dispatcher.close()
+        if client_ctx is None or not entered:
+            return
+        try:
+            await client_ctx.__aexit__(None, None, None)
+        except BaseException as e:
+            logging.debug(f"Error closing client context: {e}")
+    
+    def _register_server(self, index: int, server_display_name: str,
+                         outcome: Dict[str, Any], tool_index: int) -> int:
+        """
+        Record the outcome of a server bring-up in the manager state.
+        
+        Returns:
+            The tool index at which the next server's tools start.
+        """
+        if "error" in outcome:
+            # Add failed server to server_info
+            self.server_info.append({
+                "id": index+1,
+                "name": server_display_name,
+                "tools": 0,
+                "status": outcome["error"],
+                "tool_start_index": tool_index
+            })
+            return tool_index
+        
+        tools = outcome["tools"]
+        self._server_tools[server_display_name] = tools
+        self._add_server_tools(server_display_name, tools)
+        
+        # Track the client context so it is closed on shutdown
+        # (servers served from the catalog have neither a context nor streams yet)
+        self.client_contexts.append(outcome.get("client_ctx"))
+        if outcome.get("client_ctx") is not None:
+            self._context_owners[outcome["client_ctx"]] = outcome.get("owner")
+        
+        # Store the stream index in the map
+        self.server_streams_map[server_display_name] = len(self.streams)
+        
+        # Store the streams
+        self.streams.append(outcome.get("streams"))
+        
+        # Track the connection info
+        self.server_info.append({
+            "id": index+1,
+            "name": server_display_name,
+            "tools": len(tools),
+            "status": "Connected" if outcome.get("streams") else "Idle",
+            "tool_start_index": tool_index
+        })
+        
+        if outcome.get("streams"):
+            self._track_process(server_display_name, outcome.get("process"))
+            self._last_used[server_display_name] = time.monotonic()
+            self._update_catalog(server_display_name, tools)
+        
+        return tool_index + len(tools)
+    
+    def _add_server_tools(self, server_display_name: str, tools: List[Dict[str, Any]]) -> None:
+        """Add one server's tools to the display/internal tool lists and name maps."""
+        # Process tools to handle duplicates
+        display_tools = []  # For UI display (original names)
+        namespaced_tools = []  # For internal use (namespaced names)
+        
+        for tool in tools:
+            # Create display tool (original names for UI)
+            display_tool = tool.copy()
+            original_name = tool["name"]
+            
+            # Create namespaced tool (for internal use)
+            namespaced_tool = tool.copy()
+            namespaced_name = f"{server_display_name}_{original_name}"
+            namespaced_tool["name"] = namespaced_name
+            
+            # Store mappings
+            self.tool_to_server_map[original_name] = server_display_name
+            self.namespaced_tool_map[namespaced_name] = original_name
+            
+            # Handle the case where one original name maps to multiple namespaced names
+            if original_name in self.original_to_namespaced:
+                # Append this namespaced name to the list
+                self.original_to_namespaced[original_name].append(namespaced_name)
+            else:
+                # First server with this tool, create new list
+                self.original_to_namespaced[original_name] = [namespaced_name]
+                # Also set this as the default namespaced name for this tool
+                self.original_to_default[original_name] = namespaced_name
+            
+            display_tools.append(display_tool)
+            namespaced_tools.append(namespaced_tool)
+        
+        self.tools.extend(display_tools)
+        self.internal_tools.extend(namespaced_tools)
+        self._tools_fingerprint = None
+    
+    def _rebuild_tool_maps(self) -> None:
+        """
+        Rebuild the tool lists and name maps from each server's tool list.
+        
+        Containers are updated in place so references handed out earlier
+        (e.g. by get_all_tools) see the new tools.
+        """
+        self.tools.clear()
+        self.internal_tools.clear()
+        self._tools_fingerprint = None
+        self.tool_to_server_map.clear()
+        self.namespaced_tool_map.clear()
+        self.original_to_namespaced.clear()
+        self.original_to_default.clear()
+        
+        tool_index = 0
+        for server in self.server_info:
+            tools = self._server_tools.get(server["name"])
+            server["tool_start_index"] = tool_index
+            if tools is None:
+                continue
+            server["tools"] = len(tools)
+            self._add_server_tools(server["name"], tools)
+            tool_index += len(tools)
+    
+    def _update_catalog(self, server_name: str, tools: List[Dict[str, Any]]) -> None:
+        """Store a server's live tool list in the catalog if it changed."""
+        config_hash = self.catalog_keys.get(server_name)
+        if self.catalog is None or config_hash is None:
+            return
+        if self.catalog.get(config_hash) != tools:
+            self.catalog.put(config_hash, tools, server_name)
+    
+    def _remove_from_catalog(self, server_name: str) -> None:
+        """Drop a server's cataloged tools so the next run fetches them live."""
+        config_hash = self.catalog_keys.get(server_name)
+        if self.catalog is not None and config_hash is not None:
+            self.catalog.remove(config_hash)
+    
+    def _apply_tool_list(self, server_name: str, tools: List[Dict[str, Any]]) -> None:
+        """Swap in a server's fresh tool list, rebuilding the maps if it changed."""
+        if tools != self._server_tools.get(server_name):
+            logging.info(f"Tool list for server {server_name} changed; updating tool maps")
+            self._server_tools[server_name] = tools
+            self._rebuild_tool_maps()
+        self._update_catalog(server_name, tools)
+    
+    def _handle_notification(self, server_name: str, method: str, params: Optional[Dict[str, Any]]) -> None:
+        """React to a notification sent by a server."""
+        if method == "notifications/tools/list_changed":
+            logging.info(f"Server {server_name} reported a tool list change")
+            # The cached tools are no longer trustworthy
+            self._remove_from_catalog(server_name)
+            # So are cached results of its tools
+            self.tool_cache.invalidate(server_name)
+            # Refetch once the stream is free
+            self._stale_tools.add(server_name)
+    
+    def _schedule_refresh(self, server_name: str) -> None:
+        """Refetch a server's tool list in a background task, unless one is already running."""
+        if self._closing or server_name in self._refresh_tasks:
+            return
+        task = asyncio.create_task(self._refresh_server_tools(server_name))
+        self._refresh_tasks[server_name] = task
+        task.add_done_callback(lambda t: self._refresh_tasks.pop(server_name, None))
+    
+    async def _refresh_server_tools(self, server_name: str) -> None:
+        """Fetch a running server's tool list again and apply it."""
+        self._stale_tools.discard(server_name)
+        server_index = self.server_streams_map.get(server_name)
+        if server_index is None or self.streams[server_index] is None:
+            return
+        read_stream, write_stream = self.streams[server_index]
+        try:
+            fetched_tools = await send_tools_list(read_stream, write_stream)
+        except Exception as e:
+            logging.warning(f"Could not refresh tools for server {server_name}: {e}")
+            return
+        self._apply_tool_list(server_name, fetched_tools.get("tools", []))
+    
+    async def ensure_server(self, server_name: str) -> bool:
+        """
+        Make sure a server is running, starting it if it was deferred or stopped.
+        
+        Concurrent callers share a single start attempt.
+        
+        Args:
+            server_name: The server display name
+            
+        Returns:
+            bool: True if the server's streams are available
+        """
+        server_index = self.server_streams_map.get(server_name)
+        if server_index is None:
+            return False
+        if self.streams[server_index] is not None:
+            return True
+        
+        task = self._start_tasks.get(server_name) or self._schedule_start(server_name)
+        return await asyncio.shield(task)
+    
+    def _schedule_start(self, server_name: str) -> asyncio.Task:
+        """Start a registered server in a background task."""
+        server_entry = self._get_server_info_entry(server_name)
+        if server_entry is not None:
+            server_entry["status"] = "Starting"
+        
+        # A dedicated task keeps the stdio client's task group from being
+        # tied to whichever caller happened to trigger the start
+        task = asyncio.create_task(self._start_server(server_name))
+        self._start_tasks[server_name] = task
+        return task
+    
+    async def _start_server(self, server_name: str) -> bool:
+        """Bring up a registered server and swap in its streams."""
+        try:
+            logging.info(f"Starting server: {server_name}")
+            outcome = await self._bring_up_server(
+                self.config_file,
+                self.server_config_names.get(server_name, server_name),
+                server_name,
+                self.server_timeout
+            )
+            
+            if "error" in outcome:
+                server_entry = self._get_server_info_entry(server_name)
+                if server_entry is not None:
+                    server_entry["status"] = outcome["error"]
+                # Cataloged tools that could not be confirmed are not reused
+                if server_name in self._revalidating:
+                    self._remove_from_catalog(server_name)
+                return False
+            
+            self._swap_in_server(server_name, outcome)
+            return True
+        finally:
+            self._start_tasks.pop(server_name, None)
+            self._revalidating.discard(server_name)
+    
+    def _swap_in_server(self, server_name: str, outcome: Dict[str, Any]) -> None:
+        """
+        Make a freshly brought up server the one calls are routed to.
+        
+        Nothing here awaits, so no call can see the streams of one process
+        paired with the client context of another.
+        """
+        server_index = self.server_streams_map[server_name]
+        self.client_contexts[server_index] = outcome["client_ctx"]
+        self._context_owners[outcome["client_ctx"]] = outcome.get("owner")
+        self.streams[server_index] = outcome["streams"]
+        self._track_process(server_name, outcome.get("process"))
+        self._last_used[server_name] = time.monotonic()
+        self.health.reset(server_name)
+        server_entry = self._get_server_info_entry(server_name)
+        if server_entry is not None:
+            server_entry["status"] = "Connected"
+        
+        # Revalidate the cataloged tools against the live list
+        self._apply_tool_list(server_name, outcome["tools"])
+    
+    def _restart_policy(self, server_name: str) -> RestartPolicy:
+        """Get a server's restart policy."""
+        return self.restart_policies.get(server_name) or RestartPolicy()
+    
+    def _handle_disconnect(self, server_name: str, dispatcher: RpcDispatcher) -> None:
+        """
+        React to a server's connection being lost.
+        
+        The server is detached at once, so new calls wait for the restart
+        instead of being written to a dead pipe, and a supervisor task is
+        registered as the server's start task for them to wait on.
+        """
+        if self._closing:
+            return
+        server_index = self.server_streams_map.get(server_name)
+        if server_index is None or self._get_dispatcher(self.streams[server_index]) is not dispatcher:
+            # A connection that was being discarded anyway
+            return
+        
+        logging.warning(f"Lost connection to server {server_name}")
+        client_ctx = self.client_contexts[server_index]
+        self.client_contexts[server_index] = None
+        self.streams[server_index] = None
+        self.health.reset(server_name)
+        
+        server_entry = self._get_server_info_entry(server_name)
+        if server_entry is not None:
+            server_entry["status"] = "Restarting"
+        
+        self._restarting.add(server_name)
+        task = asyncio.create_task(self._restart_server(server_name, client_ctx, dispatcher))
+        self._start_tasks[server_name] = task
+    
+    async def _restart_server(self, server_name: str, client_ctx, dispatcher: RpcDispatcher) -> bool:
+        """
+        Reap a server whose connection was lost and bring it up again.
+        
+        Attempts are retried with exponential backoff as set by the server's
+        restart policy.
+        
+        Returns:
+            bool: True if the server is running again
+        """
+        try:
+            # The old process stays tracked until it is gone, so shutdown can
+            # still reap it if the restart is cancelled
+            process = self._server_processes.get(server_name)
+            if process is not None:
+                await self._terminate_processes([process])
+                self._untrack_process(server_name)
+            
+            # The client's task group can only be exited by the task that
+            # entered it; exiting it from here would cancel that task instead
+            owner = self._context_owners.pop(client_ctx, None)
+            if owner is None or owner.done() or owner is asyncio.current_task():
+                await self._discard_client_context(client_ctx, True, dispatcher)
+            else:
+                await dispatcher.close()
+                self._retired_contexts.append(client_ctx)
+            
+            policy = self._restart_policy(server_name)
+            server_entry = self._get_server_info_entry(server_name)
+            if not policy.enabled:
+                if server_entry is not None:
+                    server_entry["status"] = "Disconnected"
+                return False
+            
+            error = None
+            for attempt in range(1, policy.max_attempts + 1):
+                delay = policy.delay(attempt)
+                if delay:
+                    await asyncio.sleep(delay)
+                logging.info(f"Restarting server {server_name} (attempt {attempt}/{policy.max_attempts})")
+                if server_entry is not None:
+                    server_entry["status"] = f"Restarting ({attempt}/{policy.max_attempts})"
                 
+                outcome = await self._bring_up_server(
+                    self.config_file,
+                    self.server_config_names.get(server_name, server_name),
+                    server_name,
+                    self.server_timeout
+                )
+                if "error" not in outcome:
+                    self._swap_in_server(server_name, outcome)
+                    self._restart_counts[server_name] = self._restart_counts.get(server_name, 0) + 1
+                    logging.info(f"Restarted server {server_name}")
+                    return True
+                error = outcome["error"]
+                logging.warning(f"Restart attempt {attempt} of server {server_name} failed: {error}")
+            
+            logging.error(f"Giving up on server {server_name} after {policy.max_attempts} restart attempts")
+            if server_entry is not None:
+                server_entry["status"] = f"Failed to restart: {error}"
+            return False
+        finally:
+            self._restarting.discard(server_name)
+            self._start_tasks.pop(server_name, None)
+    
+    async def stop_server(self, server_name: str) -> None:
+        """
+        Stop a running server while keeping its tools registered.
+        
+        The server is started again on its next use.
+        
+        Args:
+            server_name: The server display name
+        """
+        server_index = self.server_streams_map.get(server_name)
+        if server_index is None or self.streams[server_index] is None:
+            return
+        if server_name in self._start_tasks:
+            return
+        
+        client_ctx = self.client_contexts[server_index]
+        dispatcher = self._get_dispatcher(self.streams[server_index])
+        self.client_contexts[server_index] = None
+        self.streams[server_index] = None
+        process = self._untrack_process(server_name)
+        self.health.reset(server_name)
+        
+        server_entry = self._get_server_info_entry(server_name)
+        if server_entry is not None:
+            server_entry["status"] = "Idle"
+        
+        if process is not None:
+            await self._terminate_processes([process])
+        await self._discard_client_context(client_ctx, True, dispatcher)
+        logging.info(f"Stopped server: {server_name}")
+    
+    def _get_dispatcher(self, streams) -> Optional[RpcDispatcher]:
+        """Get the dispatcher behind a server's stream pair, if any."""
+        if streams is None:
+            return None
+        return getattr(streams[0], "dispatcher", None)
+    
+    def _get_server_info_entry(self, server_name: str) -> Optional[Dict[str, Any]]:
+        """Get the server_info entry for a server display name."""
+        for server in self.server_info:
+            if server["name"] == server_name:
+                return server
+        return None
+    
+    def _start_idle_monitor(self) -> None:
+        """Start the background task that stops idle servers in lazy mode."""
+        if self.lazy and self.idle_timeout and self._idle_task is None:
+            self._idle_task = asyncio.create_task(self._idle_monitor())
+    
+    async def _idle_monitor(self) -> None:
+        """Periodically stop servers that have been idle for idle_timeout seconds."""
+        interval = min(self.idle_timeout / 2, 30.0)
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for server_name, server_index in list(self.server_streams_map.items()):
+                if self.streams[server_index] is None or self._in_flight.get(server_name):
+                    continue
+                idle_for = now - self._last_used.get(server_name, now)
+                if idle_for >= self.idle_timeout:
+                    logging.info(f"Server {server_name} idle for {idle_for:.0f}s; stopping it")
+                    try:
+                        await self.stop_server(server_name)
+                    except Exception as e:
+                        logging.debug(f"Error stopping idle server {server_name}: {e}")
+    
+    def _start_heartbeat(self) -> None:
+        """Start the background task that checks the health of running servers."""
+        if self.health.enabled and self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+    
+    async def _heartbeat(self) -> None:
+        """Periodically ping every running server."""
+        while True:
+            await asyncio.sleep(self.health.interval)
+            try:
+                await self.check_health()
             except Exception as e:
-                # Use the proper server name in error message
-                server_display_name = self._get_server_display_name(i, server_name)
-                
-                # Log the error
-                logging.error(f"Error initializing server {server_display_name}: {e}")
-                
-                # Add to server info with error status
-                self.server_info.append({
-                    "id": i+1,
-                    "name": server_display_name,
-                    "tools": 0,
-                    "status": f"Error: {str(e)}",
-                    "tool_start_index": tool_index
-                })
+                logging.debug(f"Error checking server health: {e}")
+    
+    async def check_health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Ping every running server at once and record the results.
+        
+        Servers that are not running are left alone rather than started, and
+        servers busy with tool calls are skipped, since a single-threaded
+        server cannot answer a ping until its calls are done.
+        
+        Returns:
+            Server display names mapped to their health report
+        """
+        targets = [
+            server_name
+            for server_name, server_index in self.server_streams_map.items()
+            if self.streams[server_index] is not None and not self._in_flight.get(server_name)
+        ]
+        if targets:
+            await asyncio.gather(*(self.ping_server(server_name) for server_name in targets))
+        return {server_name: self.health.report(server_name) for server_name in self.server_streams_map}
+    
+    async def ping_server(self, server_name: str, timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Ping a running server and record the result in its health.
+        
+        Args:
+            server_name: The server display name
+            timeout: Seconds to wait for the answer (default: the health check timeout)
             
-            # Collect any subprocesses created during initialization
-            self._collect_subprocesses()
+        Returns:
+            The round-trip time in seconds, or None if the server is not
+            running or did not answer
+        """
+        server_index = self.server_streams_map.get(server_name)
+        if server_index is None or self.streams[server_index] is None:
+            return None
+        read_stream, write_stream = self.streams[server_index]
+        
+        started = time.monotonic()
+        try:
+            answered = await send_ping(read_stream, write_stream, timeout=timeout or self.health.timeout, retries=1)
+        except Exception as e:
+            logging.debug(f"Error pinging server {server_name}: {e}")
+            answered = False
+        rtt = time.monotonic() - started
         
-        # Return success if we have at least one stream
-        return len(self.streams) > 0
+        health = self.health.server(server_name)
+        if answered:
+            health.record_success(rtt)
+        else:
+            health.record_failure()
+            if self.health.state(server_name) == DOWN:
+                logging.warning(f"Server {server_name} is not answering pings")
+        self._update_health_entry(server_name)
+        return rtt if answered else None
+    
+    def _update_health_entry(self, server_name: str) -> None:
+        """Copy a server's health into its server_info entry."""
+        server_entry = self._get_server_info_entry(server_name)
+        if server_entry is not None:
+            server_entry["health"] = self.health.report(server_name)
     
     def _get_server_display_name(self, index: int, server_name: str) -> str:
         """Get the display name for a server based on index or custom mapping."""
@@ -204,13 +885,62 @@ class StreamManager:
             # If no mapping, use the server name or a generic name
             return server_name or f"Server {index+1}"
     
-    def _collect_subprocesses(self) -> None:
-        """Collect all active subprocess.Popen instances for tracking."""
-        from subprocess import Popen
-        for obj in gc.get_objects():
-            if isinstance(obj, Popen) and obj.poll() is None:  # Still running
-                if obj not in self.active_subprocesses:
-                    self.active_subprocesses.add(obj)
+    def _track_process(self, server_name: str, process) -> None:
+        """Record the process spawned for a server so shutdown can reap it."""
+        if process is None:
+            return
+        self._server_processes[server_name] = process
+        self.active_subprocesses.add(process)
+        _live_processes.add(process)
+    
+    def _untrack_process(self, server_name: str):
+        """Forget a server's process, returning it if one was tracked."""
+        process = self._server_processes.pop(server_name, None)
+        if process is not None:
+            self.active_subprocesses.discard(process)
+            _live_processes.discard(process)
+        return process
+    
+    async def _terminate_processes(self, processes, timeout: Optional[float] = None) -> None:
+        """
+        Terminate server processes concurrently.
+        
+        Every process is sent SIGTERM at once; any still running after
+        timeout seconds is killed, so the total wait is bounded by
+        timeout + KILL_TIMEOUT regardless of the number of processes.
+        
+        Args:
+            processes: The processes to terminate
+            timeout: Seconds to wait for a graceful exit before killing (default: SHUTDOWN_TIMEOUT)
+        """
+        if timeout is None:
+            timeout = SHUTDOWN_TIMEOUT
+        running = [process for process in processes if process.returncode is None]
+        if not running:
+            return
+        
+        for process in running:
+            try:
+                process.terminate()
+            except ProcessLookupError:
+                pass
+        
+        waiters = [asyncio.create_task(process.wait()) for process in running]
+        _, pending = await asyncio.wait(waiters, timeout=timeout)
+        
+        if pending:
+            for process in running:
+                if process.returncode is None:
+                    logging.debug(f"Server process {process.pid} did not exit after {timeout}s; killing it")
+                    try:
+                        process.kill()
+                    except ProcessLookupError:
+                        pass
+            _, pending = await asyncio.wait(pending, timeout=KILL_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
     
     def _resolve_tool_name(self, tool_name: str) -> Tuple[str, str]:
         """
@@ -240,8 +970,14 @@ class StreamManager:
             namespaced_versions = self.original_to_namespaced[tool_name]
             
             if len(namespaced_versions) > 1:
-                # Use the default (first server we saw with this tool)
+                # Use the default (first server we saw with this tool),
+                # unless it is down and another server with the tool is not
                 default_namespaced = self.original_to_default[tool_name]
+                if self.health.state(default_namespaced.split('_', 1)[0]) == DOWN:
+                    for candidate in namespaced_versions:
+                        if self.health.state(candidate.split('_', 1)[0]) != DOWN:
+                            default_namespaced = candidate
+                            break
                 parts = default_namespaced.split('_', 1)
                 server_name = parts[0] if len(parts) > 1 else "Unknown"
                 logging.debug(f"Tool '{tool_name}' exists on multiple servers. Using default: {default_namespaced}")
@@ -268,6 +1004,15 @@ class StreamManager:
         Returns:
             The tool response
         """
+        # The built-in tool for paging through large results is served locally
+        if tool_name == READ_RESULT_TOOL_NAME:
+            if isinstance(arguments, str):
+                try:
+                    arguments = json.loads(arguments)
+                except json.JSONDecodeError:
+                    pass
+            return self.result_store.call(arguments)
+        
         # Automatically resolve the tool name to its proper namespaced version
         original_tool_name = tool_name  # Keep original for error messages
         
@@ -317,35 +1062,131 @@ class StreamManager:
                 "content": f"Error: Invalid server index: {server_index}"
             }
         
+        # Ensure arguments are properly formatted
+        if isinstance(arguments, str):
+            try:
+                arguments = json.loads(arguments)
+            except json.JSONDecodeError:
+                logging.warning(f"Could not parse arguments as JSON: {arguments}")
+                # Keep as string if it's not valid JSON
+        
+        # When making the actual call, use the original tool name if this is a namespaced tool
+        # as the server expects the original name
+        tool_to_call = original_tool_name
+        if tool_name in self.namespaced_tool_map:
+            tool_to_call = self.namespaced_tool_map[tool_name]
+        
+        # Serve cacheable tools from the result cache, without starting the server
+        cache_key = None
+        if self.tool_cache.enabled:
+            cache_key = self.tool_cache.key(server_name, tool_to_call, arguments)
+            if cache_key is not None:
+                cached = self.tool_cache.get(cache_key)
+                if cached is not None:
+                    logging.debug(f"Serving '{tool_to_call}' on server '{server_name}' from the result cache")
+                    return cached
+        
+        # Fail fast instead of waiting out the deadline on a server that has
+        # stopped answering health checks
+        if self.health.state(server_name) == DOWN and self.streams[server_index] is not None:
+            return {
+                "isError": True,
+                "error": f"Server '{server_name}' is not responding to health checks; try again later",
+                "content": f"Error: Server '{server_name}' is not responding to health checks; try again later"
+            }
+        
+        # Identical calls already in flight share one request
+        flight_key = self.single_flight.key(server_name, tool_to_call, arguments,
+                                            cacheable=cache_key is not None)
+        if flight_key is not None:
+            return await self.single_flight.do(
+                flight_key,
+                lambda: self._send_tool_call(server_name, server_index, tool_to_call, arguments, cache_key)
+            )
+        return await self._send_tool_call(server_name, server_index, tool_to_call, arguments, cache_key)
+    
+    async def _send_tool_call(self, server_name: str, server_index: int, tool_to_call: str,
+                              arguments: Any, cache_key=None) -> Dict[str, Any]:
+        """
+        Send a resolved tool call to its server.
+        
+        Args:
+            server_name: The server display name
+            server_index: The server's index in streams
+            tool_to_call: The tool's name on the server
+            arguments: The parsed arguments
+            cache_key: Result cache key if the tool is cacheable
+            
+        Returns:
+            The tool response
+        """
+        # The deadline covers waiting for a slot as well as the call itself;
+        # when it passes, the request is cancelled on the server too
+        deadline = self.deadlines.deadline(server_name, tool_to_call)
+        try:
+            async with asyncio.timeout(deadline):
+                # Wait for one of the server's slots, or fail fast if too many calls are waiting
+                async with self.admission.limit(server_name).slot():
+                    return await self._dispatch_tool_call(server_name, server_index, tool_to_call, arguments, cache_key)
+        except TimeoutError:
+            logging.warning(f"Call of '{tool_to_call}' on server '{server_name}' timed out after {deadline}s")
+            return {
+                "isError": True,
+                "error": f"Tool '{tool_to_call}' on server '{server_name}' timed out after {deadline:g}s",
+                "content": f"Error: Tool '{tool_to_call}' on server '{server_name}' timed out after {deadline:g}s"
+            }
+        except ServerBusyError as e:
+            logging.warning(f"Rejected call of '{tool_to_call}' on busy server '{server_name}': {e}")
+            return {
+                "isError": True,
+                "error": f"Server '{server_name}' is busy ({e}); try again later",
+                "content": f"Error: Server '{server_name}' is busy ({e}); try again later"
+            }
+    
+    async def _dispatch_tool_call(self, server_name: str, server_index: int, tool_to_call: str,
+                                  arguments: Any, cache_key=None) -> Dict[str, Any]:
+        """Start the server if needed and send it a tool call, holding one of its slots."""
+        # Start the server if it was deferred or stopped while idle; calls
+        # made while it restarts wait for it unless its policy says otherwise
+        if self.streams[server_index] is None:
+            if server_name in self._restarting and not self._restart_policy(server_name).replay:
+                return {
+                    "isError": True,
+                    "error": f"Server '{server_name}' is restarting; try again later",
+                    "content": f"Error: Server '{server_name}' is restarting; try again later"
+                }
+            if not await self.ensure_server(server_name):
+                return {
+                    "isError": True,
+                    "error": f"Server '{server_name}' could not be started",
+                    "content": f"Error: Server '{server_name}' could not be started"
+                }
+        
         # Get the streams
         read_stream, write_stream = self.streams[server_index]
         
+        # Keep the server from being stopped as idle while the call runs
+        self._in_flight[server_name] = self._in_flight.get(server_name, 0) + 1
+        
         # Call the tool
         try:
-            # Ensure arguments are properly formatted
-            if isinstance(arguments, str):
-                try:
-                    arguments = json.loads(arguments)
-                except json.JSONDecodeError:
-                    logging.warning(f"Could not parse arguments as JSON: {arguments}")
-                    # Keep as string if it's not valid JSON
-            
-            # When making the actual call, use the original tool name if this is a namespaced tool
-            # as the server expects the original name
-            tool_to_call = original_tool_name
-            if tool_name in self.namespaced_tool_map:
-                tool_to_call = self.namespaced_tool_map[tool_name]
-            
             logging.debug(f"Calling tool '{tool_to_call}' on server '{server_name}'")
             
             # Call the tool
+            # Deadlines are enforced by _send_tool_call, so the call is sent
+            # once with no timeout of its own
             result = await send_tools_call(
                 read_stream=read_stream,
                 write_stream=write_stream,
                 name=tool_to_call,
-                arguments=arguments
+                arguments=arguments,
+                timeout=None,
+                retries=1
             )
             
+            # Any answer shows the server is alive
+            self.health.server(server_name).record_success()
+            
             # Check for errors
             if result.get("isError"):
                 logging.error(f"Error calling tool {tool_to_call}: {result.get('error')}")
@@ -355,14 +1196,24 @@ class StreamManager:
                     "content": f"Error: {result.get('error', 'Unknown error')}"
                 }
             
+            if cache_key is not None:
+                self.tool_cache.put(cache_key, result)
             return result
         except Exception as e:
-            logging.error(f"Exception calling tool {original_tool_name}: {e}")
+            logging.error(f"Exception calling tool {tool_to_call}: {e}")
             return {
                 "isError": True,
                 "error": str(e),
                 "content": f"Error: {str(e)}"
             }
+        finally:
+            self._in_flight[server_name] -= 1
+            self._last_used[server_name] = time.monotonic()
+            
+            # Refetch the tool list if the server reported a change; in the
+            # background, so the caller's deadline and slot are not held for it
+            if server_name in self._stale_tools and not self._in_flight[server_name]:
+                self._schedule_refresh(server_name)
     
     async def close(self) -> None:
         """
@@ -373,8 +1224,45 @@ class StreamManager:
         """
         logging.debug("Closing StreamManager resources")
         
-        # 1. Close all client contexts
-        for ctx in self.client_contexts:
+        # Let servers started from the catalog confirm their tool lists first,
+        # within a bound, or a command shorter than a server start would never
+        # refresh a stale catalog
+        revalidations = [self._start_tasks[name] for name in self._revalidating if name in self._start_tasks]
+        if revalidations:
+            logging.debug(f"Waiting for {len(revalidations)} server(s) to revalidate cataloged tools")
+            await asyncio.wait(revalidations, timeout=CATALOG_REVALIDATE_TIMEOUT)
+        
+        self._closing = True
+        
+        # 0. Stop the idle monitor, the heartbeat, tool list refetches and any
+        # background server starts and restarts
+        background = list(self._start_tasks.values()) + list(self._refresh_tasks.values())
+        if self._idle_task is not None:
+            background.append(self._idle_task)
+            self._idle_task = None
+        if self._heartbeat_task is not None:
+            background.append(self._heartbeat_task)
+            self._heartbeat_task = None
+        for task in background:
+            task.cancel()
+        if background:
+            await asyncio.gather(*background, return_exceptions=True)
+        
+        # 1. Stop routing responses; anything still waiting fails fast
+        for streams in self.streams:
+            dispatcher = self._get_dispatcher(streams)
+            if dispatcher is not None:
+                await dispatcher.close()
+        
+        # 2. Terminate all server processes at once, within a bounded time
+        processes = list(self.active_subprocesses)
+        await self._terminate_processes(processes)
+        
+        # 3. Close all client contexts (skipping servers that were never started);
+        # their processes have already exited, so each one closes immediately
+        for ctx in self.client_contexts + self._retired_contexts:
+            if ctx is None:
+                continue
             try:
                 await ctx.__aexit__(None, None, None)
             except asyncio.CancelledError:
@@ -382,47 +1270,25 @@ class StreamManager:
             except Exception as e:
                 logging.debug(f"Error closing client context: {e}")
         
-        # 2. Terminate all tracked subprocesses
-        for proc in self.active_subprocesses:
+        # 4. Close the process pipes and transports
+        for process in processes:
             try:
-                if proc.poll() is None:  # Process still running
-                    proc.terminate()
-                    try:
-                        proc.wait(timeout=0.5)  # Short timeout
-                    except Exception:
-                        proc.kill()  # Force kill if terminate doesn't work
+                await process.aclose()
             except Exception as e:
-                logging.debug(f"Error cleaning up subprocess: {e}")
+                logging.debug(f"Error closing server process: {e}")
         
-        # 3. Clean up transports in the event loop
-        try:
-            loop = asyncio.get_event_loop()
-            if not loop.is_closed():
-                # Clean up transports
-                for transport in getattr(loop, '_transports', set()):
-                    if hasattr(transport, 'close'):
-                        try:
-                            transport.close()
-                        except Exception:
-                            pass
-                        
-                # Find and clean up subprocess transports specifically
-                for obj in gc.get_objects():
-                    if hasattr(obj, '__class__') and 'SubprocessTransport' in obj.__class__.__name__:
-                        if hasattr(obj, '_protocol') and obj._protocol is not None:
-                            if hasattr(obj._protocol, 'pipe'):
-                                obj._protocol.pipe = None
-        except Exception as e:
-            logging.debug(f"Error cleaning up transports: {e}")
-        
-        # 4. Clear references
+        # 5. Clear references
+        for server_name in list(self._server_processes):
+            self._untrack_process(server_name)
         self.streams.clear()
         self.client_contexts.clear()
+        self._retired_contexts.clear()
+        self._context_owners.clear()
         self.active_subprocesses.clear()
         self.server_streams_map.clear()
         
-        # 5. Force garbage collection
-        gc.collect()
+        # 6. Remove spilled tool results
+        self.result_store.close()
     
     def get_all_tools(self) -> List[Dict[str, Any]]:
         """Get all tools from all servers for display purposes."""
@@ -432,10 +1298,31 @@ class StreamManager:
         """Get all tools with namespaced names for internal use."""
         return self.internal_tools
 
+    def get_tools_fingerprint(self) -> str:
+        """
+        Get a fingerprint of the internal tool set.
+        
+        It changes only when the tools do, so it can key caches of anything
+        derived from the tools, such as system prompts and tool payloads.
+        """
+        if self._tools_fingerprint is None:
+            self._tools_fingerprint = tools_fingerprint(self.internal_tools)
+        return self._tools_fingerprint
+
     def get_server_info(self) -> List[Dict[str, Any]]:
-        """Get information about all servers."""
+        """Get information about all servers, including their live health."""
+        for server in self.server_info:
+            server["health"] = self.health.report(server["name"])
         return self.server_info
 
+    def get_restart_counts(self) -> Dict[str, int]:
+        """Get the number of times each server was restarted after losing its connection."""
+        return dict(self._restart_counts)
+    
+    def get_queue_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get the concurrency and queue metrics of each server that has had tool calls."""
+        return self.admission.stats()
+
     def get_server_for_tool(self, tool_name: str) -> str:
         """Get the server name that a tool belongs to."""
         # Use the resolution method which handles all cases
@@ -473,4 +1360,5 @@ class StreamManager:
         if "original_to_default" in data:
             self.original_to_default = data["original_to_default"]
         if "internal_tools" in data:
-            self.internal_tools = data["internal_tools"]
\ No newline at end of file
+            self.internal_tools = data["internal_tools"]
+            self._tools_fingerprint = None
\ No newline at end of file
@@ -0,0 +1,114 @@
+# mcp_cli/supervisor.py
+"""
+Restart policy for servers whose connection is lost.
+
+When a server process exits or its pipes break, StreamManager respawns it,
+repeats the initialize handshake and tool listing, and swaps in the new
+streams. Failed attempts are retried with exponential backoff. Calls made
+while the server restarts wait for it and are then sent to the new
+process, or fail at once if replay is turned off. Calls that were already
+running when the connection was lost fail, since the server may or may not
+have acted on them.
+
+The policy is set per server in server_config.json:
+
+    "sqlite": {
+      "command": "uvx",
+      "restart": {"maxAttempts": 5, "backoff": 0.5, "maxBackoff": 30, "replay": true}
+    }
+
+"restart": false turns supervision off for the server.
+"""
+import logging
+from typing import Any, Dict, Optional
+
+# Restart attempts before a server is given up on
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Delay in seconds before the second attempt; doubled for each further attempt
+DEFAULT_BACKOFF = 0.5
+
+# Upper bound in seconds of the delay between attempts
+DEFAULT_MAX_BACKOFF = 30.0
+
+class RestartPolicy:
+    """How a server is restarted after its connection is lost."""
+
+    def __init__(self, enabled: bool = True, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 backoff: float = DEFAULT_BACKOFF, max_backoff: float = DEFAULT_MAX_BACKOFF,
+                 replay: bool = True):
+        """
+        Initialize the policy.
+
+        Args:
+            enabled: Restart the server at all
+            max_attempts: Restart attempts before giving up
+            backoff: Delay in seconds before the second attempt
+            max_backoff: Upper bound in seconds of the delay between attempts
+            replay: Hold calls made during the restart and send them once the
+                server is back, instead of failing them at once
+        """
+        self.enabled = enabled
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.replay = replay
+
+    @classmethod
+    def from_config(cls, entry: Any, server_name: str = "") -> "RestartPolicy":
+        """
+        Build a policy from the "restart" entry of a server.
+
+        Args:
+            entry: The entry; missing means the defaults, false disables restarts
+            server_name: The server, for warnings
+        """
+        if entry is None or entry is True:
+            return cls()
+        if entry is False:
+            return cls(enabled=False)
+        if not isinstance(entry, dict):
+            logging.warning(f"Ignoring invalid restart setting for {server_name}: {entry}")
+            return cls()
+        try:
+            return cls(
+                enabled=bool(entry.get("enabled", True)),
+                max_attempts=max(1, int(entry.get("maxAttempts", DEFAULT_MAX_ATTEMPTS))),
+                backoff=max(0.0, float(entry.get("backoff", DEFAULT_BACKOFF))),
+                max_backoff=max(0.0, float(entry.get("maxBackoff", DEFAULT_MAX_BACKOFF))),
+                replay=bool(entry.get("replay", True)),
+            )
+        except (TypeError, ValueError):
+            logging.warning(f"Ignoring invalid restart setting for {server_name}: {entry}")
+            return cls()
+
+    def delay(self, attempt: int) -> float:
+        """
+        Get the delay before a restart attempt.
+
+        Args:
+            attempt: The attempt number, starting at 1
+
+        Returns:
+            0 for the first attempt, then backoff doubling up to max_backoff
+        """
+        if attempt <= 1:
+            return 0.0
+        return min(self.backoff * (2 ** (attempt - 2)), self.max_backoff)
+
+def load_restart_policies(config: Dict[str, Any], server_config_names: Dict[str, str]) -> Dict[str, RestartPolicy]:
+    """
+    Read the restart policy of each server from a parsed server_config.json.
+
+    Args:
+        config: The configuration file contents
+        server_config_names: Server display names mapped to their entry names in the file
+
+    Returns:
+        Server display names mapped to their policy
+    """
+    servers = config.get("mcpServers") or {}
+    return {
+        display_name: RestartPolicy.from_config((servers.get(entry_name) or {}).get("restart"), entry_name)
+        for display_name, entry_name in server_config_names.items()
+    }
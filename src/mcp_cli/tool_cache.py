@@ -0,0 +1,229 @@
+# mcp_cli/tool_cache.py
+"""
+Opt-in result cache for idempotent tool calls.
+
+Read-only tools such as list_tables, describe_table or the current time are
+often called again with the same arguments. Results of tools marked as
+cacheable are kept in a bounded LRU, keyed by server, tool and the
+canonical JSON of the arguments, and served without a round trip to the
+server until their TTL expires.
+
+Nothing is cached unless configured. Rules live in the server entries of
+server_config.json:
+
+    "sqlite": {
+      "command": "uvx",
+      "args": ["mcp-server-sqlite", "--db-path", "test.db"],
+      "cache": {
+        "ttl": 300,
+        "tools": ["list_tables", "describe_table"],
+        "exclude": ["read_query"]
+      }
+    }
+
+"tools" is a list of tool names or glob patterns, or a mapping from names
+or patterns to their TTL in seconds; "ttl" is the default TTL (60 seconds).
+The top-level "toolCache" entry sets the size of the cache:
+
+    "toolCache": {"maxEntries": 256}
+"""
+import copy
+import fnmatch
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Default number of cached results
+DEFAULT_MAX_ENTRIES = 256
+
+# Default TTL in seconds for tools without one
+DEFAULT_TTL = 60.0
+
+CacheKey = Tuple[str, str, str]
+
+def canonical_arguments(arguments: Any) -> str:
+    """Serialize tool arguments so equal arguments give equal keys."""
+    return json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+
+class CacheRules:
+    """Which tools of one server are cacheable, and for how long."""
+
+    def __init__(self, tools: Optional[Dict[str, float]] = None, exclude=None):
+        """
+        Initialize the rules.
+
+        Args:
+            tools: Tool names or glob patterns mapped to their TTL in seconds
+            exclude: Tool names or glob patterns that are never cached
+        """
+        self.tools = tools or {}
+        self.exclude = list(exclude or [])
+
+    @classmethod
+    def from_config(cls, entry: Any) -> Optional["CacheRules"]:
+        """
+        Build rules from the "cache" entry of a server.
+
+        Returns:
+            The rules, or None if the entry is missing or caches nothing
+        """
+        if not isinstance(entry, dict):
+            return None
+        try:
+            default_ttl = float(entry.get("ttl", DEFAULT_TTL))
+            tools = entry.get("tools") or {}
+            if isinstance(tools, str):
+                tools = [tools]
+            if isinstance(tools, list):
+                tools = {pattern: default_ttl for pattern in tools}
+            else:
+                tools = {
+                    pattern: default_ttl if ttl is None or ttl is True else float(ttl)
+                    for pattern, ttl in tools.items()
+                    if ttl is not False
+                }
+        except (TypeError, ValueError, AttributeError) as e:
+            logging.warning(f"Ignoring invalid cache configuration {entry}: {e}")
+            return None
+
+        tools = {pattern: ttl for pattern, ttl in tools.items() if ttl > 0}
+        if not tools:
+            return None
+        return cls(tools, entry.get("exclude"))
+
+    def ttl_for(self, tool_name: str) -> Optional[float]:
+        """Get the TTL of a tool, or None if it is not cacheable."""
+        if any(fnmatch.fnmatchcase(tool_name, pattern) for pattern in self.exclude):
+            return None
+        # An exact name takes precedence over patterns
+        if tool_name in self.tools:
+            return self.tools[tool_name]
+        for pattern, ttl in self.tools.items():
+            if fnmatch.fnmatchcase(tool_name, pattern):
+                return ttl
+        return None
+
+class ToolResultCache:
+    """Bounded LRU of tool results with per-tool TTLs."""
+
+    def __init__(self, rules: Optional[Dict[str, CacheRules]] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            rules: Cache rules by server display name
+            max_entries: Maximum number of cached results
+            clock: Time source, in seconds
+        """
+        self.rules = rules or {}
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], server_config_names: Dict[str, str]) -> "ToolResultCache":
+        """
+        Build the cache from a parsed server_config.json.
+
+        Args:
+            config: The configuration file contents
+            server_config_names: Server display names mapped to their entry names in the file
+
+        Returns:
+            The cache; it is disabled if no server configures caching
+        """
+        servers = config.get("mcpServers") or {}
+        rules = {}
+        for display_name, entry_name in server_config_names.items():
+            server_rules = CacheRules.from_config((servers.get(entry_name) or {}).get("cache"))
+            if server_rules is not None:
+                rules[display_name] = server_rules
+
+        max_entries = DEFAULT_MAX_ENTRIES
+        settings = config.get("toolCache")
+        if isinstance(settings, dict) and "maxEntries" in settings:
+            try:
+                max_entries = max(0, int(settings["maxEntries"]))
+            except (TypeError, ValueError):
+                logging.warning(f"Ignoring invalid toolCache.maxEntries: {settings['maxEntries']}")
+        return cls(rules, max_entries)
+
+    @property
+    def enabled(self) -> bool:
+        """True if any tool is cacheable."""
+        return bool(self.rules) and self.max_entries > 0
+
+    def key(self, server_name: str, tool_name: str, arguments: Any) -> Optional[CacheKey]:
+        """
+        Get the cache key of a call.
+
+        Args:
+            server_name: Display name of the server
+            tool_name: The tool's name on the server
+            arguments: The call arguments
+
+        Returns:
+            The key, or None if the tool is not cacheable
+        """
+        rules = self.rules.get(server_name)
+        if rules is None or rules.ttl_for(tool_name) is None:
+            return None
+        return (server_name, tool_name, canonical_arguments(arguments))
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Get a copy of a cached result, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, result = entry
+            if expires > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result)
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: CacheKey, result: Dict[str, Any]) -> None:
+        """Cache a successful result."""
+        if not self.enabled or not isinstance(result, dict) or result.get("isError"):
+            return
+        ttl = self.rules[key[0]].ttl_for(key[1])
+        if ttl is None:
+            return
+        self._entries[key] = (self.clock() + ttl, copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, server_name: Optional[str] = None) -> None:
+        """Drop the cached results of one server, or of all servers."""
+        if server_name is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == server_name]:
+            del self._entries[key]
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the cache counters."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
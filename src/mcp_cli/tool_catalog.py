@@ -0,0 +1,122 @@
+# mcp_cli/tool_catalog.py
+"""
+Persisted catalog of the tools each server provides.
+
+Entries are keyed by a hash of the server's command, args and env (see
+config.server_config_hash), so editing a server's configuration
+automatically invalidates its cached tools. The catalog lets the
+StreamManager describe a server's tools without a round trip, so startup
+does not wait on tools/list and servers can be started lazily.
+"""
+import os
+import json
+import time
+import logging
+import tempfile
+from typing import Dict, List, Any, Optional
+
+# Default location of the on-disk catalog
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mcp-cli")
+CATALOG_FILENAME = "tool_catalog.json"
+
+class ToolCatalog:
+    """
+    On-disk catalog mapping server config hashes to their tool lists.
+
+    The catalog is a single JSON file that is read once and rewritten
+    whenever an entry changes. Several processes may share it, so each write
+    merges this process's changes into the entries currently on disk.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize the catalog.
+
+        Args:
+            cache_dir: Directory holding the catalog file (default: ~/.cache/mcp-cli)
+        """
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.path = os.path.join(self.cache_dir, CATALOG_FILENAME)
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        # Entries changed by this process since the last save; None marks a removal
+        self._changes: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        """Read the entries currently on disk."""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    return json.load(f).get("servers", {})
+        except (OSError, json.JSONDecodeError, AttributeError) as e:
+            logging.warning(f"Ignoring unreadable tool catalog {self.path}: {e}")
+        return {}
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the catalog from disk on first access."""
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def get(self, config_hash: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the cached tool list for a server config, or None if it is unknown."""
+        entry = self._load().get(config_hash)
+        if entry is None:
+            return None
+        return entry.get("tools", [])
+
+    def put(self, config_hash: str, tools: List[Dict[str, Any]], server_name: Optional[str] = None) -> None:
+        """
+        Store the tool list for a server config and persist the catalog.
+
+        Args:
+            config_hash: Hash of the server's command, args and env
+            tools: The tools returned by the server's tools/list
+            server_name: Optional server name, recorded for readability only
+        """
+        entry = {
+            "server": server_name,
+            "tools": tools,
+            "updated": time.time(),
+        }
+        self._load()[config_hash] = entry
+        self._changes[config_hash] = entry
+        self.save()
+
+    def remove(self, config_hash: str) -> None:
+        """Drop a server config from the catalog and persist the change."""
+        if self._load().pop(config_hash, None) is not None:
+            self._changes[config_hash] = None
+            self.save()
+
+    def save(self) -> None:
+        """
+        Write the catalog to disk, replacing the file atomically.
+
+        This process's changes are applied on top of the entries on disk, so
+        entries written by other processes in the meantime are kept.
+        """
+        self._load()
+        entries = self._read()
+        for config_hash, entry in self._changes.items():
+            if entry is None:
+                entries.pop(config_hash, None)
+            else:
+                entries[config_hash] = entry
+
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # A temporary file of our own, so concurrent writers do not interleave
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.cache_dir, prefix=f"{CATALOG_FILENAME}.", suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = f.name
+                json.dump({"servers": entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"Could not write tool catalog {self.path}: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        self._entries = entries
+        self._changes = {}
@@ -0,0 +1,221 @@
+# mcp_cli/tool_results.py
+"""
+Size cap for tool results added to the conversation.
+
+A tool result goes into the conversation history and is re-sent with every
+later completion, so one large result (e.g. a SELECT * from the sqlite
+server) makes every following request slow and expensive. Results over the
+cap are written to a local spill store. The history gets a preview of the
+start of the result and a handle, and the built-in read_result tool lets
+the model page through the full result when it needs more.
+"""
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Any, Dict, Optional
+
+# Results larger than this many bytes (UTF-8) are spilled; 0 disables the cap
+DEFAULT_MAX_RESULT_BYTES = 16384
+
+# Name of the built-in tool for paging through spilled results
+READ_RESULT_TOOL_NAME = "mcp_cli_read_result"
+
+# MCP-style definition of the built-in paging tool
+READ_RESULT_TOOL = {
+    "name": READ_RESULT_TOOL_NAME,
+    "description": (
+        "Read part of a large tool result that was truncated in the conversation. "
+        "Use the handle and next offset given in the truncation notice."
+    ),
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "handle": {"type": "string", "description": "Handle of the stored result"},
+            "offset": {"type": "integer", "description": "Byte offset to start reading from (default 0)"},
+            "length": {"type": "integer", "description": "Maximum number of bytes to read"},
+        },
+        "required": ["handle"],
+    },
+}
+
+def get_max_result_bytes() -> int:
+    """Get the result size cap from MCP_CLI_MAX_RESULT_BYTES."""
+    try:
+        return max(0, int(os.environ.get("MCP_CLI_MAX_RESULT_BYTES", DEFAULT_MAX_RESULT_BYTES)))
+    except ValueError:
+        return DEFAULT_MAX_RESULT_BYTES
+
+def _char_boundary(data: bytes, end: int) -> int:
+    """Move a byte offset back to the start of a UTF-8 character."""
+    end = min(end, len(data))
+    while 0 < end < len(data) and (data[end] & 0xC0) == 0x80:
+        end -= 1
+    return end
+
+def _format_size(size: int) -> str:
+    """Format a byte count for display."""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size} bytes"
+
+class ResultStore:
+    """Spill store for tool results over the size cap."""
+
+    def __init__(self, max_bytes: Optional[int] = None, spill_dir: Optional[str] = None):
+        """
+        Initialize the store.
+
+        Args:
+            max_bytes: Size cap for results kept in the conversation (default:
+                MCP_CLI_MAX_RESULT_BYTES or 16384); 0 disables the cap
+            spill_dir: Directory for spilled results (default: a temporary
+                directory removed on close)
+        """
+        self.max_bytes = get_max_result_bytes() if max_bytes is None else max_bytes
+        self.spill_dir = spill_dir
+        self._owns_dir = spill_dir is None
+        self._results: Dict[str, str] = {}  # Handle -> path of the stored result
+
+    @property
+    def enabled(self) -> bool:
+        """True if results over the cap are spilled."""
+        return self.max_bytes > 0
+
+    def has_results(self) -> bool:
+        """True if any result has been spilled."""
+        return bool(self._results)
+
+    def cap(self, tool_name: str, content: str) -> str:
+        """
+        Cap a tool result for the conversation history.
+
+        Args:
+            tool_name: The tool that produced the result
+            content: The formatted result
+
+        Returns:
+            The result itself if it is within the cap, otherwise a preview
+            and a notice with the handle of the stored full result
+        """
+        if not self.enabled or not isinstance(content, str):
+            return content
+        data = content.encode("utf-8")
+        if len(data) <= self.max_bytes:
+            return content
+
+        try:
+            handle = self._store(data)
+        except OSError as e:
+            logging.warning(f"Could not store large result from {tool_name}: {e}")
+            handle = None
+
+        end = _char_boundary(data, self.max_bytes)
+        # Prefer to cut at a line break if there is one in the second half of the preview
+        newline = data.rfind(b"\n", 0, end)
+        if newline > end // 2:
+            end = newline + 1
+        preview = data[:end].decode("utf-8", errors="ignore")
+
+        if handle is None:
+            notice = f"[Result truncated: showing {_format_size(end)} of {_format_size(len(data))}.]"
+        else:
+            notice = (
+                f"[Result truncated: showing {_format_size(end)} of {_format_size(len(data))}. "
+                f"The full result is stored with handle \"{handle}\". "
+                f"Call {READ_RESULT_TOOL_NAME} with handle \"{handle}\" and offset {end} to read more.]"
+            )
+        logging.debug(f"Capped {len(data)} byte result from {tool_name}; stored as {handle}")
+        return f"{preview}\n{notice}"
+
+    def _store(self, data: bytes) -> str:
+        """Write a result to the spill directory and return its handle."""
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="mcp-cli-results-")
+        os.makedirs(self.spill_dir, exist_ok=True)
+
+        handle = f"result_{uuid.uuid4().hex[:12]}"
+        path = os.path.join(self.spill_dir, f"{handle}.txt")
+        with open(path, "wb") as f:
+            f.write(data)
+        self._results[handle] = path
+        return handle
+
+    def read(self, handle: str, offset: int = 0, length: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Read a page of a stored result.
+
+        Args:
+            handle: The result's handle
+            offset: Byte offset to start from
+            length: Maximum bytes to read (default and maximum: the size cap)
+
+        Returns:
+            A tool result dict, with isError set if the handle is unknown
+        """
+        path = self._results.get(handle)
+        if path is None:
+            return {
+                "isError": True,
+                "error": f"Unknown result handle '{handle}'",
+                "content": f"Error: Unknown result handle '{handle}'"
+            }
+
+        page_size = self.max_bytes or DEFAULT_MAX_RESULT_BYTES
+        length = page_size if not length or length <= 0 else min(length, page_size)
+        try:
+            total = os.path.getsize(path)
+            requested = min(max(0, offset), total)
+            # Only the page is read, plus the few bytes either side that
+            # tell where its UTF-8 characters start
+            base = max(0, requested - 3)
+            with open(path, "rb") as f:
+                f.seek(base)
+                window = f.read(requested - base + length + 1)
+        except OSError as e:
+            return {"isError": True, "error": str(e), "content": f"Error: {e}"}
+
+        # Offsets within the window; the window ends at the end of the result
+        # or one byte past the page, so boundaries are checked as in the file
+        start = _char_boundary(window, requested - base)
+        end = _char_boundary(window, start + length)
+        if end <= start < len(window):
+            end = min(len(window), start + length)
+        page = window[start:end].decode("utf-8", errors="ignore")
+        start += base
+        end += base
+
+        if end < total:
+            notice = f"[Bytes {start}-{end} of {total}. Next offset: {end}]"
+        else:
+            notice = f"[Bytes {start}-{end} of {total}. End of result.]"
+        return {"isError": False, "content": f"{page}\n{notice}"}
+
+    def call(self, arguments: Any) -> Dict[str, Any]:
+        """Handle a call of the built-in read_result tool."""
+        if not isinstance(arguments, dict) or not arguments.get("handle"):
+            return {
+                "isError": True,
+                "error": "A result handle is required",
+                "content": "Error: A result handle is required"
+            }
+        try:
+            offset = int(arguments.get("offset") or 0)
+            length = int(arguments["length"]) if arguments.get("length") else None
+        except (TypeError, ValueError):
+            return {
+                "isError": True,
+                "error": "offset and length must be integers",
+                "content": "Error: offset and length must be integers"
+            }
+        return self.read(str(arguments["handle"]), offset, length)
+
+    def close(self) -> None:
+        """Forget stored results and remove the spill directory if the store created it."""
+        self._results.clear()
+        if self._owns_dir and self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
@@ -8,12 +8,19 @@ from mcp_cli.chat.chat_context import ChatContext
 def dummy_get_llm_client(provider, model):
     return {"provider": provider, "model": model, "dummy": True}
 
-def dummy_generate_system_prompt(tools):
+def dummy_generate_system_prompt(tools, native_tools=True, fingerprint=None):
     return "Dummy system prompt."
 
 def dummy_convert_to_openai_tools(tools):
     return [{"name": t["name"], "dummy": True} for t in tools]
 
+class DummyToolPayload:
+    def __init__(self, tools):
+        self.tools = dummy_convert_to_openai_tools(tools)
+
+def dummy_get_tool_payload(tools, fingerprint=None):
+    return DummyToolPayload(tools)
+
 # Dummy StreamManager to simulate the actual stream manager.
 class DummyStreamManager:
     def __init__(self, tools=None):
@@ -41,7 +48,7 @@ class DummyStreamManager:
 def patch_dependencies(monkeypatch):
     monkeypatch.setattr("mcp_cli.chat.chat_context.get_llm_client", dummy_get_llm_client)
     monkeypatch.setattr("mcp_cli.chat.chat_context.generate_system_prompt", dummy_generate_system_prompt)
-    monkeypatch.setattr("mcp_cli.chat.chat_context.convert_to_openai_tools", dummy_convert_to_openai_tools)
+    monkeypatch.setattr("mcp_cli.chat.chat_context.get_tool_payload", dummy_get_tool_payload)
 
 @pytest.fixture
 def dummy_stream_manager():
@@ -109,3 +116,47 @@ async def test_to_dict_and_update_from_dict(chat_context):
     chat_context.update_from_dict(context_dict)
     assert chat_context.exit_requested is True
     assert chat_context.client == new_client
+
+@pytest.mark.asyncio
+async def test_initialize_without_native_tools(monkeypatch, dummy_stream_manager):
+    # Providers without function calling get no tools parameter
+    class DummyClient:
+        supports_native_tools = False
+
+    monkeypatch.setattr("mcp_cli.chat.chat_context.get_llm_client", lambda provider, model: DummyClient())
+    calls = []
+    monkeypatch.setattr(
+        "mcp_cli.chat.chat_context.generate_system_prompt",
+        lambda tools, native_tools=True, fingerprint=None: calls.append(native_tools) or "Indexed prompt."
+    )
+
+    context = ChatContext(stream_manager=dummy_stream_manager, provider="dummy_provider", model="dummy_model")
+    await context.initialize()
+
+    assert calls == [False]
+    assert context.openai_tools == []
+    assert context.conversation_history[0]["content"] == "Indexed prompt."
+
+@pytest.mark.asyncio
+async def test_refresh_tools_picks_up_tool_set_changes(monkeypatch, dummy_stream_manager):
+    # The prompt and payload follow the stream manager's tool set between turns
+    monkeypatch.setattr(
+        "mcp_cli.chat.chat_context.generate_system_prompt",
+        lambda tools, native_tools=True, fingerprint=None: f"Prompt for {[t['name'] for t in tools]}"
+    )
+    dummy_stream_manager.fingerprint = "v1"
+    dummy_stream_manager.get_tools_fingerprint = lambda: dummy_stream_manager.fingerprint
+
+    context = ChatContext(stream_manager=dummy_stream_manager, provider="dummy_provider", model="dummy_model")
+    await context.initialize()
+    context.conversation_history.append({"role": "user", "content": "Hi"})
+    assert context.refresh_tools() is False
+
+    dummy_stream_manager._tools = [{"name": "tool1"}, {"name": "tool3"}]
+    dummy_stream_manager.fingerprint = "v2"
+    assert context.refresh_tools() is True
+
+    assert context.tools_fingerprint == "v2"
+    assert [t["name"] for t in context.openai_tools] == ["tool1", "tool3"]
+    assert context.conversation_history[0]["content"] == "Prompt for ['tool1', 'tool3']"
+    assert context.conversation_history[1] == {"role": "user", "content": "Hi"}
@@ -0,0 +1,273 @@
+import asyncio
+
+import pytest
+
+from mcp_cli.chat.conversation import ConversationProcessor
+
+class DummyUIManager:
+    def __init__(self):
+        self.chunks = []
+        self.finalized = []
+        self.printed = []
+        self.tool_calls = []
+
+    def print_tool_call(self, tool_name, raw_arguments):
+        self.tool_calls.append(tool_name)
+
+    async def stream_assistant_chunk(self, chunk):
+        self.chunks.append(chunk)
+
+    async def finalize_assistant_response(self, content, response_time):
+        self.finalized.append(content)
+
+    def print_assistant_response(self, content, response_time):
+        self.printed.append(content)
+
+class DummyStreamManager:
+    async def call_tool(self, tool_name, arguments):
+        return {"isError": False, "content": "sunny"}
+
+class StreamingClient:
+    """Client whose stream_chat replays one scripted list of events per turn."""
+    def __init__(self, turns):
+        self.turns = list(turns)
+        self.stream_calls = 0
+
+    async def create_completion(self, messages, tools=None):
+        raise AssertionError("streaming clients should not fall back to create_completion")
+
+    async def stream_chat(self, messages, tools=None):
+        self.stream_calls += 1
+        for event in self.turns.pop(0):
+            yield event
+
+class DummyContext:
+    def __init__(self, client):
+        self.client = client
+        self.stream_manager = DummyStreamManager()
+        self.openai_tools = []
+        self.conversation_history = [{"role": "user", "content": "Weather?"}]
+
+@pytest.mark.asyncio
+async def test_streamed_final_answer_uses_one_generation():
+    client = StreamingClient([[{"content": "It is "}, {"content": "sunny."}]])
+    context = DummyContext(client)
+    ui = DummyUIManager()
+
+    await ConversationProcessor(context, ui).process_conversation()
+
+    assert client.stream_calls == 1
+    assert ui.chunks == ["It is ", "sunny."]
+    assert ui.finalized == ["It is sunny."]
+    assert context.conversation_history[-1] == {"role": "assistant", "content": "It is sunny."}
+
+@pytest.mark.asyncio
+async def test_text_before_tool_calls_is_kept_in_history():
+    tool_call = {"id": "call_1", "type": "function", "function": {"name": "get_weather", "arguments": "{}"}}
+    client = StreamingClient([
+        [{"content": "Let me check."}, {"tool_call": tool_call}],
+        [{"content": "Sunny."}],
+    ])
+    context = DummyContext(client)
+
+    await ConversationProcessor(context, DummyUIManager()).process_conversation()
+
+    # The next completion sees what the model said along with its tool call
+    call_entry = context.conversation_history[1]
+    assert call_entry["role"] == "assistant"
+    assert call_entry["content"] == "Let me check."
+    assert call_entry["tool_calls"][0]["id"] == "call_1"
+    roles = [entry["role"] for entry in context.conversation_history]
+    assert roles == ["user", "assistant", "tool", "assistant"]
+
+@pytest.mark.asyncio
+async def test_tool_calls_detected_from_stream():
+    tool_call = {"id": "call_1", "type": "function", "function": {"name": "get_weather", "arguments": "{}"}}
+    client = StreamingClient([
+        [{"tool_call": tool_call}],
+        [{"content": "Sunny."}],
+    ])
+    context = DummyContext(client)
+    ui = DummyUIManager()
+
+    await ConversationProcessor(context, ui).process_conversation()
+
+    assert client.stream_calls == 2
+    assert ui.tool_calls == ["get_weather"]
+    roles = [entry["role"] for entry in context.conversation_history]
+    assert roles == ["user", "assistant", "tool", "assistant"]
+    assert context.conversation_history[-1]["content"] == "Sunny."
+
+@pytest.mark.asyncio
+async def test_tool_calls_start_before_stream_ends():
+    tool_call = {"id": "call_1", "type": "function", "function": {"name": "get_weather", "arguments": "{}"}}
+    started = []
+
+    class RecordingStreamManager:
+        async def call_tool(self, tool_name, arguments):
+            started.append(tool_name)
+            return {"isError": False, "content": "sunny"}
+
+    class SlowTailClient(StreamingClient):
+        async def stream_chat(self, messages, tools=None):
+            self.stream_calls += 1
+            if self.stream_calls == 1:
+                yield {"tool_call": tool_call}
+                # The model is still generating; the tool should already be running.
+                await asyncio.sleep(0.05)
+                assert started == ["get_weather"]
+            else:
+                yield {"content": "Sunny."}
+
+    context = DummyContext(SlowTailClient([]))
+    context.stream_manager = RecordingStreamManager()
+    await ConversationProcessor(context, DummyUIManager()).process_conversation()
+
+    assert context.conversation_history[-1]["content"] == "Sunny."
+    assert [entry["role"] for entry in context.conversation_history] == ["user", "assistant", "tool", "assistant"]
+
+@pytest.mark.asyncio
+async def test_failed_stream_cancels_started_tool_calls():
+    tool_call = {"id": "call_1", "type": "function", "function": {"name": "get_weather", "arguments": "{}"}}
+    cancelled = []
+
+    class HangingStreamManager:
+        async def call_tool(self, tool_name, arguments):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(tool_name)
+                raise
+
+    class FailingClient(StreamingClient):
+        async def stream_chat(self, messages, tools=None):
+            yield {"tool_call": tool_call}
+            await asyncio.sleep(0)
+            raise RuntimeError("connection reset")
+
+    context = DummyContext(FailingClient([]))
+    context.stream_manager = HangingStreamManager()
+    processor = ConversationProcessor(context, DummyUIManager())
+
+    await processor.process_conversation()
+
+    assert cancelled == ["get_weather"]
+    # Nothing is left behind for the cancelled call
+    assert processor.tool_processor._task_calls == {}
+    assert "connection reset" in context.conversation_history[-1]["content"]
+
+@pytest.mark.asyncio
+async def test_only_relevant_and_used_tools_are_sent():
+    from mcp_cli.llm.tool_selector import ToolSelector
+    from mcp_cli.llm.tools_handler import convert_to_openai_tools
+
+    tools = [
+        {"name": "get_weather", "description": "Current weather for a city"},
+        {"name": "read_file", "description": "Read a file from disk"},
+        {"name": "list_tables", "description": "List database tables"},
+    ]
+    sent = []
+
+    class RecordingClient(StreamingClient):
+        async def stream_chat(self, messages, tools=None):
+            sent.append([tool["function"]["name"] for tool in tools])
+            async for event in super().stream_chat(messages, tools):
+                yield event
+
+    tool_call = {"id": "call_1", "type": "function", "function": {"name": "read_file", "arguments": "{}"}}
+    client = RecordingClient([[{"tool_call": tool_call}], [{"content": "Sunny."}]])
+    context = DummyContext(client)
+    context.openai_tools = convert_to_openai_tools(tools)
+    context.tool_selector = ToolSelector(tools, top_k=1)
+
+    await ConversationProcessor(context, DummyUIManager()).process_conversation()
+
+    # The used tool stays available on the follow-up turn
+    assert sent == [["get_weather"], ["get_weather", "read_file"]]
+
+@pytest.mark.asyncio
+async def test_request_builder_orders_tools_and_records_usage():
+    from mcp_cli.llm.request_builder import RequestBuilder
+    from mcp_cli.llm.tools_handler import convert_to_openai_tools
+
+    sent = []
+
+    class RecordingClient(StreamingClient):
+        async def stream_chat(self, messages, tools=None):
+            sent.append([tool["function"]["name"] for tool in tools])
+            async for event in super().stream_chat(messages, tools):
+                yield event
+
+    usage = {"prompt_tokens": 50, "cached_prompt_tokens": 40, "uncached_prompt_tokens": 10, "completion_tokens": 2}
+    client = RecordingClient([[{"content": "Sunny."}, {"usage": usage}]])
+    context = DummyContext(client)
+    context.openai_tools = convert_to_openai_tools([{"name": "zeta"}, {"name": "alpha"}])
+    context.request_builder = RequestBuilder()
+
+    await ConversationProcessor(context, DummyUIManager()).process_conversation()
+
+    assert sent == [["alpha", "zeta"]]
+    assert context.request_builder.usage.cached_prompt_tokens == 40
+    assert context.conversation_history[-1]["content"] == "Sunny."
+
+@pytest.mark.asyncio
+async def test_request_builder_sends_only_the_turns_selection():
+    from mcp_cli.llm.request_builder import RequestBuilder
+    from mcp_cli.llm.tool_selector import ToolSelector
+    from mcp_cli.llm.tools_handler import convert_to_openai_tools
+
+    tools = [
+        {"name": "get_weather", "description": "Current weather for a city"},
+        {"name": "read_file", "description": "Read a file from disk"},
+        {"name": "list_tables", "description": "List database tables"},
+    ]
+    sent = []
+
+    class RecordingClient(StreamingClient):
+        async def stream_chat(self, messages, tools=None):
+            sent.append([tool["function"]["name"] for tool in tools])
+            async for event in super().stream_chat(messages, tools):
+                yield event
+
+    client = RecordingClient([[{"content": "Sunny."}], [{"content": "Two tables."}]])
+    context = DummyContext(client)
+    context.conversation_history = [{"role": "user", "content": "Weather and file?"}]
+    context.openai_tools = convert_to_openai_tools(tools)
+    context.tool_selector = ToolSelector(tools, top_k=2)
+    context.request_builder = RequestBuilder()
+    processor = ConversationProcessor(context, DummyUIManager())
+
+    await processor.process_conversation()
+    context.tool_selector.top_k = 1
+    context.conversation_history.append({"role": "user", "content": "Which database tables?"})
+    await processor.process_conversation()
+
+    # Tools selected on earlier turns are not carried into later requests
+    assert sent == [["get_weather", "read_file"], ["list_tables"]]
+
+@pytest.mark.asyncio
+async def test_tool_set_changes_are_picked_up_between_completions():
+    from mcp_cli.llm.tools_handler import convert_to_openai_tools
+
+    sent = []
+
+    class RecordingClient(StreamingClient):
+        async def stream_chat(self, messages, tools=None):
+            sent.append([tool["function"]["name"] for tool in tools])
+            async for event in super().stream_chat(messages, tools):
+                yield event
+
+    tool_call = {"id": "call_1", "type": "function", "function": {"name": "get_weather", "arguments": "{}"}}
+    client = RecordingClient([[{"tool_call": tool_call}], [{"content": "Sunny."}]])
+    context = DummyContext(client)
+    context.openai_tools = convert_to_openai_tools([{"name": "get_weather"}])
+
+    # A server restarts with a new tool while the first completion runs
+    def refresh_tools():
+        if client.stream_calls:
+            context.openai_tools = convert_to_openai_tools([{"name": "get_weather"}, {"name": "get_forecast"}])
+    context.refresh_tools = refresh_tools
+
+    await ConversationProcessor(context, DummyUIManager()).process_conversation()
+
+    assert sent == [["get_weather"], ["get_weather", "get_forecast"]]
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from mcp_cli.chat.history_compactor import HistoryCompactor
+
+class SummaryClient:
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.requests = []
+
+    async def create_completion(self, messages, tools=None):
+        self.requests.append(messages)
+        await asyncio.sleep(self.delay)
+        return {"response": "they talked", "tool_calls": []}
+
+class DummyContext:
+    def __init__(self, client, turns):
+        self.client = client
+        self.conversation_history = [{"role": "system", "content": "prompt"}]
+        for i in range(turns):
+            self.conversation_history.append({"role": "user", "content": f"question {i} " + "x" * 400})
+            self.conversation_history.append({"role": "assistant", "content": f"answer {i}"})
+
+@pytest.mark.asyncio
+async def test_no_compaction_under_threshold():
+    context = DummyContext(SummaryClient(), turns=6)
+    compactor = HistoryCompactor(context, threshold_tokens=100000, keep_turns=2)
+    assert compactor.maybe_compact() is None
+
+@pytest.mark.asyncio
+async def test_compacts_oldest_turns_in_background():
+    client = SummaryClient(delay=0.05)
+    context = DummyContext(client, turns=6)
+    compactor = HistoryCompactor(context, threshold_tokens=100, keep_turns=2)
+
+    task = compactor.maybe_compact()
+    assert task is not None and compactor.running
+    # The conversation keeps growing while the summary is generated
+    context.conversation_history.append({"role": "user", "content": "latest"})
+    assert await task is True
+
+    history = context.conversation_history
+    assert history[0] == {"role": "system", "content": "prompt"}
+    assert "they talked" in history[1]["content"]
+    # The two most recent turns, and anything added since, are kept verbatim
+    assert [m["content"][:10] for m in history[2:]] == [
+        "question 4", "answer 4", "question 5", "answer 5", "latest"
+    ]
+    # The summary request covered only the older segment
+    assert client.requests[0][-2]["content"] == "answer 3"
+
+@pytest.mark.asyncio
+async def test_compaction_skipped_when_history_rewritten():
+    context = DummyContext(SummaryClient(delay=0.05), turns=6)
+    compactor = HistoryCompactor(context, threshold_tokens=100, keep_turns=2)
+
+    task = compactor.maybe_compact()
+    del context.conversation_history[1:]  # e.g. /clear while summarizing
+    assert await task is False
+    assert context.conversation_history == [{"role": "system", "content": "prompt"}]
+
+@pytest.mark.asyncio
+async def test_nothing_to_compact_with_few_turns():
+    context = DummyContext(SummaryClient(), turns=2)
+    compactor = HistoryCompactor(context, threshold_tokens=1, keep_turns=4)
+    assert compactor.maybe_compact() is None
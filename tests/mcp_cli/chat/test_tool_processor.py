@@ -170,3 +170,113 @@ async def test_process_tool_calls_exception_in_call():
     ]
     assert len(error_entries) >= 1
     assert any("Could not execute tool." in e["content"] for e in error_entries)
+
+class SlowStreamManager:
+    """Stream manager whose tools sleep for a given delay, tracking concurrency per server."""
+    def __init__(self, delays, servers):
+        self.delays = delays
+        self.servers = servers
+        self.running = {}
+        self.max_running = {}
+        self.completed = []
+
+    def get_server_for_tool(self, tool_name):
+        return self.servers[tool_name]
+
+    async def call_tool(self, tool_name, arguments):
+        server = self.servers[tool_name]
+        self.running[server] = self.running.get(server, 0) + 1
+        self.max_running[server] = max(self.max_running.get(server, 0), self.running[server])
+        await asyncio.sleep(self.delays[tool_name])
+        self.running[server] -= 1
+        self.completed.append(tool_name)
+        return {"isError": False, "content": f"{tool_name} done"}
+
+def _tool_call(name, call_id):
+    return {"function": {"name": name, "arguments": "{}"}, "id": call_id}
+
+@pytest.mark.asyncio
+async def test_process_tool_calls_parallel_preserves_order():
+    stream_manager = SlowStreamManager(
+        delays={"slow_query": 0.2, "fast_search": 0.01},
+        servers={"slow_query": "sqlite", "fast_search": "ddg"}
+    )
+    context = DummyContext(stream_manager=stream_manager)
+    processor = ToolProcessor(context, DummyUIManager())
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await processor.process_tool_calls([_tool_call("slow_query", "c1"), _tool_call("fast_search", "c2")])
+    elapsed = loop.time() - start
+
+    # Calls to different servers overlap, so the turn costs the slowest call only.
+    assert stream_manager.completed == ["fast_search", "slow_query"]
+    assert elapsed < 0.2 + 0.1
+
+    # History follows the original tool_call order.
+    assert [entry.get("tool_call_id") for entry in context.conversation_history if entry["role"] == "tool"] == ["c1", "c2"]
+    assert context.conversation_history[0]["tool_calls"][0]["id"] == "c1"
+
+@pytest.mark.asyncio
+async def test_process_tool_calls_leaves_server_limits_to_stream_manager():
+    stream_manager = SlowStreamManager(
+        delays={"a": 0.02, "b": 0.02, "c": 0.02, "d": 0.02, "e": 0.02},
+        servers={"a": "sqlite", "b": "sqlite", "c": "sqlite", "d": "sqlite", "e": "sqlite"}
+    )
+    context = DummyContext(stream_manager=stream_manager)
+    processor = ToolProcessor(context, DummyUIManager())
+
+    await processor.process_tool_calls([_tool_call(name, name) for name in "abcde"])
+
+    # The StreamManager's admission control applies the configured limit
+    assert stream_manager.max_running == {"sqlite": 5}
+    assert len(context.conversation_history) == 10
+
+@pytest.mark.asyncio
+async def test_large_tool_result_is_capped(tmp_path):
+    from mcp_cli.tool_results import ResultStore
+
+    stream_manager = DummyStreamManager(return_result={"isError": False, "content": "x" * 5000})
+    stream_manager.result_store = ResultStore(max_bytes=200, spill_dir=str(tmp_path))
+    context = DummyContext(stream_manager=stream_manager)
+    processor = ToolProcessor(context, DummyUIManager())
+
+    tool_call = {"id": "call_1", "type": "function", "function": {"name": "dump", "arguments": "{}"}}
+    await processor.process_tool_calls([tool_call])
+
+    content = context.conversation_history[-1]["content"]
+    assert len(content) < 1000
+    assert "mcp_cli_read_result" in content
+    assert stream_manager.result_store.has_results()
+
+@pytest.mark.asyncio
+async def test_interrupt_cancels_running_calls_and_keeps_finished_ones():
+    import signal
+
+    class SlowStreamManager:
+        async def call_tool(self, tool_name, arguments):
+            if tool_name == "slow":
+                await asyncio.sleep(10)
+            return {"isError": False, "content": f"{tool_name} done"}
+
+    context = DummyContext(stream_manager=SlowStreamManager())
+    processor = ToolProcessor(context, DummyUIManager())
+    tool_calls = [
+        {"function": {"name": "fast", "arguments": "{}"}, "id": "call_fast"},
+        {"function": {"name": "slow", "arguments": "{}"}, "id": "call_slow"},
+    ]
+
+    async def press_ctrl_c():
+        await asyncio.sleep(0.05)
+        signal.raise_signal(signal.SIGINT)
+
+    previous_handler = signal.getsignal(signal.SIGINT)
+    interrupter = asyncio.create_task(press_ctrl_c())
+    await asyncio.wait_for(processor.process_tool_calls(tool_calls), timeout=5)
+    await interrupter
+
+    responses = {m["tool_call_id"]: m["content"] for m in context.conversation_history if m["role"] == "tool"}
+    assert responses == {"call_fast": "fast done", "call_slow": "Error: Tool call cancelled by user"}
+    assert processor._task_calls == {}
+    # The previous SIGINT handler is back in place
+    assert signal.getsignal(signal.SIGINT) is previous_handler
@@ -0,0 +1,163 @@
+import asyncio
+import json
+from io import StringIO
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from mcp_cli.commands import batch, cmd
+from mcp_cli.commands.batch import BatchRunner, get_batch_workers, run_batch
+
+@pytest.fixture
+def mock_stream_manager():
+    """Create a mock StreamManager whose tools echo their arguments."""
+    mock_manager = MagicMock()
+    mock_manager.get_internal_tools.return_value = [
+        {"name": "TestServer1_tool1", "description": "Test tool 1"}
+    ]
+
+    async def call_tool(tool_name, arguments):
+        if tool_name == "broken":
+            return {"isError": True, "error": "tool failed", "content": "Error: tool failed"}
+        await asyncio.sleep(arguments.get("delay", 0))
+        return {"isError": False, "content": arguments}
+
+    mock_manager.call_tool = AsyncMock(side_effect=call_tool)
+    return mock_manager
+
+def parse_results(sink):
+    return [json.loads(line) for line in sink.getvalue().splitlines()]
+
+@pytest.mark.asyncio
+async def test_run_batch_tool_calls(mock_stream_manager):
+    """Each request gets a result line with its id, result and timing."""
+    source = StringIO(
+        '{"id": "a", "tool": "tool1", "args": {"x": 1}}\n'
+        '\n'
+        '{"tool": "tool1", "tool_args": "{\\"x\\": 2}"}\n'
+    )
+    sink = StringIO()
+    summary = await run_batch(source, sink, BatchRunner(mock_stream_manager, "openai", "m"))
+
+    results = sorted(parse_results(sink), key=lambda r: r["line"])
+    assert [r["id"] for r in results] == ["a", 3]
+    assert [r["result"] for r in results] == [{"x": 1}, {"x": 2}]
+    assert all(r["ok"] and r["elapsed"] >= 0 for r in results)
+    assert summary["total"] == 2 and summary["failed"] == 0
+
+@pytest.mark.asyncio
+async def test_run_batch_reports_errors_per_item(mock_stream_manager):
+    """Failing and malformed requests produce error lines without stopping the batch."""
+    source = StringIO(
+        'not json\n'
+        '{"id": "bad", "tool": "broken"}\n'
+        '{"id": "empty"}\n'
+        '{"id": "good", "tool": "tool1", "args": {}}\n'
+    )
+    sink = StringIO()
+    summary = await run_batch(source, sink, BatchRunner(mock_stream_manager, "openai", "m"))
+
+    results = {r["id"]: r for r in parse_results(sink)}
+    assert results[1]["ok"] is False
+    assert results["bad"]["error"] == "tool failed"
+    assert "needs an 'input'" in results["empty"]["error"]
+    assert results["good"]["ok"] is True
+    assert summary == {"total": 4, "failed": 3, "elapsed": summary["elapsed"]}
+
+@pytest.mark.asyncio
+async def test_run_batch_streams_in_completion_order(mock_stream_manager):
+    """Results are written as they finish, with requests running concurrently."""
+    source = StringIO(
+        '{"id": "slow", "tool": "tool1", "args": {"delay": 0.2}}\n'
+        '{"id": "fast", "tool": "tool1", "args": {"delay": 0}}\n'
+    )
+    sink = StringIO()
+    await run_batch(source, sink, BatchRunner(mock_stream_manager, "openai", "m"), workers=2)
+
+    assert [r["id"] for r in parse_results(sink)] == ["fast", "slow"]
+
+@pytest.mark.asyncio
+async def test_run_batch_limits_concurrency(mock_stream_manager):
+    """No more than the configured number of requests run at once."""
+    running = 0
+    peak = 0
+
+    async def call_tool(tool_name, arguments):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"isError": False, "content": "ok"}
+
+    mock_stream_manager.call_tool = AsyncMock(side_effect=call_tool)
+    source = StringIO('{"tool": "tool1"}\n' * 20)
+    sink = StringIO()
+    summary = await run_batch(source, sink, BatchRunner(mock_stream_manager, "openai", "m"), workers=3)
+
+    assert summary["total"] == 20
+    assert peak == 3
+
+@pytest.mark.asyncio
+async def test_run_batch_shares_one_llm_client(mock_stream_manager):
+    """Prompt requests share a single LLM client and fall back to the command's prompt."""
+    client = MagicMock()
+    with patch("mcp_cli.commands.batch.get_llm_client", return_value=client) as mock_get_client, \
+         patch("mcp_cli.commands.cmd.run_llm_with_tools",
+               new=AsyncMock(side_effect=lambda *args, **kwargs: f"answer to {args[2]}")) as mock_run_llm:
+        source = StringIO(
+            '{"id": 1, "input": "one"}\n'
+            '{"id": 2, "input": "two", "prompt": "Q: {{input}}"}\n'
+        )
+        sink = StringIO()
+        runner = BatchRunner(mock_stream_manager, "openai", "m", prompt="Default: {{input}}")
+        await run_batch(source, sink, runner)
+
+    mock_get_client.assert_called_once_with(provider="openai", model="m")
+    prompts = {call.args[2]: call.args[3] for call in mock_run_llm.call_args_list}
+    assert prompts == {"one": "Default: {{input}}", "two": "Q: {{input}}"}
+    assert all(call.kwargs["client"] is client for call in mock_run_llm.call_args_list)
+    results = {r["id"]: r["result"] for r in parse_results(sink)}
+    assert results == {1: "answer to one", 2: "answer to two"}
+
+@pytest.mark.asyncio
+async def test_run_batch_llm_errors(mock_stream_manager):
+    """LLM failures become per-item errors."""
+    with patch("mcp_cli.commands.batch.get_llm_client", side_effect=Exception("no key")):
+        sink = StringIO()
+        await run_batch(StringIO('{"input": "x"}\n{"input": "y"}\n'), sink,
+                        BatchRunner(mock_stream_manager, "openai", "m"))
+
+    results = parse_results(sink)
+    assert len(results) == 2
+    assert all(not r["ok"] and "no key" in r["error"] for r in results)
+
+def test_get_batch_workers(monkeypatch):
+    """The worker count comes from the argument, then the environment."""
+    monkeypatch.delenv("MCP_CLI_BATCH_WORKERS", raising=False)
+    assert get_batch_workers() == batch.DEFAULT_BATCH_WORKERS
+    monkeypatch.setenv("MCP_CLI_BATCH_WORKERS", "3")
+    assert get_batch_workers() == 3
+    assert get_batch_workers(5) == 5
+    assert get_batch_workers(0) == 1
+    monkeypatch.setenv("MCP_CLI_BATCH_WORKERS", "many")
+    assert get_batch_workers() == batch.DEFAULT_BATCH_WORKERS
+
+@pytest.mark.asyncio
+async def test_cmd_run_with_batch_file(mock_stream_manager, tmp_path):
+    """cmd_run --batch writes a JSONL result file."""
+    requests_file = tmp_path / "requests.jsonl"
+    requests_file.write_text('{"id": "a", "tool": "tool1", "args": {"x": 1}}\n')
+    output_file = tmp_path / "results.jsonl"
+
+    await cmd.cmd_run(batch=str(requests_file), output=str(output_file), workers=2,
+                      stream_manager=mock_stream_manager)
+
+    results = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert results[0]["id"] == "a" and results[0]["result"] == {"x": 1}
+
+@pytest.mark.asyncio
+async def test_cmd_run_with_missing_batch_file(mock_stream_manager, tmp_path):
+    """A batch file that cannot be read exits with an error."""
+    with pytest.raises(SystemExit):
+        await cmd.cmd_run(batch=str(tmp_path / "missing.jsonl"), stream_manager=mock_stream_manager)
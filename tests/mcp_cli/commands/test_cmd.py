@@ -30,7 +30,7 @@ def mock_stream_manager():
 def mock_llm_client():
     """Create a mock LLM client."""
     mock_client = MagicMock()
-    mock_client.create_completion = MagicMock()
+    mock_client.create_completion = AsyncMock()
     return mock_client
 
 @pytest.mark.asyncio
@@ -343,6 +343,29 @@ async def test_run_llm_with_tools_tool_calls(mock_stream_manager, mock_llm_clien
                     # Check the result
                     assert result == "This is the final response"
 
+@pytest.mark.asyncio
+async def test_run_llm_with_tools_offers_paging_for_large_results(mock_stream_manager, mock_llm_client, tmp_path):
+    """Follow-up completions can page through results cut down to a preview."""
+    from mcp_cli.tool_results import ResultStore, READ_RESULT_TOOL_NAME
+    
+    mock_stream_manager.result_store = ResultStore(max_bytes=100, spill_dir=str(tmp_path))
+    mock_stream_manager.call_tool.return_value = {"isError": False, "content": "x" * 1000}
+    mock_llm_client.create_completion.side_effect = [
+        {"tool_calls": [{"id": "call_1", "function": {"name": "test_tool", "arguments": "{}"}}]},
+        {"response": "Done"},
+    ]
+    
+    with patch("mcp_cli.commands.cmd.get_llm_client", return_value=mock_llm_client):
+        with patch("mcp_cli.commands.cmd.generate_system_prompt", return_value="System prompt"):
+            result = await cmd.run_llm_with_tools(
+                "test-provider", "test-model", "Test input", None, None, mock_stream_manager
+            )
+    
+    assert result == "Done"
+    follow_up = mock_llm_client.create_completion.call_args_list[1][1]
+    assert [tool["function"]["name"] for tool in follow_up["tools"]] == [READ_RESULT_TOOL_NAME]
+    assert READ_RESULT_TOOL_NAME in follow_up["messages"][-1]["content"]
+
 @pytest.mark.asyncio
 async def test_run_llm_with_tools_multiple_tool_calls(mock_stream_manager, mock_llm_client):
     """Test handling of multiple rounds of tool calls."""
@@ -135,7 +135,7 @@ async def test_ping_run(mock_stream_manager, monkeypatch, capsys):
     """Test the ping_run command with the StreamManager."""
     
     # Mock the send_ping function
-    async def mock_send_ping(r_stream, w_stream):
+    async def mock_send_ping(r_stream, w_stream, **kwargs):
         # First server responds successfully, second one fails
         return r_stream == mock_stream_manager.streams[0][0]
     
@@ -172,7 +172,7 @@ async def test_ping_server_not_in_map(mock_stream_manager, monkeypatch, capsys):
     })
     
     # Mock the send_ping function
-    async def mock_send_ping(r_stream, w_stream):
+    async def mock_send_ping(r_stream, w_stream, **kwargs):
         return True  # This should not be called for the missing server
     
     with patch("mcp_cli.commands.ping.send_ping", 
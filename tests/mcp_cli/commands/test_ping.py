@@ -61,7 +61,7 @@ async def test_ping_basic(mock_stream_manager, capsys):
     """Test the ping_run command pings servers correctly."""
     
     # Mock the send_ping function
-    async def mock_send_ping(r_stream, w_stream):
+    async def mock_send_ping(r_stream, w_stream, **kwargs):
         # First server responds successfully, second one fails
         return r_stream == mock_stream_manager.streams[0][0]
     
@@ -88,7 +88,7 @@ async def test_ping_all_up(mock_stream_manager, capsys):
     """Test the ping_run command when all servers are up."""
     
     # Mock the send_ping function to return True for all servers
-    async def mock_send_ping(r_stream, w_stream):
+    async def mock_send_ping(r_stream, w_stream, **kwargs):
         return True
     
     with patch("mcp_cli.commands.ping.send_ping", 
@@ -109,7 +109,7 @@ async def test_ping_all_down(mock_stream_manager, capsys):
     """Test the ping_run command when all servers are down."""
     
     # Mock the send_ping function to return False for all servers
-    async def mock_send_ping(r_stream, w_stream):
+    async def mock_send_ping(r_stream, w_stream, **kwargs):
         return False
     
     with patch("mcp_cli.commands.ping.send_ping", 
@@ -130,7 +130,7 @@ async def test_ping_error_handling(mock_stream_manager, capsys):
     """Test the ping_run command handles errors gracefully."""
     
     # Mock the send_ping function to raise an exception
-    async def mock_send_ping(r_stream, w_stream):
+    async def mock_send_ping(r_stream, w_stream, **kwargs):
         if r_stream == mock_stream_manager.streams[0][0]:
             return True
         else:
@@ -158,7 +158,7 @@ async def test_ping_no_servers(capsys):
     empty_manager.streams = []
     
     # Mock the send_ping function (should not be called)
-    async def mock_send_ping(r_stream, w_stream):
+    async def mock_send_ping(r_stream, w_stream, **kwargs):
         # This should never be called
         assert False, "send_ping should not be called with no servers"
         return False
@@ -172,4 +172,59 @@ async def test_ping_no_servers(capsys):
         captured = capsys.readouterr()
         
         # Check that the pinging message is still displayed
-        assert "Pinging Servers" in captured.out
\ No newline at end of file
+        assert "Pinging Servers" in captured.out
+@pytest.mark.asyncio
+async def test_ping_servers_concurrently_with_timeout(mock_stream_manager, monkeypatch, capsys):
+    """A hung server is reported after the timeout without holding up the others."""
+    monkeypatch.setenv("MCP_CLI_SERVER_QUERY_TIMEOUT", "0.2")
+    started = []
+    
+    async def mock_send_ping(r_stream, w_stream, **kwargs):
+        started.append(r_stream)
+        if r_stream == mock_stream_manager.streams[0][0]:
+            # The first server hangs
+            await asyncio.sleep(10)
+        return True
+    
+    with patch("mcp_cli.commands.ping.send_ping", 
+               new=mock_send_ping):
+        loop = asyncio.get_running_loop()
+        begin = loop.time()
+        await ping.ping_run(mock_stream_manager)
+        elapsed = loop.time() - begin
+        
+        captured = capsys.readouterr()
+        
+        # Both servers were pinged at once, and the command took about one timeout
+        assert len(started) == 2
+        assert elapsed < 1
+        assert "TestServer1 failed to respond within 0.2s" in captured.out
+        assert "TestServer2 is up!" in captured.out
+        
+        # Results are shown in server order
+        assert captured.out.index("TestServer1") < captured.out.index("TestServer2") < captured.out.index("FailedServer")
+
+@pytest.mark.asyncio
+async def test_ping_uses_stream_manager_health_checks(monkeypatch, capsys):
+    """A StreamManager's servers are pinged through ping_server, which records their health."""
+    from mcp_cli.stream_manager import StreamManager
+    from mcp_cli.health import HealthMonitor
+    
+    sent = []
+    async def fake_send_ping(read_stream, write_stream, timeout=5.0, retries=3):
+        sent.append((timeout, retries))
+        return True
+    monkeypatch.setattr("mcp_cli.stream_manager.send_ping", fake_send_ping)
+    
+    manager = StreamManager()
+    manager.health = HealthMonitor(timeout=2)
+    manager.streams = [("read", "write")]
+    manager.server_streams_map = {"a": 0}
+    manager.server_info = [{"id": 1, "name": "a", "tools": 1, "status": "Connected"}]
+    
+    with patch("mcp_cli.commands.ping.send_ping", side_effect=AssertionError("raw ping")):
+        await ping.ping_run(manager)
+    
+    assert sent == [(2, 1)]
+    assert manager.health.report("a")["checks"] == 1
+    assert "a is up!" in capsys.readouterr().out
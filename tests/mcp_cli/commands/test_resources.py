@@ -183,4 +183,25 @@ async def test_resources_list_with_custom_server_names(mock_stream_manager, caps
         assert "TestServer1" in captured.out
         assert "TestServer2" in captured.out
         assert "CustomServer1" not in captured.out
-        assert "CustomServer2" not in captured.out
\ No newline at end of file
+        assert "CustomServer2" not in captured.out
+@pytest.mark.asyncio
+async def test_resources_list_queries_servers_concurrently(mock_stream_manager, capsys):
+    """Servers are queried at once and shown in server order."""
+    release = asyncio.Event()
+    waiting = []
+    
+    async def mock_send_resources_list(r_stream, w_stream):
+        waiting.append(r_stream)
+        if len(waiting) == 2:
+            release.set()
+        # Neither server answers until both have been asked
+        await asyncio.wait_for(release.wait(), timeout=1)
+        name = "first" if r_stream == mock_stream_manager.streams[0][0] else "second"
+        return {"resources": [f"{name}-resource"]}
+    
+    with patch("mcp_cli.commands.resources.send_resources_list", 
+               new=mock_send_resources_list):
+        await resources.resources_list(mock_stream_manager)
+        
+        captured = capsys.readouterr()
+        assert captured.out.index("- first-resource") < captured.out.index("- second-resource")
@@ -8,7 +8,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 # Enable asyncio tests
 pytest_plugins = ['pytest_asyncio']
 
-from mcp_cli.llm.tools_handler import handle_tool_call, convert_to_openai_tools
+from mcp_cli.llm.tools_handler import (
+    handle_tool_call, convert_to_openai_tools, get_tool_payload, clear_tool_payloads, tools_fingerprint
+)
 
 class TestHandleToolCall:
     """Tests for the handle_tool_call function."""
@@ -287,4 +289,26 @@ class TestConvertToOpenAITools:
         # Verify results - namespaced names should be preserved
         assert len(result) == 2
         assert result[0]["function"]["name"] == "Server1_tool1"
-        assert result[1]["function"]["name"] == "Server2_tool2"
\ No newline at end of file
+        assert result[1]["function"]["name"] == "Server2_tool2"
+
+class TestToolPayload:
+    """Tests for the cached tool payloads."""
+
+    TOOLS = [
+        {"name": "tool1", "description": "First tool", "inputSchema": {"type": "object"}},
+        {"name": "tool2", "description": "Second tool", "inputSchema": {"type": "object"}},
+    ]
+
+    def setup_method(self):
+        clear_tool_payloads()
+
+    def test_payload_is_built_once_per_tool_set(self):
+        payload = get_tool_payload(self.TOOLS)
+        assert get_tool_payload([dict(tool) for tool in self.TOOLS]) is payload
+        assert payload.tools == convert_to_openai_tools(self.TOOLS)
+
+    def test_changed_tool_set_gets_new_payload(self):
+        payload = get_tool_payload(self.TOOLS)
+        changed = self.TOOLS + [{"name": "tool3"}]
+        assert tools_fingerprint(changed) != payload.fingerprint
+        assert get_tool_payload(changed) is not payload
@@ -0,0 +1,70 @@
+"""
+Tests for single-pass Ollama streaming with tool call detection.
+"""
+import pytest
+
+from mcp_cli.llm.providers.ollama_client import OllamaLLMClient
+
+class FakeAsyncClient:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.calls = []
+
+    async def chat(self, **kwargs):
+        self.calls.append(kwargs)
+        async def stream():
+            for chunk in self.chunks:
+                yield chunk
+        return stream()
+
+@pytest.mark.asyncio
+async def test_stream_chat_yields_content_and_tool_calls():
+    client = OllamaLLMClient(model="test-model")
+    client.async_client = FakeAsyncClient([
+        {"message": {"role": "assistant", "content": "Let me check. "}},
+        {"message": {"role": "assistant", "content": "", "tool_calls": [
+            {"function": {"name": "get_weather", "arguments": {"location": "Paris"}}}
+        ]}},
+        {"message": {"role": "assistant", "content": ""}, "done": True},
+    ])
+    tools = [{"type": "function", "function": {"name": "get_weather"}}]
+
+    events = [event async for event in client.stream_chat([{"role": "user", "content": "Weather?"}], tools)]
+
+    # One streaming request carries both the text and the tool call.
+    assert len(client.async_client.calls) == 1
+    assert client.async_client.calls[0]["stream"] is True
+    assert client.async_client.calls[0]["tools"] == tools
+
+    assert events[0] == {"content": "Let me check. "}
+    tool_call = events[1]["tool_call"]
+    assert tool_call["function"] == {"name": "get_weather", "arguments": '{"location": "Paris"}'}
+    assert tool_call["id"].startswith("call_get_weather_")
+    assert len(events) == 2
+
+@pytest.mark.asyncio
+async def test_models_without_function_calling_get_a_tool_index(monkeypatch):
+    from mcp_cli.chat.chat_context import ChatContext
+
+    class StreamManager:
+        tool_to_server_map = {"get_weather": "weather"}
+
+        def get_all_tools(self):
+            return [{"name": "get_weather", "description": "Current weather\nIn Celsius"}]
+
+        def get_internal_tools(self):
+            return self.get_all_tools()
+
+        def get_server_info(self):
+            return []
+
+    monkeypatch.setenv("OLLAMA_NATIVE_TOOLS", "0")
+    client = OllamaLLMClient(model="gemma")
+    assert client.supports_native_tools is False
+    monkeypatch.setattr("mcp_cli.chat.chat_context.get_llm_client", lambda provider, model: client)
+
+    context = ChatContext(stream_manager=StreamManager(), provider="ollama", model="gemma")
+    await context.initialize()
+
+    assert "- get_weather(): Current weather" in context.conversation_history[0]["content"]
+    assert context.openai_tools == []
@@ -0,0 +1,193 @@
+"""
+Tests for the async OpenAI provider.
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from mcp_cli.llm.providers import openai_client
+from mcp_cli.llm.providers.openai_client import OpenAILLMClient, get_shared_http_client
+
+@pytest.fixture(autouse=True)
+def fresh_pool(monkeypatch):
+    """Give each test its own set of shared HTTP clients."""
+    monkeypatch.setattr(openai_client, "_shared_http_clients", {})
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.delenv("OPENAI_API_BASE", raising=False)
+
+def make_response(content=None, tool_calls=None):
+    message = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+def test_clients_share_one_connection_pool():
+    first = OpenAILLMClient(model="gpt-4o-mini")
+    second = OpenAILLMClient(model="gpt-4o")
+    assert first.client._client is second.client._client
+
+    # Different pool limits get a separate pool.
+    third = OpenAILLMClient(model="gpt-4o", max_connections=5)
+    assert third.client._client is not first.client._client
+    assert get_shared_http_client(max_connections=5) is third.client._client
+
+def test_pool_limits_from_environment(monkeypatch):
+    monkeypatch.setenv("OPENAI_MAX_CONNECTIONS", "7")
+    assert get_shared_http_client() is get_shared_http_client(max_connections=7)
+
+@pytest.mark.asyncio
+async def test_create_completion_is_awaitable():
+    client = OpenAILLMClient()
+    tool_call = SimpleNamespace(
+        id="call_1",
+        function=SimpleNamespace(name="get_weather", arguments='{"location": "Paris"}')
+    )
+    client.client.chat.completions.create = AsyncMock(return_value=make_response("Checking", [tool_call]))
+
+    result = await client.create_completion(messages=[{"role": "user", "content": "Weather?"}])
+
+    assert result["response"] == "Checking"
+    assert result["tool_calls"] == [{
+        "id": "call_1",
+        "function": {"name": "get_weather", "arguments": json.dumps({"location": "Paris"})},
+    }]
+
+@pytest.mark.asyncio
+async def test_create_completion_does_not_block_event_loop():
+    client = OpenAILLMClient()
+
+    async def slow_create(**kwargs):
+        await asyncio.sleep(0.1)
+        return make_response("done")
+    client.client.chat.completions.create = slow_create
+
+    ticks = 0
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    result = await client.create_completion(messages=[])
+    ticker_task.cancel()
+
+    assert result["response"] == "done"
+    assert ticks >= 5
+
+def make_chunk(content=None, tool_calls=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+def fragment(index, id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments))
+
+@pytest.mark.asyncio
+async def test_stream_chat_assembles_tool_calls_incrementally():
+    client = OpenAILLMClient()
+    chunks = [
+        make_chunk(content="Checking "),
+        make_chunk(content="both."),
+        make_chunk(tool_calls=[fragment(0, id="call_a", name="get_weather", arguments="")]),
+        make_chunk(tool_calls=[fragment(0, arguments='{"loc')]),
+        make_chunk(tool_calls=[fragment(0, arguments='ation": "Paris"}')]),
+        make_chunk(tool_calls=[fragment(1, id="call_b", name="get_time", arguments="{}")]),
+        make_chunk(),
+    ]
+    seen_before_yield = []
+
+    async def stream():
+        for i, chunk in enumerate(chunks):
+            seen_before_yield.append(i)
+            yield chunk
+
+    client.client.chat.completions.create = AsyncMock(return_value=stream())
+
+    events = []
+    async for event in client.stream_chat(messages=[], tools=[{"type": "function"}]):
+        events.append((len(seen_before_yield), event))
+
+    assert client.client.chat.completions.create.call_args.kwargs["stream"] is True
+    assert [e for _, e in events[:2]] == [{"content": "Checking "}, {"content": "both."}]
+
+    # The first call is reported as soon as the second one starts, before the stream ends.
+    consumed, first_call = events[2]
+    assert consumed == 6
+    assert first_call == {"tool_call": {
+        "id": "call_a",
+        "function": {"name": "get_weather", "arguments": json.dumps({"location": "Paris"})},
+    }}
+    assert events[3][1]["tool_call"]["function"] == {"name": "get_time", "arguments": "{}"}
+    assert len(events) == 4
+
+def make_usage(prompt_tokens, cached_tokens, completion_tokens):
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens),
+    )
+
+@pytest.mark.asyncio
+async def test_create_completion_reports_cached_prompt_tokens():
+    client = OpenAILLMClient()
+    response = make_response("hi")
+    response.usage = make_usage(2048, 1536, 12)
+    client.client.chat.completions.create = AsyncMock(return_value=response)
+
+    result = await client.create_completion(messages=[])
+
+    assert result["usage"] == {
+        "prompt_tokens": 2048,
+        "cached_prompt_tokens": 1536,
+        "uncached_prompt_tokens": 512,
+        "completion_tokens": 12,
+    }
+
+@pytest.mark.asyncio
+async def test_stream_chat_reports_usage_last():
+    client = OpenAILLMClient()
+    usage_chunk = SimpleNamespace(choices=[], usage=make_usage(100, 0, 3))
+
+    async def stream():
+        yield make_chunk(content="Hi")
+        yield usage_chunk
+
+    client.client.chat.completions.create = AsyncMock(return_value=stream())
+
+    events = [event async for event in client.stream_chat(messages=[])]
+
+    assert client.client.chat.completions.create.call_args.kwargs["stream_options"] == {"include_usage": True}
+    assert events[0] == {"content": "Hi"}
+    assert events[-1]["usage"]["uncached_prompt_tokens"] == 100
+
+@pytest.mark.asyncio
+async def test_stream_chat_omits_stream_options_for_compatible_servers():
+    client = OpenAILLMClient(api_base="http://localhost:8000/v1")
+
+    async def stream():
+        yield make_chunk(content="Hi")
+
+    client.client.chat.completions.create = AsyncMock(return_value=stream())
+
+    events = [event async for event in client.stream_chat(messages=[])]
+
+    assert "stream_options" not in client.client.chat.completions.create.call_args.kwargs
+    assert events == [{"content": "Hi"}]
+    assert OpenAILLMClient(api_base="https://api.openai.com/v1").is_official_endpoint
+
+@pytest.mark.asyncio
+async def test_shared_clients_are_per_event_loop_and_closed():
+    from mcp_cli.llm.llm_client import close_llm_clients
+
+    # A client created outside this loop is not reused inside it
+    outside = httpx.AsyncClient()
+    openai_client._shared_http_clients[(None, 1, 1, 1.0)] = outside
+    inside = get_shared_http_client(max_connections=1, max_keepalive_connections=1, keepalive_expiry=1.0)
+    assert inside is not outside
+    assert get_shared_http_client(max_connections=1, max_keepalive_connections=1, keepalive_expiry=1.0) is inside
+
+    await close_llm_clients()
+    assert inside.is_closed and outside.is_closed
+    assert openai_client._shared_http_clients == {}
@@ -0,0 +1,37 @@
+from mcp_cli.llm.request_builder import RequestBuilder, PromptUsage, make_usage
+
+def tool(name):
+    return {"type": "function", "function": {"name": name, "parameters": {}}}
+
+def names(tools):
+    return [t["function"]["name"] for t in tools]
+
+def test_tools_are_sorted_by_name():
+    builder = RequestBuilder()
+    assert names(builder.order_tools([tool("zeta"), tool("alpha"), tool("mid")])) == ["alpha", "mid", "zeta"]
+
+def test_only_the_turns_selection_is_sent():
+    builder = RequestBuilder()
+    first = builder.order_tools([tool("weather"), tool("search"), tool("read_file")])
+    # A later turn selects fewer tools: earlier selections are not carried over
+    second = builder.order_tools([tool("search")])
+    assert names(first) == ["read_file", "search", "weather"]
+    assert names(second) == ["search"]
+    assert names(builder.tools) == ["search"]
+
+def test_same_selection_gives_the_same_request():
+    builder = RequestBuilder()
+    assert builder.order_tools([tool("b"), tool("a")]) == builder.order_tools([tool("a"), tool("b")])
+
+def test_prompt_usage_totals():
+    usage = PromptUsage()
+    usage.record(make_usage(1000, 0, 10))
+    usage.record(make_usage(1200, 1000, 20))
+    usage.record(None)
+
+    assert usage.requests == 2
+    assert usage.prompt_tokens == 2200
+    assert usage.cached_prompt_tokens == 1000
+    assert usage.uncached_prompt_tokens == 1200
+    assert usage.completion_tokens == 30
+    assert round(usage.cache_hit_rate, 3) == round(1000 / 2200, 3)
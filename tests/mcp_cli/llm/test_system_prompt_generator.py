@@ -0,0 +1,60 @@
+import json
+
+from mcp_cli.llm.system_prompt_generator import (
+    SystemPromptGenerator, TOOL_FORMAT_NATIVE, TOOL_FORMAT_INDEX
+)
+from mcp_cli.chat.system_prompt import generate_system_prompt
+
+TOOLS = [
+    {
+        "name": "sqlite_read_query",
+        "description": "Run a SELECT query.\nReturns rows as JSON.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"query": {"type": "string"}, "limit": {"type": "integer"}},
+            "required": ["query"],
+        },
+    },
+    {"name": "list_tables", "description": "List all tables", "inputSchema": {}},
+]
+
+def test_json_format_embeds_schemas():
+    prompt = SystemPromptGenerator().generate_prompt({"tools": TOOLS})
+    assert json.dumps({"tools": TOOLS}, indent=2) in prompt
+
+def test_native_format_omits_schemas():
+    prompt = SystemPromptGenerator().generate_prompt({"tools": TOOLS}, tool_format=TOOL_FORMAT_NATIVE)
+    assert "sqlite_read_query" not in prompt
+    assert "inputSchema" not in prompt
+
+def test_index_format_lists_one_line_per_tool():
+    prompt = SystemPromptGenerator().generate_prompt({"tools": TOOLS}, tool_format=TOOL_FORMAT_INDEX)
+    assert "- sqlite_read_query(query, limit?): Run a SELECT query." in prompt
+    assert "- list_tables(): List all tables" in prompt
+    assert "Returns rows as JSON." not in prompt
+    assert "inputSchema" not in prompt
+
+def test_generate_system_prompt_modes():
+    native = generate_system_prompt(TOOLS)
+    indexed = generate_system_prompt(TOOLS, native_tools=False)
+    assert "sqlite_read_query" not in native
+    assert "sqlite_read_query(query, limit?)" in indexed
+
+def test_generate_system_prompt_is_cached(monkeypatch):
+    import mcp_cli.chat.system_prompt as system_prompt
+
+    builds = []
+    real_build = system_prompt._build_system_prompt
+    monkeypatch.setattr(system_prompt, "_prompt_cache", {})
+    monkeypatch.setattr(
+        system_prompt, "_build_system_prompt",
+        lambda tools, native_tools: builds.append(native_tools) or real_build(tools, native_tools)
+    )
+
+    first = generate_system_prompt(TOOLS, native_tools=False)
+    assert generate_system_prompt(list(TOOLS), native_tools=False) is first
+    generate_system_prompt(TOOLS[:1], native_tools=False)
+    # The native prompt does not depend on the tools
+    generate_system_prompt(TOOLS)
+    generate_system_prompt(TOOLS[:1])
+    assert builds == [False, False, True]
@@ -0,0 +1,68 @@
+"""
+Tests for the tabular tool result encoder.
+"""
+import json
+
+from mcp_cli.llm.table_encoder import (
+    SUMMARY_MIN_ROWS,
+    encode_table,
+    encode_tabular_content,
+    is_tabular,
+    parse_rows,
+)
+from mcp_cli.llm.tools_handler import format_tool_response
+
+ROWS = [
+    {"id": 1, "name": "Widget", "price": 2.5},
+    {"id": 2, "name": "Gadget, large", "price": 10.0},
+]
+
+def test_is_tabular():
+    assert is_tabular(ROWS)
+    assert not is_tabular(ROWS[:1])
+    assert not is_tabular([{"id": 1}, {"name": "x"}])
+    assert not is_tabular([{"id": 1, "tags": ["a"]}, {"id": 2, "tags": []}])
+    assert not is_tabular([{"type": "text", "text": "a"}, {"type": "text", "text": "b"}])
+    assert not is_tabular({"id": 1})
+
+def test_parse_rows_json_and_python_literals():
+    assert parse_rows(json.dumps(ROWS)) == ROWS
+    assert parse_rows(str(ROWS)) == ROWS
+    assert parse_rows("not a table") is None
+    assert parse_rows("[1, 2, 3]") is None
+
+def test_encode_table_writes_header_once():
+    encoded = encode_table(ROWS)
+    assert encoded.startswith("Table: 2 rows x 3 columns")
+    assert "id,name,price\n1,Widget,2.5\n2,\"Gadget, large\",10.0" in encoded
+    assert "Summary statistics" not in encoded
+
+def test_encode_table_keeps_values_exact():
+    rows = [
+        {"id": 9007199254740993, "n": 1, "label": None},
+        {"id": None, "n": 3, "label": ""},
+        {"id": 7, "n": None, "label": "NA"},
+    ]
+    encoded = encode_table(rows)
+    assert 'id,n,label\n9007199254740993,1,\n,3,""\n7,,NA' in encoded
+    assert "9007199254740992" not in encoded and "3.0" not in encoded
+
+def test_large_tables_get_summary_before_rows():
+    rows = [{"id": i, "group": "a" if i % 3 else "b"} for i in range(SUMMARY_MIN_ROWS + 10)]
+    encoded = encode_table(rows)
+    assert encoded.index("Summary statistics") < encoded.index("Rows (CSV)")
+    assert f"id,{len(rows)},{(len(rows) - 1) / 2:.6g}" in encoded
+    assert f"group,{len(rows)},,,,,2,a" in encoded
+    assert len(encoded) < len(json.dumps(rows, indent=2)) / 2
+
+def test_encode_tabular_content_from_text_item():
+    encoded = encode_tabular_content([{"type": "text", "text": str(ROWS)}])
+    assert encoded is not None and "id,name,price" in encoded
+    assert encode_tabular_content([{"type": "text", "text": "hello"}]) is None
+    assert encode_tabular_content({"id": 1}) is None
+
+def test_format_tool_response_encodes_rows():
+    result = format_tool_response(ROWS)
+    assert result.startswith("Table: 2 rows x 3 columns")
+    # Text records are still joined as before
+    assert format_tool_response([{"type": "text", "text": "a"}, {"type": "text", "text": "b"}]) == "a\nb"
@@ -0,0 +1,32 @@
+from mcp_cli.llm.token_estimator import (
+    TokenEstimator, estimate_message_tokens, estimate_messages_tokens, estimate_text_tokens,
+    MESSAGE_OVERHEAD_TOKENS
+)
+
+def test_text_estimate_rounds_up():
+    assert estimate_text_tokens("") == 0
+    assert estimate_text_tokens("abcd") == 1
+    assert estimate_text_tokens("abcde") == 2
+
+def test_message_estimate_counts_tool_calls():
+    plain = estimate_message_tokens({"role": "assistant", "content": None})
+    with_call = estimate_message_tokens({"role": "assistant", "content": None, "tool_calls": [
+        {"id": "1", "type": "function", "function": {"name": "read_file", "arguments": '{"path": "/tmp/x"}'}}
+    ]})
+    assert plain == MESSAGE_OVERHEAD_TOKENS
+    assert with_call > plain
+
+def test_estimator_is_incremental_and_detects_rewrites():
+    history = [{"role": "system", "content": "s" * 40}, {"role": "user", "content": "u" * 40}]
+    estimator = TokenEstimator()
+    assert estimator.update(history) == estimate_messages_tokens(history)
+
+    history.append({"role": "assistant", "content": "a" * 400})
+    assert estimator.update(history) == estimate_messages_tokens(history)
+
+    # Rewriting the middle of the history forces a full recount
+    history[1:3] = [{"role": "assistant", "content": "summary"}]
+    assert estimator.update(history) == estimate_messages_tokens(history)
+
+    history.clear()
+    assert estimator.update(history) == 0
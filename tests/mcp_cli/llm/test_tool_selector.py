@@ -0,0 +1,56 @@
+from mcp_cli.llm.tool_selector import (
+    ToolSelector, tokenize, used_tool_names, latest_user_message
+)
+
+TOOLS = [
+    {"name": "sqlite_read_query", "description": "Execute a SELECT query on the SQLite database",
+     "inputSchema": {"properties": {"query": {"type": "string"}}}},
+    {"name": "sqlite_list_tables", "description": "List all tables in the SQLite database"},
+    {"name": "fs_readFile", "description": "Read the complete contents of a file",
+     "inputSchema": {"properties": {"path": {"type": "string"}}}},
+    {"name": "fs_write_file", "description": "Create or overwrite a file",
+     "inputSchema": {"properties": {"path": {"type": "string"}, "content": {"type": "string"}}}},
+    {"name": "weather_forecast", "description": "Get the weather forecast for a city",
+     "inputSchema": {"properties": {"city": {"type": "string"}}}},
+]
+
+def names(tools):
+    return [tool["name"] for tool in tools]
+
+def test_tokenize_splits_identifiers():
+    assert tokenize("fs_readFile") == ["fs", "read", "file", "readfile"]
+
+def test_select_ranks_by_relevance():
+    selector = ToolSelector(TOOLS, top_k=1)
+    assert names(selector.select("what's the weather in Paris?")) == ["weather_forecast"]
+    assert names(selector.select("which tables are in the database")) == ["sqlite_list_tables"]
+
+def test_select_matches_schema_property_names():
+    selector = ToolSelector(TOOLS, top_k=1)
+    assert names(selector.select("city")) == ["weather_forecast"]
+
+def test_select_includes_used_tools_in_original_order():
+    selector = ToolSelector(TOOLS, top_k=1)
+    selected = selector.select("weather in Paris", used_tools=["sqlite_read_query"])
+    assert names(selected) == ["sqlite_read_query", "weather_forecast"]
+
+def test_select_returns_everything_when_small_or_disabled():
+    assert names(ToolSelector(TOOLS, top_k=10).select("weather")) == names(TOOLS)
+    assert names(ToolSelector(TOOLS, top_k=0).select("weather")) == names(TOOLS)
+
+def test_top_k_from_environment(monkeypatch):
+    monkeypatch.setenv("MCP_CLI_TOOL_TOP_K", "2")
+    assert ToolSelector(TOOLS).top_k == 2
+
+def test_conversation_helpers():
+    history = [
+        {"role": "system", "content": "prompt"},
+        {"role": "user", "content": "first"},
+        {"role": "assistant", "content": None, "tool_calls": [
+            {"id": "1", "type": "function", "function": {"name": "fs_readFile", "arguments": "{}"}}
+        ]},
+        {"role": "tool", "name": "fs_readFile", "content": "data", "tool_call_id": "1"},
+        {"role": "user", "content": "second"},
+    ]
+    assert used_tool_names(history) == ["fs_readFile"]
+    assert latest_user_message(history) == "second"
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from mcp_cli.admission import AdmissionControl, ConcurrencyLimit, ServerBusyError
+from mcp_cli.stream_manager import StreamManager
+
+def test_from_config_limits():
+    config = {
+        "concurrency": {"maxConcurrent": 4, "maxQueue": 10},
+        "mcpServers": {
+            "sqlite": {"command": "uvx", "concurrency": {"maxConcurrent": 1, "maxQueue": 2}},
+            "time": {"command": "uvx"},
+            "bad": {"command": "uvx", "concurrency": {"maxQueue": "many"}},
+        },
+    }
+    admission = AdmissionControl.from_config(config, {"db": "sqlite", "time": "time", "bad": "bad"})
+
+    assert (admission.limit("db").max_concurrent, admission.limit("db").max_queue) == (1, 2)
+    assert (admission.limit("time").max_concurrent, admission.limit("time").max_queue) == (4, 10)
+    assert (admission.limit("bad").max_concurrent, admission.limit("bad").max_queue) == (4, 10)
+
+@pytest.mark.asyncio
+async def test_limit_queues_then_rejects():
+    limit = ConcurrencyLimit(max_concurrent=1, max_queue=1)
+    release = asyncio.Event()
+    order = []
+
+    async def call(name):
+        async with limit.slot():
+            order.append(name)
+            await release.wait()
+
+    first = asyncio.create_task(call("first"))
+    second = asyncio.create_task(call("second"))
+    await asyncio.sleep(0)
+    assert limit.stats()["active"] == 1
+    assert limit.stats()["queued"] == 1
+
+    with pytest.raises(ServerBusyError):
+        await call("third")
+
+    release.set()
+    await asyncio.gather(first, second)
+    stats = limit.stats()
+    assert order == ["first", "second"]
+    assert (stats["admitted"], stats["rejected"], stats["peak_queued"]) == (2, 1, 1)
+    assert (stats["active"], stats["queued"]) == (0, 0)
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    limit = ConcurrencyLimit(max_concurrent=1, max_queue=1)
+    release = asyncio.Event()
+
+    async def call():
+        async with limit.slot():
+            await release.wait()
+
+    running = asyncio.create_task(call())
+    waiting = asyncio.create_task(call())
+    await asyncio.sleep(0)
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+    assert limit.stats()["queued"] == 0
+
+    release.set()
+    await running
+    assert limit.stats()["admitted"] == 1
+
+@pytest.mark.asyncio
+async def test_stream_manager_rejects_calls_when_queue_is_full(monkeypatch):
+    release = asyncio.Event()
+
+    async def fake_send_tools_call(read_stream, write_stream, name, arguments, **kwargs):
+        await release.wait()
+        return {"isError": False, "content": f"{name} {arguments}"}
+
+    monkeypatch.setattr("mcp_cli.stream_manager.send_tools_call", fake_send_tools_call)
+
+    manager = StreamManager()
+    manager.admission = AdmissionControl({"sandbox": (1, 1)})
+    manager.streams = [("read", "write")]
+    manager.server_streams_map = {"sandbox": 0}
+    manager.namespaced_tool_map = {"sandbox_run": "run"}
+
+    running = asyncio.create_task(manager.call_tool("sandbox_run", {"code": 1}))
+    queued = asyncio.create_task(manager.call_tool("sandbox_run", {"code": 2}))
+    await asyncio.sleep(0.01)
+
+    rejected = await manager.call_tool("sandbox_run", {"code": 3})
+    assert rejected["isError"]
+    assert "busy" in rejected["error"]
+
+    release.set()
+    results = await asyncio.gather(running, queued)
+    assert not any(result.get("isError") for result in results)
+    assert manager.get_queue_stats()["sandbox"]["rejected"] == 1
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from chuk_mcp.mcp_client.messages.json_rpc_message import JSONRPCMessage
+from chuk_mcp.mcp_client.messages.ping.send_messages import send_ping
+
+from mcp_cli.daemon import AttachedStreamManager, DaemonConnection, DaemonError, DaemonServer, stop_daemon
+from mcp_cli.deadlines import ToolDeadlines
+from mcp_cli.stream_manager import StreamManager
+
+class EchoReadStream:
+    """Fake server read side answering the last request written."""
+
+    def __init__(self, write_stream):
+        self.write_stream = write_stream
+
+    async def receive(self):
+        request = self.write_stream.sent[-1]
+        return JSONRPCMessage(id=request.id, result={"method": request.method})
+
+class RecordingWriteStream:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(message)
+
+def make_manager(monkeypatch):
+    async def fake_send_tools_call(read_stream, write_stream, name, arguments, **kwargs):
+        return {"isError": False, "content": [{"type": "text", "text": f"{name} {arguments}"}]}
+
+    monkeypatch.setattr("mcp_cli.stream_manager.send_tools_call", fake_send_tools_call)
+    manager = StreamManager()
+    write_stream = RecordingWriteStream()
+    manager.streams = [(EchoReadStream(write_stream), write_stream)]
+    manager.client_contexts = [None]
+    manager.server_streams_map = {"sqlite": 0}
+    manager.server_info = [{"id": 1, "name": "sqlite", "tools": 1, "status": "Connected"}]
+    manager._add_server_tools("sqlite", [{"name": "list_tables", "description": "List tables"}])
+    return manager, write_stream
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "daemon.sock")
+
+@pytest.mark.asyncio
+async def test_attached_commands_use_the_daemons_servers(monkeypatch, socket_path):
+    manager, write_stream = make_manager(monkeypatch)
+    daemon = DaemonServer(manager, "server_config.json", ["sqlite"], socket_path)
+    await daemon.start()
+    serving = asyncio.create_task(daemon.serve_forever())
+
+    try:
+        attached = await AttachedStreamManager.attach("server_config.json", ["sqlite"], socket_path)
+        assert attached is not None
+        assert [tool["name"] for tool in attached.get_all_tools()] == ["list_tables"]
+        assert attached.get_server_for_tool("list_tables") == "sqlite"
+
+        # Tool calls go through the daemon's StreamManager
+        result = await attached.call_tool("list_tables", {"schema": "main"})
+        assert result["content"][0]["text"] == "list_tables {'schema': 'main'}"
+
+        # Stream pairs forward JSON-RPC requests to the server
+        server_index = attached.server_streams_map["sqlite"]
+        read_stream, write = attached.streams[server_index]
+        assert await send_ping(read_stream, write, timeout=1, retries=1)
+        assert write_stream.sent[-1].method == "ping"
+        await attached.close()
+
+        # A daemon serving other servers or another config is not used
+        assert await AttachedStreamManager.attach("server_config.json", ["time"], socket_path) is None
+        assert await AttachedStreamManager.attach("other_config.json", ["sqlite"], socket_path) is None
+    finally:
+        daemon.stop()
+        await serving
+    assert not os.path.exists(socket_path)
+
+@pytest.mark.asyncio
+async def test_socket_lifecycle(monkeypatch, socket_path):
+    manager, _ = make_manager(monkeypatch)
+
+    # A socket left behind by a crashed daemon is replaced
+    open(socket_path, "w").close()
+    daemon = DaemonServer(manager, "server_config.json", ["sqlite"], socket_path)
+    await daemon.start()
+    serving = asyncio.create_task(daemon.serve_forever())
+    assert oct(os.stat(socket_path).st_mode & 0o777) == "0o600"
+
+    # Only one daemon listens on a socket
+    with pytest.raises(RuntimeError):
+        await DaemonServer(manager, "server_config.json", ["sqlite"], socket_path).start()
+
+    assert await stop_daemon(socket_path)
+    await asyncio.wait_for(serving, timeout=1)
+    assert not os.path.exists(socket_path)
+    assert not await stop_daemon(socket_path)
+
+@pytest.mark.asyncio
+async def test_attach_without_daemon(socket_path):
+    assert await AttachedStreamManager.attach("server_config.json", ["sqlite"], socket_path) is None
+
+@pytest.mark.asyncio
+async def test_attach_refuses_a_daemon_with_stale_server_config(monkeypatch, socket_path, tmp_path):
+    config_file = tmp_path / "server_config.json"
+    config_file.write_text(json.dumps({"mcpServers": {"sqlite": {"command": "uvx", "args": ["mcp-server-sqlite"]}}}))
+    manager, _ = make_manager(monkeypatch)
+    daemon = DaemonServer(manager, str(config_file), ["sqlite"], socket_path)
+    await daemon.start()
+    serving = asyncio.create_task(daemon.serve_forever())
+
+    try:
+        attached = await AttachedStreamManager.attach(str(config_file), ["sqlite"], socket_path)
+        assert attached is not None
+        await attached.close()
+
+        # The daemon's servers were started with the old args
+        config_file.write_text(json.dumps({"mcpServers": {"sqlite": {"command": "uvx", "args": ["--db", "other.db"]}}}))
+        assert await AttachedStreamManager.attach(str(config_file), ["sqlite"], socket_path) is None
+    finally:
+        daemon.stop()
+        await serving
+
+@pytest.mark.asyncio
+async def test_forwarded_requests_have_a_deadline_and_can_be_cancelled(monkeypatch, socket_path):
+    manager, write_stream = make_manager(monkeypatch)
+    cancelled = []
+
+    class HangingReadStream:
+        async def receive(self):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(write_stream.sent[-1].id)
+                raise
+
+    manager.streams = [(HangingReadStream(), write_stream)]
+    manager.deadlines = ToolDeadlines(default=0.1)
+    daemon = DaemonServer(manager, "server_config.json", ["sqlite"], socket_path)
+    await daemon.start()
+    serving = asyncio.create_task(daemon.serve_forever())
+
+    try:
+        connection = await DaemonConnection.open(socket_path)
+        message = {"jsonrpc": "2.0", "id": "ping-1", "method": "ping"}
+        with pytest.raises(DaemonError, match="timed out"):
+            await connection.request("rpc", {"server": "sqlite", "message": message})
+        assert cancelled == ["ping-1"]
+
+        # A client that stops waiting cancels the forwarded request
+        manager.deadlines = ToolDeadlines(default=None)
+        request = asyncio.create_task(
+            connection.request("rpc", {"server": "sqlite", "message": dict(message, id="ping-2")})
+        )
+        await asyncio.sleep(0.05)
+        request.cancel()
+        for _ in range(50):
+            if len(cancelled) == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert cancelled == ["ping-1", "ping-2"]
+        await connection.close()
+    finally:
+        daemon.stop()
+        await serving
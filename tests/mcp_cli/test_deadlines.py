@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from mcp_cli.deadlines import DEFAULT_TOOL_TIMEOUT, ToolDeadlines
+from mcp_cli.stream_manager import StreamManager
+
+def test_deadline_precedence():
+    config = {
+        "toolTimeout": 30,
+        "mcpServers": {
+            "sandbox": {"command": "uv", "timeout": 300, "toolTimeouts": {"list_*": 5, "run": 0}},
+            "time": {"command": "uvx"},
+        },
+    }
+    deadlines = ToolDeadlines.from_config(config, {"sandbox": "sandbox", "time": "time"})
+
+    assert deadlines.deadline("sandbox", "list_files") == 5
+    assert deadlines.deadline("sandbox", "run") is None
+    assert deadlines.deadline("sandbox", "execute") == 300
+    assert deadlines.deadline("time", "now") == 30
+
+def test_default_deadline_from_environment(monkeypatch):
+    monkeypatch.setenv("MCP_CLI_TOOL_TIMEOUT", "0")
+    assert ToolDeadlines.from_config({}, {"time": "time"}).deadline("time", "now") is None
+    monkeypatch.setenv("MCP_CLI_TOOL_TIMEOUT", "soon")
+    assert ToolDeadlines.from_config({}, {"time": "time"}).deadline("time", "now") == DEFAULT_TOOL_TIMEOUT
+
+@pytest.mark.asyncio
+async def test_call_tool_enforces_deadline(monkeypatch):
+    cancelled = asyncio.Event()
+
+    async def hanging_send_tools_call(read_stream, write_stream, name, arguments, **kwargs):
+        assert kwargs == {"timeout": None, "retries": 1}
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr("mcp_cli.stream_manager.send_tools_call", hanging_send_tools_call)
+
+    manager = StreamManager()
+    manager.deadlines = ToolDeadlines(default=None, tools={"search": {"query": 0.05}})
+    manager.streams = [("read", "write")]
+    manager.server_streams_map = {"search": 0}
+    manager.namespaced_tool_map = {"search_query": "query"}
+
+    result = await asyncio.wait_for(manager.call_tool("search_query", {"q": "mcp"}), timeout=5)
+
+    assert result["isError"]
+    assert "timed out after 0.05s" in result["error"]
+    assert cancelled.is_set()
+    assert manager._in_flight["search"] == 0
+    assert manager.get_queue_stats()["search"]["active"] == 0
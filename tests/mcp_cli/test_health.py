@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from mcp_cli.health import HealthMonitor, percentile, format_health, UP, DEGRADED, DOWN, UNKNOWN
+from mcp_cli.stream_manager import StreamManager
+
+def test_percentile_nearest_rank():
+    values = [0.1 * i for i in range(1, 21)]
+    assert percentile(values, 0.5) == pytest.approx(1.0)
+    assert percentile(values, 0.95) == pytest.approx(1.9)
+    assert percentile([], 0.5) is None
+
+def test_states_follow_recent_pings():
+    monitor = HealthMonitor(degraded_latency=0.5, down_after=2)
+    assert monitor.state("db") == UNKNOWN
+
+    monitor.server("db").record_success(0.01)
+    assert monitor.state("db") == UP
+    monitor.server("db").record_failure()
+    assert monitor.state("db") == DEGRADED
+    monitor.server("db").record_failure()
+    assert monitor.state("db") == DOWN
+
+    # A completed call brings it back without adding a round-trip time
+    monitor.server("db").record_success()
+    assert monitor.state("db") == UP
+    assert monitor.report("db")["checks"] == 3
+
+    for _ in range(5):
+        monitor.server("slow").record_success(2.0)
+    assert monitor.state("slow") == DEGRADED
+    assert format_health(monitor.report("slow")) == "degraded (p50 2000 ms, p95 2000 ms, p99 2000 ms)"
+
+def test_from_config():
+    monitor = HealthMonitor.from_config({"healthCheck": {"interval": 10, "timeout": 2, "downAfter": 5}})
+    assert (monitor.interval, monitor.timeout, monitor.down_after) == (10.0, 2.0, 5)
+    assert not HealthMonitor.from_config({"healthCheck": False}).enabled
+    assert HealthMonitor.from_config({"healthCheck": {"interval": "often"}}).enabled
+
+def make_manager():
+    manager = StreamManager()
+    manager.health = HealthMonitor(down_after=1)
+    manager.streams = [("read-a", "write-a"), ("read-b", "write-b"), None]
+    manager.server_streams_map = {"a": 0, "b": 1, "c": 2}
+    manager.server_info = [{"id": i + 1, "name": name, "tools": 1, "status": "Connected"}
+                           for i, name in enumerate("abc")]
+    return manager
+
+@pytest.mark.asyncio
+async def test_check_health_pings_running_servers_at_once(monkeypatch):
+    pinged = []
+    both_waiting = asyncio.Event()
+
+    async def fake_send_ping(read_stream, write_stream, timeout=5.0, retries=3):
+        pinged.append(read_stream)
+        if len(pinged) == 2:
+            both_waiting.set()
+        await asyncio.wait_for(both_waiting.wait(), timeout=1)
+        return read_stream == "read-a"
+
+    monkeypatch.setattr("mcp_cli.stream_manager.send_ping", fake_send_ping)
+    manager = make_manager()
+
+    reports = await manager.check_health()
+
+    # Stopped servers are not started just to be pinged
+    assert sorted(pinged) == ["read-a", "read-b"]
+    assert reports["a"]["state"] == UP
+    assert reports["a"]["latency"]["p50"] is not None
+    assert reports["b"]["state"] == DOWN
+    assert reports["c"]["state"] == UNKNOWN
+    assert manager.get_server_info()[1]["health"]["state"] == DOWN
+
+    # Servers busy with calls are left alone
+    pinged.clear()
+    manager._in_flight["b"] = 1
+    both_waiting.set()
+    await manager.check_health()
+    assert pinged == ["read-a"]
+
+@pytest.mark.asyncio
+async def test_routing_avoids_down_servers(monkeypatch):
+    async def fake_send_tools_call(read_stream, write_stream, name, arguments, **kwargs):
+        return {"isError": False, "content": f"{read_stream} {name}"}
+
+    monkeypatch.setattr("mcp_cli.stream_manager.send_tools_call", fake_send_tools_call)
+    manager = make_manager()
+    manager.namespaced_tool_map = {"a_query": "query", "b_query": "query"}
+    manager.original_to_namespaced = {"query": ["a_query", "b_query"]}
+    manager.original_to_default = {"query": "a_query"}
+
+    manager.health.server("a").record_failure()
+    assert manager.health.state("a") == DOWN
+
+    # An ambiguous tool goes to a server that is still answering
+    result = await manager.call_tool("query", {})
+    assert result["content"] == "read-b query"
+
+    # An explicit call to the down server fails fast
+    result = await manager.call_tool("a_query", {})
+    assert result["isError"]
+    assert "health checks" in result["error"]
@@ -0,0 +1,101 @@
+import asyncio
+
+import anyio
+import pytest
+
+from chuk_mcp.mcp_client.messages.json_rpc_message import JSONRPCMessage
+from chuk_mcp.mcp_client.messages.tools.send_messages import send_tools_call
+
+from mcp_cli.rpc_dispatcher import RpcDispatcher
+
+def make_server_streams():
+    """Return (client_read, client_write, server_read, server_write) memory streams."""
+    to_client_send, to_client_receive = anyio.create_memory_object_stream(10)
+    to_server_send, to_server_receive = anyio.create_memory_object_stream(10)
+    return to_client_receive, to_server_send, to_server_receive, to_client_send
+
+async def reply_in_reverse(server_read, server_write, count):
+    """Fake server: collect `count` requests, then answer them newest first."""
+    requests = [await server_read.receive() for _ in range(count)]
+    for request in reversed(requests):
+        name = request.params["name"]
+        await server_write.send(JSONRPCMessage(id=request.id, result={"content": f"result of {name}"}))
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_get_their_own_responses():
+    client_read, client_write, server_read, server_write = make_server_streams()
+    dispatcher = RpcDispatcher(client_read, client_write)
+    server = asyncio.create_task(reply_in_reverse(server_read, server_write, 3))
+
+    results = await asyncio.gather(*(
+        send_tools_call(dispatcher.read_stream, dispatcher.write_stream, name, {})
+        for name in ("a", "b", "c")
+    ))
+
+    assert [r["content"] for r in results] == ["result of a", "result of b", "result of c"]
+    assert dispatcher.in_flight == 0
+    await server
+    await dispatcher.close()
+
+@pytest.mark.asyncio
+async def test_notifications_are_reported():
+    client_read, client_write, server_read, server_write = make_server_streams()
+    seen = []
+    dispatcher = RpcDispatcher(client_read, client_write, on_notification=lambda m, p: seen.append(m))
+
+    async def server():
+        request = await server_read.receive()
+        await server_write.send(JSONRPCMessage(method="notifications/tools/list_changed"))
+        await server_write.send(JSONRPCMessage(id=request.id, result={"content": "ok"}))
+
+    server_task = asyncio.create_task(server())
+    result = await send_tools_call(dispatcher.read_stream, dispatcher.write_stream, "a", {})
+
+    assert result["content"] == "ok"
+    assert seen == ["notifications/tools/list_changed"]
+    await server_task
+    await dispatcher.close()
+
+@pytest.mark.asyncio
+async def test_closed_stream_fails_waiting_requests():
+    client_read, client_write, server_read, server_write = make_server_streams()
+    lost = []
+    dispatcher = RpcDispatcher(client_read, client_write, on_close=lambda: lost.append(True))
+
+    async def request():
+        await dispatcher.write_stream.send(JSONRPCMessage(id="req-1", method="tools/call", params={}))
+        return await dispatcher.read_stream.receive()
+
+    waiter = asyncio.create_task(request())
+    await server_read.receive()
+
+    # The server goes away without answering.
+    await server_write.aclose()
+    with pytest.raises(ConnectionError):
+        await waiter
+    assert dispatcher.in_flight == 0
+
+    # New requests are refused straight away.
+    with pytest.raises(ConnectionError):
+        await dispatcher.write_stream.send(JSONRPCMessage(id="req-2", method="ping"))
+    await dispatcher.close()
+
+    # The owner hears about the lost connection once; close() does not report it
+    assert lost == [True]
+
+@pytest.mark.asyncio
+async def test_abandoned_request_is_cancelled_on_server():
+    client_read, client_write, server_read, server_write = make_server_streams()
+    dispatcher = RpcDispatcher(client_read, client_write)
+
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.05):
+            await send_tools_call(dispatcher.read_stream, dispatcher.write_stream, "slow", {}, timeout=None, retries=1)
+
+    request = await server_read.receive()
+    cancelled = await asyncio.wait_for(server_read.receive(), timeout=1)
+    assert cancelled.method == "notifications/cancelled"
+    assert cancelled.id is None
+    assert cancelled.params["requestId"] == request.id
+    assert dispatcher.in_flight == 0
+    await dispatcher.close()
@@ -14,7 +14,7 @@ class DummyStreamManager:
         self.close_called = True
 
 # Dummy create function to simulate StreamManager.create.
-async def dummy_create(config_file, servers, server_names):
+async def dummy_create(config_file, servers, server_names, **kwargs):
     # We ignore parameters in this dummy
     return DummyStreamManager()
 
@@ -65,7 +65,7 @@ async def test_run_command_async_success():
     # For this, we redefine dummy_create here and use a mutable container.
     closed_marker = {}
 
-    async def capturing_dummy_create(config_file, servers, server_names):
+    async def capturing_dummy_create(config_file, servers, server_names, **kwargs):
         sm = DummyStreamManager()
         closed_marker["instance"] = sm
         return sm
@@ -116,7 +116,7 @@ async def test_run_command_async_with_exception():
     # We also capture a dummy stream manager instance to verify that close() is still called.
     closed_marker = {}
 
-    async def capturing_dummy_create(config_file, servers, server_names):
+    async def capturing_dummy_create(config_file, servers, server_names, **kwargs):
         sm = DummyStreamManager()
         closed_marker["instance"] = sm
         return sm
@@ -159,3 +159,31 @@ def test_run_command_sync_exception():
     
     result = run_command(dummy_command_fail, config_file, servers, user_specified, extra_params={})
     assert result is False
+
+@pytest.mark.asyncio
+async def test_run_command_async_attaches_to_daemon(monkeypatch):
+    attached = DummyStreamManager()
+    attach_calls = []
+
+    async def fake_attach(config_file, servers, socket_path=None):
+        attach_calls.append(servers)
+        return attached
+
+    async def failing_create(*args, **kwargs):
+        raise AssertionError("servers should not be started when a daemon is attached")
+
+    monkeypatch.setattr("mcp_cli.run_command.AttachedStreamManager.attach", fake_attach)
+    monkeypatch.setattr("mcp_cli.run_command.StreamManager.create", failing_create)
+
+    async def command(stream_manager):
+        return stream_manager
+
+    result = await run_command_async(command, "dummy_config.json", ["ServerA"], ["ServerA"], attach_daemon=True)
+    assert result is attached
+    assert attached.close_called
+    assert attach_calls == [["ServerA"]]
+
+    # Commands that do not opt in never attach
+    monkeypatch.setattr("mcp_cli.run_command.StreamManager.create", dummy_create)
+    await run_command_async(command, "dummy_config.json", ["ServerA"], ["ServerA"])
+    assert len(attach_calls) == 1
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from mcp_cli.single_flight import SingleFlight
+from mcp_cli.stream_manager import StreamManager
+
+def test_from_config_is_opt_in():
+    config = {"mcpServers": {
+        "sqlite": {"command": "uvx", "singleFlight": {"tools": ["*_query"], "exclude": ["write_*"]}},
+        "sandbox": {"command": "uv", "singleFlight": False},
+        "time": {"command": "uvx"},
+    }}
+    flight = SingleFlight.from_config(config, {"sqlite": "sqlite", "sandbox": "sandbox", "time": "time"})
+
+    assert flight.key("sqlite", "read_query", {"q": 1}) == flight.key("sqlite", "read_query", {"q": 1})
+    assert flight.key("sqlite", "read_query", {"q": 1}) is not None
+    # Excluded tools are never merged, even if cacheable
+    assert flight.key("sqlite", "write_query", {}) is None
+    assert flight.key("sqlite", "write_query", {}, cacheable=True) is None
+    assert flight.key("sandbox", "run", {}, cacheable=True) is None
+    # Tools that are neither listed nor cacheable may have side effects
+    assert flight.key("sqlite", "create_table", {}) is None
+    assert flight.key("time", "now", {}) is None
+    assert flight.key("time", "now", {}, cacheable=True) is not None
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_request():
+    flight = SingleFlight({"s": ["t"]})
+    started = 0
+    release = asyncio.Event()
+
+    async def call():
+        nonlocal started
+        started += 1
+        await release.wait()
+        return {"isError": False, "content": "done"}
+
+    key = flight.key("s", "t", {})
+    tasks = [asyncio.create_task(flight.do(key, call)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert started == 1
+    assert all(result == {"isError": False, "content": "done"} for result in results)
+    # Callers that joined get their own copy
+    assert results[1] is not results[0]
+    assert flight.stats() == {"calls": 1, "shared": 2, "in_flight": 0}
+
+    # Once complete, the next call is sent again
+    await flight.do(key, call)
+    assert started == 2
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight({"s": ["t"]})
+    release = asyncio.Event()
+    cancelled = False
+
+    async def call():
+        nonlocal cancelled
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return {"content": "done"}
+
+    key = flight.key("s", "t", {})
+    first = asyncio.create_task(flight.do(key, call))
+    second = asyncio.create_task(flight.do(key, call))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await second == {"content": "done"}
+    assert not cancelled
+
+    # When every caller is cancelled, so is the call
+    release.clear()
+    only = asyncio.create_task(flight.do(key, call))
+    await asyncio.sleep(0)
+    only.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await only
+    await asyncio.sleep(0)
+    assert cancelled
+    assert flight.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_stream_manager_deduplicates_calls(monkeypatch):
+    calls = []
+    release = asyncio.Event()
+
+    async def fake_send_tools_call(read_stream, write_stream, name, arguments, **kwargs):
+        calls.append((name, arguments))
+        await release.wait()
+        return {"isError": False, "content": f"{name} {arguments}"}
+
+    monkeypatch.setattr("mcp_cli.stream_manager.send_tools_call", fake_send_tools_call)
+
+    manager = StreamManager()
+    manager.streams = [("read", "write")]
+    manager.server_streams_map = {"search": 0}
+    manager.namespaced_tool_map = {"search_query": "query", "search_index": "index"}
+    manager.single_flight = SingleFlight({"search": ["query"]})
+
+    tasks = [
+        asyncio.create_task(manager.call_tool("search_query", {"q": "mcp"})),
+        asyncio.create_task(manager.call_tool("search_query", '{"q": "mcp"}')),
+        asyncio.create_task(manager.call_tool("search_query", {"q": "other"})),
+        # Tools not marked safe to repeat are always sent
+        asyncio.create_task(manager.call_tool("search_index", {"doc": 1})),
+        asyncio.create_task(manager.call_tool("search_index", {"doc": 1})),
+    ]
+    await asyncio.sleep(0.01)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert sorted(calls, key=str) == sorted([("query", {"q": "mcp"}), ("query", {"q": "other"}),
+                                             ("index", {"doc": 1}), ("index", {"doc": 1})], key=str)
+    assert results[0] == results[1]
+    assert manager._in_flight["search"] == 0
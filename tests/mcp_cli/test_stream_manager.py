@@ -7,6 +7,7 @@ import pytest
 
 # Assume that stream_manager.py is in the same directory or properly installed as a module
 from mcp_cli.stream_manager import StreamManager
+from mcp_cli.config import server_config_hash
 
 # Dummy streams to simulate read/write streams.
 class DummyStream:
@@ -63,7 +64,7 @@ async def dummy_send_tools_list(read_stream, write_stream):
     else:
         return {"tools": []}
 
-async def dummy_send_tools_call(read_stream, write_stream, name, arguments):
+async def dummy_send_tools_call(read_stream, write_stream, name, arguments, **kwargs):
     # Return a dummy result containing which server (stream) handled the call.
     # If the tool "failTool" is called, simulate an error.
     if name == "failTool":
@@ -88,7 +89,8 @@ def patch_dependencies(monkeypatch):
     # Patch the load_config function to simulate returning configuration
     async def dummy_load_config(config_file, server_name):
         # For testing, simply return a dict that includes an id for identification.
-        return {"id": server_name}  # using server_name as id for simplicity
+        # The command/args differ per server so each gets its own catalog key.
+        return {"id": server_name, "command": "dummy", "args": [server_name]}
     monkeypatch.setattr("mcp_cli.stream_manager.load_config", dummy_load_config)
 
     # Patch the external message sending functions
@@ -248,4 +250,297 @@ async def test_close_cleans_resources():
     assert manager.active_subprocesses == set()
 
     # Trigger a garbage collection manually to check for side effects.
-    gc.collect()
\ No newline at end of file
+    gc.collect()
+@pytest.mark.asyncio
+async def test_concurrent_initialization_preserves_order(monkeypatch):
+    # Make the first server the slowest so it finishes last.
+    async def slow_first_initialize(read_stream, write_stream):
+        if "read-1" in read_stream.name:
+            await asyncio.sleep(0.05)
+        return True
+    monkeypatch.setattr("mcp_cli.stream_manager.send_initialize", slow_first_initialize)
+
+    servers = ["1", "2"]
+    server_names = {0: "ServerOne", 1: "ServerTwo"}
+    sequential = await StreamManager.create("dummy_config.json", servers, server_names)
+    concurrent = await StreamManager.create("dummy_config.json", servers, server_names, concurrent=True)
+
+    assert [t["name"] for t in concurrent.get_internal_tools()] == [t["name"] for t in sequential.get_internal_tools()]
+    assert [t["name"] for t in concurrent.get_all_tools()] == [t["name"] for t in sequential.get_all_tools()]
+    assert concurrent.get_server_info() == sequential.get_server_info()
+    assert concurrent.server_streams_map == {"ServerOne": 0, "ServerTwo": 1}
+    assert concurrent.original_to_default["sharedTool"] == "ServerOne_sharedTool"
+
+@pytest.mark.asyncio
+async def test_concurrent_initialization_server_timeout(monkeypatch):
+    # Server 1 hangs during the handshake and should be timed out on its own.
+    async def hanging_initialize(read_stream, write_stream):
+        if "read-1" in read_stream.name:
+            await asyncio.sleep(10)
+        return True
+    monkeypatch.setattr("mcp_cli.stream_manager.send_initialize", hanging_initialize)
+
+    servers = ["1", "2"]
+    server_names = {0: "ServerOne", 1: "ServerTwo"}
+    manager = await StreamManager.create(
+        "dummy_config.json", servers, server_names, concurrent=True, server_timeout=0.05
+    )
+
+    info = manager.get_server_info()
+    assert [s["name"] for s in info] == ["ServerOne", "ServerTwo"]
+    assert "Timed out" in info[0]["status"]
+    assert info[1]["status"] == "Connected"
+    assert manager.server_streams_map == {"ServerTwo": 0}
+    assert [t["name"] for t in manager.get_internal_tools()] == ["ServerTwo_toolB", "ServerTwo_sharedTool"]
+
+@pytest.mark.asyncio
+async def test_concurrent_initialization_global_timeout(monkeypatch):
+    async def hanging_initialize(read_stream, write_stream):
+        if "read-2" in read_stream.name:
+            await asyncio.sleep(10)
+        return True
+    monkeypatch.setattr("mcp_cli.stream_manager.send_initialize", hanging_initialize)
+
+    servers = ["1", "2"]
+    server_names = {0: "ServerOne", 1: "ServerTwo"}
+    manager = await StreamManager.create(
+        "dummy_config.json", servers, server_names, concurrent=True, global_timeout=0.05
+    )
+
+    info = manager.get_server_info()
+    assert info[0]["status"] == "Connected"
+    assert "Timed out" in info[1]["status"]
+    assert len(manager.streams) == 1
+
+@pytest.mark.asyncio
+async def test_lazy_mode_defers_cataloged_servers(monkeypatch, tmp_path):
+    from mcp_cli.tool_catalog import ToolCatalog
+
+    # Record which servers actually get spawned.
+    started = []
+    def recording_stdio_client(server_params):
+        started.append(server_params["id"])
+        return DummyStdioClient(server_params, server_params["id"])
+    monkeypatch.setattr("mcp_cli.stream_manager.stdio_client", recording_stdio_client)
+
+    servers = ["1", "2"]
+    server_names = {0: "ServerOne", 1: "ServerTwo"}
+
+    # First lazy run has an empty catalog, so both servers start and get cataloged.
+    catalog = ToolCatalog(cache_dir=str(tmp_path))
+    first = await StreamManager.create("dummy_config.json", servers, server_names, lazy=True, catalog=catalog)
+    assert started == ["1", "2"]
+    await first.close()
+
+    # Second run serves the tools from the catalog without spawning anything.
+    started.clear()
+    manager = await StreamManager.create(
+        "dummy_config.json", servers, server_names, lazy=True, catalog=ToolCatalog(cache_dir=str(tmp_path))
+    )
+    assert started == []
+    assert [t["name"] for t in manager.get_internal_tools()] == [
+        "ServerOne_toolA", "ServerOne_sharedTool", "ServerTwo_toolB", "ServerTwo_sharedTool"
+    ]
+    assert [s["status"] for s in manager.get_server_info()] == ["Idle", "Idle"]
+
+    # The first call routed to a server starts only that server.
+    response = await manager.call_tool("toolB", {})
+    assert not response.get("isError")
+    assert "read-2" in response["content"]
+    assert started == ["2"]
+    assert [s["status"] for s in manager.get_server_info()] == ["Idle", "Connected"]
+    await manager.close()
+
+@pytest.mark.asyncio
+async def test_lazy_mode_stops_idle_servers(tmp_path):
+    from mcp_cli.tool_catalog import ToolCatalog
+
+    servers = ["1"]
+    server_names = {0: "ServerOne"}
+    catalog = ToolCatalog(cache_dir=str(tmp_path))
+    catalog.put(server_config_hash({"command": "dummy", "args": ["1"]}), [{"name": "toolA"}])
+
+    manager = await StreamManager.create(
+        "dummy_config.json", servers, server_names, lazy=True, idle_timeout=0.05, catalog=catalog
+    )
+    await manager.call_tool("toolA", {})
+    ctx = manager.client_contexts[0]
+    assert manager.get_server_info()[0]["status"] == "Connected"
+
+    # After the idle period the server is stopped but its tools stay registered.
+    await asyncio.sleep(0.2)
+    assert ctx.exited is True
+    assert manager.streams == [None]
+    assert manager.get_server_info()[0]["status"] == "Idle"
+    assert manager.has_tools()
+
+    # It starts again on the next call.
+    response = await manager.call_tool("toolA", {})
+    assert not response.get("isError")
+    await manager.close()
+
+@pytest.mark.asyncio
+async def test_catalog_startup_revalidates_in_background(tmp_path):
+    from mcp_cli.tool_catalog import ToolCatalog
+
+    servers = ["1"]
+    server_names = {0: "ServerOne"}
+    catalog = ToolCatalog(cache_dir=str(tmp_path))
+    config_hash = server_config_hash({"command": "dummy", "args": ["1"]})
+    catalog.put(config_hash, [{"name": "staleTool"}])
+
+    # The cached tools are available as soon as create() returns.
+    manager = await StreamManager.create(
+        "dummy_config.json", servers, server_names, use_catalog=True, catalog=catalog
+    )
+    tools = manager.get_all_tools()
+    assert [t["name"] for t in tools] == ["staleTool"]
+
+    # The background start replaces them with the live list and updates the catalog.
+    await asyncio.sleep(0.05)
+    assert manager.get_server_info()[0]["status"] == "Connected"
+    assert [t["name"] for t in tools] == ["toolA", "sharedTool"]
+    assert manager.get_server_for_tool("staleTool") == "Unknown"
+    assert manager.get_server_info()[0]["tools"] == 2
+    assert [t["name"] for t in catalog.get(config_hash)] == ["toolA", "sharedTool"]
+    await manager.close()
+
+@pytest.mark.asyncio
+async def test_close_waits_for_catalog_revalidation(tmp_path):
+    from mcp_cli.tool_catalog import ToolCatalog
+
+    catalog = ToolCatalog(cache_dir=str(tmp_path))
+    config_hash = server_config_hash({"command": "dummy", "args": ["1"]})
+    catalog.put(config_hash, [{"name": "staleTool"}])
+
+    # A command that finishes before the server has started still refreshes the catalog.
+    manager = await StreamManager.create(
+        "dummy_config.json", ["1"], {0: "ServerOne"}, use_catalog=True, catalog=catalog
+    )
+    await manager.close()
+    assert [t["name"] for t in catalog.get(config_hash)] == ["toolA", "sharedTool"]
+
+@pytest.mark.asyncio
+async def test_failed_revalidation_invalidates_catalog(monkeypatch, tmp_path):
+    from mcp_cli.tool_catalog import ToolCatalog
+
+    catalog = ToolCatalog(cache_dir=str(tmp_path))
+    config_hash = server_config_hash({"command": "dummy", "args": ["1"]})
+    catalog.put(config_hash, [{"name": "staleTool"}])
+    monkeypatch.setattr("mcp_cli.stream_manager.send_initialize", dummy_send_initialize_fail)
+
+    manager = await StreamManager.create(
+        "dummy_config.json", ["1"], {0: "ServerOne"}, use_catalog=True, catalog=catalog
+    )
+    await manager.close()
+    assert catalog.get(config_hash) is None
+
+@pytest.mark.asyncio
+async def test_tools_list_changed_invalidates_catalog(monkeypatch, tmp_path):
+    from mcp_cli.tool_catalog import ToolCatalog
+
+    tool_lists = {"read-1": [{"name": "toolA"}]}
+    async def changing_tools_list(read_stream, write_stream):
+        return {"tools": tool_lists[read_stream.name]}
+    monkeypatch.setattr("mcp_cli.stream_manager.send_tools_list", changing_tools_list)
+
+    catalog = ToolCatalog(cache_dir=str(tmp_path))
+    config_hash = server_config_hash({"command": "dummy", "args": ["1"]})
+    manager = await StreamManager.create(
+        "dummy_config.json", ["1"], {0: "ServerOne"}, use_catalog=True, catalog=catalog
+    )
+    assert catalog.get(config_hash) == [{"name": "toolA"}]
+    fingerprint = manager.get_tools_fingerprint()
+    assert manager.get_tools_fingerprint() == fingerprint
+
+    # The server announces a change while a call is in flight.
+    async def notifying_tools_call(read_stream, write_stream, name, arguments, **kwargs):
+        tool_lists["read-1"] = [{"name": "toolA"}, {"name": "toolC"}]
+        read_stream.dispatcher._route(SimpleNamespace(id=None, method="notifications/tools/list_changed", params=None))
+        assert catalog.get(config_hash) is None
+        return {"isError": False, "content": "ok"}
+    monkeypatch.setattr("mcp_cli.stream_manager.send_tools_call", notifying_tools_call)
+
+    await manager.call_tool("toolA", {})
+    # The tool list is refetched in the background once the call is done
+    await asyncio.gather(*manager._refresh_tasks.values())
+    assert [t["name"] for t in manager.get_all_tools()] == ["toolA", "toolC"]
+    assert manager.get_server_for_tool("toolC") == "ServerOne"
+    assert catalog.get(config_hash) == [{"name": "toolA"}, {"name": "toolC"}]
+    assert manager.get_tools_fingerprint() != fingerprint
+    await manager.close()
+
+@pytest.mark.asyncio
+async def test_tool_list_refetch_does_not_hold_up_the_call(monkeypatch):
+    manager = await StreamManager.create("dummy_config.json", ["1"], {0: "ServerOne"})
+    refetch_started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_tools_list(read_stream, write_stream):
+        refetch_started.set()
+        await release.wait()
+        return {"tools": [{"name": "toolA"}, {"name": "toolC"}]}
+    monkeypatch.setattr("mcp_cli.stream_manager.send_tools_list", slow_tools_list)
+
+    async def notifying_tools_call(read_stream, write_stream, name, arguments, **kwargs):
+        manager._handle_notification("ServerOne", "notifications/tools/list_changed", None)
+        return {"isError": False, "content": "ok"}
+    monkeypatch.setattr("mcp_cli.stream_manager.send_tools_call", notifying_tools_call)
+
+    # The call returns while tools/list is still outstanding
+    result = await asyncio.wait_for(manager.call_tool("toolA", {}), timeout=1)
+    assert result["content"] == "ok"
+    await asyncio.wait_for(refetch_started.wait(), timeout=1)
+    assert "toolC" not in [t["name"] for t in manager.get_all_tools()]
+
+    release.set()
+    await asyncio.gather(*manager._refresh_tasks.values())
+    assert [t["name"] for t in manager.get_all_tools()] == ["toolA", "toolC"]
+    await manager.close()
+
+class DummyProcess:
+    def __init__(self, pid, ignores_terminate=False):
+        self.pid = pid
+        self.returncode = None
+        self.ignores_terminate = ignores_terminate
+        self.killed = False
+        self.closed = False
+        self._exited = asyncio.Event()
+
+    def terminate(self):
+        if not self.ignores_terminate:
+            self.returncode = 0
+            self._exited.set()
+
+    def kill(self):
+        self.killed = True
+        self.returncode = -9
+        self._exited.set()
+
+    async def wait(self):
+        await self._exited.wait()
+        return self.returncode
+
+    async def aclose(self):
+        self.closed = True
+
+@pytest.mark.asyncio
+async def test_close_terminates_processes_concurrently(monkeypatch):
+    monkeypatch.setattr("mcp_cli.stream_manager.SHUTDOWN_TIMEOUT", 0.1)
+    processes = {"1": DummyProcess(101), "2": DummyProcess(102, ignores_terminate=True)}
+    def process_stdio_client(server_params):
+        client = DummyStdioClient(server_params, server_params["id"])
+        client.process = processes[server_params["id"]]
+        return client
+    monkeypatch.setattr("mcp_cli.stream_manager.stdio_client", process_stdio_client)
+
+    manager = await StreamManager.create("dummy_config.json", ["1", "2"], {0: "ServerOne", 1: "ServerTwo"})
+    assert manager.active_subprocesses == set(processes.values())
+
+    await manager.close()
+
+    # The well-behaved server exited on SIGTERM; the other was killed after the timeout.
+    assert processes["1"].returncode == 0 and not processes["1"].killed
+    assert processes["2"].killed
+    assert all(p.closed for p in processes.values())
+    assert manager.active_subprocesses == set()
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from mcp_cli.supervisor import RestartPolicy, load_restart_policies
+from mcp_cli.stream_manager import StreamManager
+
+def test_from_config_policies():
+    config = {"mcpServers": {
+        "sqlite": {"command": "uvx", "restart": {"maxAttempts": 3, "backoff": 1, "replay": False}},
+        "sandbox": {"command": "uv", "restart": False},
+        "time": {"command": "uvx"},
+        "bad": {"command": "uvx", "restart": {"maxAttempts": "often"}},
+    }}
+    policies = load_restart_policies(config, {"db": "sqlite", "sandbox": "sandbox", "time": "time", "bad": "bad"})
+
+    assert (policies["db"].max_attempts, policies["db"].backoff, policies["db"].replay) == (3, 1.0, False)
+    assert not policies["sandbox"].enabled
+    assert policies["time"].enabled and policies["time"].replay
+    assert policies["bad"].max_attempts == RestartPolicy().max_attempts
+
+def test_backoff_doubles_up_to_cap():
+    policy = RestartPolicy(backoff=0.5, max_backoff=3)
+    assert [policy.delay(attempt) for attempt in range(1, 6)] == [0.0, 0.5, 1.0, 2.0, 3.0]
+
+class DummyDispatcher:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+class DummyStream:
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+
+def make_manager(monkeypatch, outcomes, policy=None):
+    """Manager with one connected server whose restarts produce the given outcomes."""
+    manager = StreamManager()
+    dispatcher = DummyDispatcher()
+    manager.streams = [(DummyStream(dispatcher), "write")]
+    manager.client_contexts = [None]
+    manager.server_streams_map = {"sqlite": 0}
+    manager.namespaced_tool_map = {"sqlite_query": "query"}
+    manager.server_info = [{"id": 1, "name": "sqlite", "tools": 1, "status": "Connected"}]
+    manager._server_tools = {"sqlite": [{"name": "query"}]}
+    if policy is not None:
+        manager.restart_policies = {"sqlite": policy}
+
+    attempts = []
+
+    async def fake_bring_up(config_file, server_name, display_name, timeout=None):
+        attempts.append(display_name)
+        await asyncio.sleep(0.01)
+        return outcomes.pop(0)
+
+    async def fake_send_tools_call(read_stream, write_stream, name, arguments, **kwargs):
+        return {"isError": False, "content": f"{write_stream} {name}"}
+
+    monkeypatch.setattr(manager, "_bring_up_server", fake_bring_up)
+    monkeypatch.setattr("mcp_cli.stream_manager.send_tools_call", fake_send_tools_call)
+    return manager, dispatcher, attempts
+
+def connected(write):
+    return {"client_ctx": None, "streams": (DummyStream(DummyDispatcher()), write), "tools": [{"name": "query"}]}
+
+@pytest.mark.asyncio
+async def test_lost_server_is_restarted_and_queued_calls_replayed(monkeypatch):
+    manager, dispatcher, attempts = make_manager(
+        monkeypatch, [{"error": "Failed to initialize"}, connected("new")],
+        RestartPolicy(backoff=0.01)
+    )
+
+    manager._handle_disconnect("sqlite", dispatcher)
+    assert manager.streams[0] is None
+    assert manager.server_info[0]["status"] == "Restarting"
+
+    # A call made during the restart waits for it and goes to the new process
+    result = await manager.call_tool("sqlite_query", {})
+    assert result == {"isError": False, "content": "new query"}
+    assert attempts == ["sqlite", "sqlite"]
+    assert dispatcher.closed
+    assert manager.server_info[0]["status"] == "Connected"
+    assert manager.get_restart_counts() == {"sqlite": 1}
+
+    # A stale dispatcher reporting a lost connection is ignored
+    manager._handle_disconnect("sqlite", dispatcher)
+    assert manager.streams[0][1] == "new"
+
+@pytest.mark.asyncio
+async def test_calls_fail_fast_when_restart_gives_up(monkeypatch):
+    manager, dispatcher, attempts = make_manager(
+        monkeypatch, [{"error": "Failed to initialize"}] * 2,
+        RestartPolicy(max_attempts=2, backoff=0.01)
+    )
+
+    manager._handle_disconnect("sqlite", dispatcher)
+    result = await manager.call_tool("sqlite_query", {})
+
+    assert result["isError"]
+    assert "could not be started" in result["error"]
+    assert len(attempts) == 2
+    assert manager.server_info[0]["status"].startswith("Failed to restart")
+
+@pytest.mark.asyncio
+async def test_calls_during_restart_fail_fast_without_replay(monkeypatch):
+    manager, dispatcher, attempts = make_manager(
+        monkeypatch, [connected("new")], RestartPolicy(replay=False)
+    )
+
+    manager._handle_disconnect("sqlite", dispatcher)
+    result = await manager.call_tool("sqlite_query", {})
+    assert result["isError"]
+    assert "restarting" in result["error"]
+
+    await asyncio.gather(*manager._start_tasks.values())
+    assert (await manager.call_tool("sqlite_query", {}))["content"] == "new query"
+
+@pytest.mark.asyncio
+async def test_close_does_not_restart(monkeypatch):
+    manager, dispatcher, attempts = make_manager(monkeypatch, [connected("new")])
+
+    await manager.close()
+    manager.server_streams_map = {"sqlite": 0}
+    manager.streams = [(DummyStream(dispatcher), "write")]
+    manager._handle_disconnect("sqlite", dispatcher)
+
+    assert attempts == []
+    assert not manager._start_tasks
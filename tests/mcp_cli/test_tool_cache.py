@@ -0,0 +1,121 @@
+import pytest
+
+from mcp_cli.stream_manager import StreamManager
+from mcp_cli.tool_cache import CacheRules, ToolResultCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def make_cache(max_entries=8):
+    clock = FakeClock()
+    rules = {"sqlite": CacheRules({"list_tables": 10, "describe_*": 60}, exclude=["describe_secret"])}
+    return ToolResultCache(rules, max_entries, clock=clock), clock
+
+def test_rules_from_config():
+    rules = CacheRules.from_config({"ttl": 30, "tools": ["list_tables", "get_*"]})
+    assert rules.ttl_for("list_tables") == 30
+    assert rules.ttl_for("get_time") == 30
+    assert rules.ttl_for("read_query") is None
+
+    rules = CacheRules.from_config({"tools": {"a": 5, "b": False, "c": True}})
+    assert rules.ttl_for("a") == 5
+    assert rules.ttl_for("b") is None
+    assert rules.ttl_for("c") == 60
+
+    assert CacheRules.from_config(None) is None
+    assert CacheRules.from_config({"ttl": 30}) is None
+    assert CacheRules.from_config({"tools": {"a": "soon"}}) is None
+
+def test_keys_canonicalize_arguments():
+    cache, _ = make_cache()
+    assert cache.key("sqlite", "list_tables", {"a": 1, "b": 2}) == cache.key("sqlite", "list_tables", {"b": 2, "a": 1})
+    assert cache.key("sqlite", "read_query", {}) is None
+    assert cache.key("sqlite", "describe_secret", {}) is None
+    assert cache.key("other", "list_tables", {}) is None
+
+def test_hits_misses_and_ttl():
+    cache, clock = make_cache()
+    key = cache.key("sqlite", "list_tables", {})
+
+    assert cache.get(key) is None
+    cache.put(key, {"isError": False, "content": "users"})
+    result = cache.get(key)
+    assert result == {"isError": False, "content": "users"}
+
+    # Callers get copies, so they cannot corrupt the cache
+    result["content"] = "changed"
+    assert cache.get(key)["content"] == "users"
+
+    clock.now += 11
+    assert cache.get(key) is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+
+def test_errors_are_not_cached():
+    cache, _ = make_cache()
+    key = cache.key("sqlite", "list_tables", {})
+    cache.put(key, {"isError": True, "error": "boom"})
+    assert cache.get(key) is None
+
+def test_lru_eviction():
+    cache, _ = make_cache(max_entries=2)
+    keys = [cache.key("sqlite", "describe_table", {"table": name}) for name in "abc"]
+    cache.put(keys[0], {"content": "a"})
+    cache.put(keys[1], {"content": "b"})
+    cache.get(keys[0])
+    cache.put(keys[2], {"content": "c"})
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.stats()["evictions"] == 1
+
+def test_from_config_uses_entry_names():
+    config = {
+        "mcpServers": {"sqlite": {"command": "uvx", "cache": {"tools": ["list_tables"]}}},
+        "toolCache": {"maxEntries": 4},
+    }
+    cache = ToolResultCache.from_config(config, {"db": "sqlite", "time": "time"})
+    assert cache.enabled
+    assert cache.max_entries == 4
+    assert cache.key("db", "list_tables", {}) is not None
+    assert not ToolResultCache.from_config({}, {"db": "sqlite"}).enabled
+
+@pytest.mark.asyncio
+async def test_stream_manager_serves_cached_results(monkeypatch):
+    calls = []
+
+    async def fake_send_tools_call(read_stream, write_stream, name, arguments, **kwargs):
+        calls.append((name, arguments))
+        return {"isError": False, "content": f"result {len(calls)}"}
+
+    monkeypatch.setattr("mcp_cli.stream_manager.send_tools_call", fake_send_tools_call)
+
+    manager = StreamManager()
+    manager.tool_cache = ToolResultCache.from_config(
+        {"mcpServers": {"sqlite": {"command": "uvx", "cache": {"tools": ["list_tables"]}}}},
+        {"sqlite": "sqlite"}
+    )
+    manager.streams = [("read", "write")]
+    manager.server_streams_map = {"sqlite": 0}
+    manager.namespaced_tool_map = {"sqlite_list_tables": "list_tables", "sqlite_read_query": "read_query"}
+
+    first = await manager.call_tool("sqlite_list_tables", "{}")
+    second = await manager.call_tool("sqlite_list_tables", {})
+    await manager.call_tool("sqlite_read_query", {"query": "select 1"})
+    await manager.call_tool("sqlite_read_query", {"query": "select 1"})
+
+    assert first == second == {"isError": False, "content": "result 1"}
+    assert calls == [
+        ("list_tables", {}),
+        ("read_query", {"query": "select 1"}),
+        ("read_query", {"query": "select 1"}),
+    ]
+    assert manager.tool_cache.stats()["hits"] == 1
+
+    # A tool list change drops the server's cached results
+    manager._handle_notification("sqlite", "notifications/tools/list_changed", None)
+    assert manager.tool_cache.stats()["entries"] == 0
@@ -0,0 +1,29 @@
+import os
+
+from mcp_cli.tool_catalog import ToolCatalog
+
+def test_catalog_round_trip(tmp_path):
+    catalog = ToolCatalog(cache_dir=str(tmp_path))
+    catalog.put("hash-a", [{"name": "toolA"}], "ServerA")
+
+    assert ToolCatalog(cache_dir=str(tmp_path)).get("hash-a") == [{"name": "toolA"}]
+    catalog.remove("hash-a")
+    assert ToolCatalog(cache_dir=str(tmp_path)).get("hash-a") is None
+
+def test_concurrent_writers_keep_each_others_entries(tmp_path):
+    # Two processes that loaded the catalog before either wrote to it
+    first = ToolCatalog(cache_dir=str(tmp_path))
+    second = ToolCatalog(cache_dir=str(tmp_path))
+    first.put("shared", [{"name": "old"}])
+    assert second.get("hash-b") is None
+
+    first.put("hash-a", [{"name": "toolA"}])
+    second.put("hash-b", [{"name": "toolB"}])
+    second.remove("shared")
+
+    on_disk = ToolCatalog(cache_dir=str(tmp_path))
+    assert on_disk.get("hash-a") == [{"name": "toolA"}]
+    assert on_disk.get("hash-b") == [{"name": "toolB"}]
+    assert on_disk.get("shared") is None
+    # Temporary files are unique per write and never left behind
+    assert os.listdir(tmp_path) == ["tool_catalog.json"]
@@ -0,0 +1,93 @@
+import json
+import os
+
+import pytest
+
+from mcp_cli.tool_results import ResultStore, READ_RESULT_TOOL_NAME
+from mcp_cli.stream_manager import StreamManager
+
+def test_small_results_are_unchanged(tmp_path):
+    store = ResultStore(max_bytes=100, spill_dir=str(tmp_path))
+    assert store.cap("tool", "short") == "short"
+    assert not store.has_results()
+
+def test_large_result_is_spilled_with_preview(tmp_path):
+    store = ResultStore(max_bytes=100, spill_dir=str(tmp_path))
+    content = "\n".join(f"row {i}" for i in range(200))
+
+    capped = store.cap("sqlite_read_query", content)
+
+    assert store.has_results()
+    assert len(capped) < len(content)
+    assert capped.startswith("row 0\nrow 1\n")
+    assert READ_RESULT_TOOL_NAME in capped
+    assert len(list(tmp_path.iterdir())) == 1
+
+def test_paging_reads_the_whole_result(tmp_path):
+    store = ResultStore(max_bytes=64, spill_dir=str(tmp_path))
+    content = "é" * 500  # Multi-byte characters are never split
+    store.cap("tool", content)
+    handle = next(iter(store._results))
+
+    pages, offset = [], 0
+    while True:
+        result = store.call({"handle": handle, "offset": offset})
+        assert result["isError"] is False
+        page, notice = result["content"].rsplit("\n", 1)
+        pages.append(page)
+        if "End of result" in notice:
+            break
+        offset = int(notice.split("Next offset: ")[1].rstrip("]"))
+
+    assert "".join(pages) == content
+
+def test_paging_reads_only_the_page(tmp_path, monkeypatch):
+    store = ResultStore(max_bytes=64, spill_dir=str(tmp_path))
+    content = "ab€" * 2000
+    store.cap("tool", content)
+    handle = next(iter(store._results))
+
+    reads = []
+    real_open = open
+    def recording_open(*args, **kwargs):
+        f = real_open(*args, **kwargs)
+        real_read = f.read
+        f.read = lambda size=-1: reads.append(size) or real_read(size)
+        return f
+    monkeypatch.setattr("builtins.open", recording_open)
+
+    # An offset inside a character starts at that character
+    result = store.read(handle, offset=4003)
+    page, notice = result["content"].rsplit("\n", 1)
+    assert page.startswith("€ab")
+    assert notice == "[Bytes 4002-4066 of 10000. Next offset: 4066]"
+    assert reads and all(0 < size <= 64 + 4 for size in reads)
+
+def test_unknown_handle_is_an_error(tmp_path):
+    store = ResultStore(max_bytes=64, spill_dir=str(tmp_path))
+    assert store.call({"handle": "nope"})["isError"] is True
+    assert store.call({})["isError"] is True
+
+def test_cap_disabled_with_zero(monkeypatch):
+    monkeypatch.setenv("MCP_CLI_MAX_RESULT_BYTES", "0")
+    store = ResultStore()
+    assert store.cap("tool", "x" * 100000) == "x" * 100000
+
+def test_close_removes_temporary_spill_dir():
+    store = ResultStore(max_bytes=10)
+    store.cap("tool", "x" * 100)
+    spill_dir = store.spill_dir
+    store.close()
+    assert not os.path.exists(spill_dir)
+
+@pytest.mark.asyncio
+async def test_stream_manager_serves_read_result_locally(tmp_path):
+    manager = StreamManager()
+    manager.result_store = ResultStore(max_bytes=10, spill_dir=str(tmp_path))
+    manager.result_store.cap("tool", "abcdefghijklmnopqrstuvwxyz")
+    handle = next(iter(manager.result_store._results))
+
+    result = await manager.call_tool(READ_RESULT_TOOL_NAME, json.dumps({"handle": handle, "offset": 10}))
+
+    assert result["isError"] is False
+    assert result["content"].startswith("klmnopqrst")